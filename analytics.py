@@ -0,0 +1,188 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Rolling-Window Analytics Engine
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config import CD_RATIO_BENCHMARKS, CD_RATIO_STATUS
+from data import get_measures
+
+QUARTERS_PER_YEAR = 4
+
+# Status buckets in ascending CD order; codes returned by classify_cd_status index into this
+# "na" marks a missing CD ratio (no deposits or advances reported)
+STATUS_ORDER = ["low", "moderate", "healthy", "excellent", "high", "critical", "na"]
+STATUS_LABELS = [CD_RATIO_STATUS[status] for status in STATUS_ORDER]
+
+_rolling_cache = LRUCache(maxsize=32)
+_rolling_lock = threading.Lock()
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PANEL ↔ MATRIX HELPERS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def panel_fingerprint(panel):
+    """Return a content hash of the panel, used as a cache key"""
+    return int(pd.util.hash_pandas_object(panel, index=False).sum())
+
+def panel_to_matrix(panel, value):
+    """Pivot one panel column into a bank × quarter matrix"""
+    return panel.pivot(index="bank_name", columns="quarter", values=value)
+
+def matrix_to_long(banks, quarters, matrices, bank_types):
+    """Stack bank × quarter arrays (rows = banks, cols = quarters) into a long frame"""
+    n_banks, n_quarters = len(banks), len(quarters)
+
+    long_df = pd.DataFrame({
+        "bank_name": np.repeat(np.asarray(banks), n_quarters),
+        "type": np.repeat(bank_types.reindex(banks).to_numpy(), n_quarters),
+        "quarter": pd.Categorical(np.tile(np.asarray(quarters), n_banks),
+                                  categories=quarters, ordered=True),
+    })
+    for name, matrix in matrices.items():
+        long_df[name] = np.asarray(matrix, dtype=float).ravel()
+
+    return long_df
+
+# ═══════════════════════════════════════════════════════════════════════════
+# VECTORIZED WINDOW OPERATIONS (axis 1 = quarters)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _lag(matrix, periods):
+    """Shift each row right by `periods` quarters, padding with NaN"""
+    lagged = np.full_like(matrix, np.nan)
+    if periods < matrix.shape[1]:
+        lagged[:, periods:] = matrix[:, :-periods]
+    return lagged
+
+def _rolling(matrix, window, reducer):
+    """Apply a reducer over trailing windows of each row, padding with NaN"""
+    result = np.full_like(matrix, np.nan)
+    if window <= matrix.shape[1]:
+        result[:, window - 1:] = reducer(sliding_window_view(matrix, window, axis=1), axis=-1)
+    return result
+
+def _pct_change(matrix, periods):
+    """Percentage change versus `periods` quarters earlier"""
+    return (matrix / _lag(matrix, periods) - 1) * 100
+
+def _cagr(matrix):
+    """Annualised growth from the first quarter of history to each quarter"""
+    elapsed = np.arange(matrix.shape[1], dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        growth = (matrix / matrix[:, :1]) ** (QUARTERS_PER_YEAR / elapsed) - 1
+    growth[:, 0] = np.nan
+    return growth * 100
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BATCHED RATIO ENGINE (see config.METRICS)
+# ═══════════════════════════════════════════════════════════════════════════
+
+# ratio name → (numerator measure, denominator measure or None for a level, scale)
+RATIO_DEFINITIONS = {
+    "cd_ratio": ("advances", "deposits", 100),
+    "gnpa_pct": ("gross_npa", "advances", 100),
+    "nnpa_pct": ("net_npa", "advances", 100),
+    "pcr": ("provisions", "gross_npa", 100),
+    "car": ("car", None, 1),
+}
+
+def compute_ratios(store, names=tuple(RATIO_DEFINITIONS)):
+    """
+    Compute several ratios for every bank × quarter in one tensor division
+
+    Numerators and denominators are gathered from the store as two
+    (banks, quarters, ratios) tensors; level measures divide by 1.
+    Returns a long frame: bank_name, type, quarter, <ratio columns>.
+    """
+    numerators = get_measures(store, [RATIO_DEFINITIONS[n][0] for n in names])
+    denominator_names = [RATIO_DEFINITIONS[n][1] for n in names]
+    measured = [d for d in denominator_names if d is not None]
+    denominators = np.ones_like(numerators)
+    if measured:
+        positions = [i for i, d in enumerate(denominator_names) if d is not None]
+        denominators[..., positions] = get_measures(store, measured)
+    scale = np.array([RATIO_DEFINITIONS[n][2] for n in names], dtype=np.float32)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratios = numerators / denominators * scale
+
+    bank_types = pd.Series(store["types"], index=store["banks"])
+    return matrix_to_long(store["banks"], store["quarters"],
+                          {name: ratios[..., i] for i, name in enumerate(names)}, bank_types)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CD STATUS BUCKETS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def classify_cd_status(cd_ratios):
+    """
+    Map CD ratios (any array shape) to STATUS_ORDER codes per CD_RATIO_BENCHMARKS
+
+    Matches styles.render_cd_ratio_status: low/moderate/healthy upper bounds
+    are exclusive, excellent/high upper bounds are inclusive. NaN maps to
+    "na" rather than to a bucket.
+    """
+    cd = np.asarray(cd_ratios, dtype=float)
+    lower_edges = [CD_RATIO_BENCHMARKS[s][1] for s in ("low", "moderate", "healthy")]
+    codes = np.searchsorted(lower_edges, cd, side="right")
+    codes += cd > CD_RATIO_BENCHMARKS["excellent"][1]
+    codes += cd > CD_RATIO_BENCHMARKS["high"][1]
+    codes = np.where(np.isnan(cd), STATUS_ORDER.index("na"), codes)
+    return codes.astype(np.int8)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ROLLING METRICS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def compute_rolling_metrics(panel, window=4, yoy_lag=QUARTERS_PER_YEAR):
+    """
+    Compute change, growth and rolling statistics for every bank × quarter
+
+    Columns follow config.METRICS: loan_growth and deposit_growth are YoY %,
+    growth_divergence is their difference. Rolling stats use a trailing
+    window of `window` quarters and are NaN until the window is full.
+    """
+    deposits = panel_to_matrix(panel, "deposits")
+    advances = panel_to_matrix(panel, "advances").reindex_like(deposits)
+    dep = deposits.to_numpy(dtype=float)
+    adv = advances.to_numpy(dtype=float)
+    cd = adv / dep * 100
+
+    loan_growth = _pct_change(adv, yoy_lag)
+    deposit_growth = _pct_change(dep, yoy_lag)
+
+    matrices = {
+        "cd_ratio": cd,
+        "cd_change_qoq": cd - _lag(cd, 1),
+        "cd_change_yoy": cd - _lag(cd, yoy_lag),
+        "loan_growth_qoq": _pct_change(adv, 1),
+        "deposit_growth_qoq": _pct_change(dep, 1),
+        "loan_growth": loan_growth,
+        "deposit_growth": deposit_growth,
+        "growth_divergence": loan_growth - deposit_growth,
+        "advances_cagr": _cagr(adv),
+        "deposits_cagr": _cagr(dep),
+        "rolling_mean_cd": _rolling(cd, window, np.mean),
+        "rolling_std_cd": _rolling(cd, window, lambda x, axis: np.std(x, axis=axis, ddof=1)),
+    }
+    bank_types = panel.drop_duplicates("bank_name").set_index("bank_name")["type"]
+
+    return matrix_to_long(deposits.index, deposits.columns, matrices, bank_types)
+
+def get_rolling_metrics(panel, window=4, yoy_lag=QUARTERS_PER_YEAR):
+    """Return rolling metrics, cached by panel content and window spec"""
+    key = (panel_fingerprint(panel), window, yoy_lag)
+    with _rolling_lock:
+        metrics = _rolling_cache.get(key)
+    if metrics is None:
+        metrics = compute_rolling_metrics(panel, window, yoy_lag)
+        with _rolling_lock:
+            _rolling_cache[key] = metrics
+    return metrics
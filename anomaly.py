@@ -0,0 +1,145 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Anomaly Detection over the Bank × Quarter Panel
+
+Run as a batch job to (re)score the current dataset:
+    python anomaly.py
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import IsolationForest
+
+from analytics import get_rolling_metrics, panel_fingerprint
+from config import ANOMALY_CONTAMINATION, ANOMALY_Z_THRESHOLD, CACHE_DIR, MAX_WORKERS
+
+# Features screened with robust z-scores against the bank's peer type,
+# with a floor on the scale (in feature units) so near-identical peers
+# do not turn tiny moves into huge z-scores
+ROBUST_Z_FEATURES = {
+    "cd_ratio": 0.5,
+    "cd_change_qoq": 0.25,
+    "loan_growth_qoq": 0.5,
+    "deposit_growth_qoq": 0.5,
+}
+
+ISOLATION_FEATURES = ["cd_ratio", "cd_change_qoq", "loan_growth_qoq", "deposit_growth_qoq", "rolling_std_cd"]
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SCORING
+# ═══════════════════════════════════════════════════════════════════════════
+
+def robust_z_scores(metrics):
+    """Median/MAD z-scores of ROBUST_Z_FEATURES within each (type, quarter) peer group"""
+    groups = metrics.groupby(["type", "quarter"], observed=True)
+    scores = pd.DataFrame(index=metrics.index)
+
+    for feature, floor in ROBUST_Z_FEATURES.items():
+        median = groups[feature].transform("median")
+        mad = (metrics[feature] - median).abs().groupby([metrics["type"], metrics["quarter"]],
+                                                        observed=True).transform("median")
+        scale = np.maximum(1.4826 * mad, floor)
+        scores[f"z_{feature}"] = ((metrics[feature] - median) / scale).fillna(0)
+
+    return scores
+
+def _isolation_scores(features, contamination, seed):
+    """Fit one IsolationForest on a peer group and score its rows (runs in a worker)"""
+    model = IsolationForest(contamination=contamination, random_state=seed)
+    labels = model.fit_predict(features)
+    return -model.score_samples(features), labels == -1
+
+def score_anomalies(panel, contamination=ANOMALY_CONTAMINATION, z_threshold=ANOMALY_Z_THRESHOLD,
+                    max_workers=MAX_WORKERS, seed=42):
+    """
+    Score every bank × quarter for anomalies
+
+    Robust z-scores compare each bank with its peer type in the same quarter;
+    one IsolationForest per bank type scores multi-metric feature vectors.
+    Peer-group models are fitted in parallel across a process pool.
+    """
+    metrics = get_rolling_metrics(panel).copy()
+    scores = robust_z_scores(metrics)
+    features = metrics[ISOLATION_FEATURES].fillna(0)
+
+    groups = [(bank_type, index) for bank_type, index in metrics.groupby("type").groups.items()]
+    jobs = [(features.loc[index].to_numpy(), contamination, seed) for _, index in groups]
+
+    if max_workers <= 1 or len(jobs) <= 1:
+        results = [_isolation_scores(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as pool:
+            results = list(pool.map(_isolation_scores, *zip(*jobs)))
+
+    isolation_score = pd.Series(0.0, index=metrics.index)
+    isolation_flag = pd.Series(False, index=metrics.index)
+    for (_, index), (group_scores, group_flags) in zip(groups, results):
+        isolation_score.loc[index] = group_scores
+        isolation_flag.loc[index] = group_flags
+
+    result = metrics[["bank_name", "type", "quarter"]].copy()
+    result = pd.concat([result, scores], axis=1)
+    result["max_abs_z"] = scores.abs().max(axis=1)
+    result["isolation_score"] = isolation_score
+    result["isolation_flag"] = isolation_flag
+    result["is_anomaly"] = (result["max_abs_z"] > z_threshold) | isolation_flag
+    result["anomaly_reason"] = _reasons(scores, isolation_flag, z_threshold)
+
+    return result
+
+def _reasons(scores, isolation_flag, z_threshold):
+    """Human-readable reason per row, e.g. 'cd_change_qoq z=+4.1; isolation forest'"""
+    parts = []
+    for column in scores.columns:
+        hit = scores[column].abs() > z_threshold
+        parts.append(np.where(hit, column[2:] + " z=" + scores[column].map("{:+.1f}".format) + "; ", ""))
+    parts.append(np.where(isolation_flag, "isolation forest", ""))
+    return pd.Series(np.sum(parts, axis=0), index=scores.index).str.rstrip("; ")
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PERSISTENCE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def anomaly_path(panel):
+    """Location of the persisted scores for this data version"""
+    return os.path.join(CACHE_DIR, f"anomaly_scores_{panel_fingerprint(panel):x}.parquet")
+
+def run_anomaly_batch(panel, **kwargs):
+    """Score the panel and persist the results next to the data version"""
+    scores = score_anomalies(panel, **kwargs)
+    path = anomaly_path(panel)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Write aside and swap in, so readers never see a partial file
+    temporary = f"{path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    scores.to_parquet(temporary, index=False)
+    os.replace(temporary, path)
+    return scores
+
+def load_anomaly_scores(panel):
+    """Persisted scores for this data version, or None while the batch has not run"""
+    path = anomaly_path(panel)
+    if not os.path.exists(path):
+        return None
+    scores = pd.read_parquet(path)
+    scores["quarter"] = pd.Categorical(scores["quarter"], categories=panel["quarter"].cat.categories,
+                                       ordered=True)
+    return scores
+
+def pending_anomaly_scores(panel):
+    """Unflagged rows shaped like the scores, shown until the batch has run"""
+    result = panel[["bank_name", "type", "quarter"]].copy()
+    result["max_abs_z"] = np.nan
+    result["isolation_score"] = np.nan
+    result["is_anomaly"] = False
+    result["anomaly_reason"] = ""
+    return result
+
+if __name__ == "__main__":
+    from data import build_panel, get_bank_cd_ratio_data
+
+    batch = run_anomaly_batch(build_panel(get_bank_cd_ratio_data()))
+    print(f"Scored {len(batch)} bank-quarters, {int(batch['is_anomaly'].sum())} flagged")
@@ -0,0 +1,173 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Version Diffing - Changed Cells, CD Status Moves & Sector Deltas
+
+Compare two dataset versions (None is the built-in dataset):
+    python changes.py <old> <new>
+"""
+
+import os
+import sys
+import threading
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+
+from analytics import STATUS_LABELS, classify_cd_status
+from config import DATA_VERSIONS_DIR
+from data import QUARTER_KEYS, QUARTER_LABELS, get_bank_cd_ratio_data
+from versions import load_frames, load_manifest, manifest_path, split_columns
+
+MEASURES = ["deposits", "advances"]
+BALANCE_COLUMNS = [f"{q}_{measure}" for q in QUARTER_KEYS for measure in MEASURES]
+
+_changes_cache = LRUCache(maxsize=16)
+_changes_lock = threading.Lock()
+
+def load_balances(version, root=DATA_VERSIONS_DIR):
+    """Bank × "{quarter}_{measure}" balances of a version (None → built-in dataset)"""
+    if version is None:
+        frame = split_columns(get_bank_cd_ratio_data())["balances"]
+    else:
+        frame = load_frames(version, root, ["balances"])["balances"]
+    return frame.reindex(columns=BALANCE_COLUMNS).astype(float)
+
+def parent_version(version, root=DATA_VERSIONS_DIR):
+    """Version that was served before this one was snapshotted (None → built-in)"""
+    if version is None or not os.path.exists(manifest_path(version, root)):
+        return None
+    return load_manifest(version, root)["parent"]
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DIFF ENGINE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _block_hashes(frame):
+    """
+    (banks, quarters) content hashes, one per bank × quarter block
+
+    Each hash covers that bank's deposits and advances for the quarter in
+    column order, so swapped values change it. Hashes are never summed:
+    sums are blind to values moving between cells.
+    """
+    return np.column_stack([
+        pd.util.hash_pandas_object(frame[[f"{q}_{measure}" for measure in MEASURES]], index=False).to_numpy()
+        for q in QUARTER_KEYS
+    ])
+
+def _weighted_cd(deposits, advances):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.nansum(advances, axis=0) / np.nansum(deposits, axis=0) * 100
+
+def diff_balances(old, new):
+    """
+    Changed cells, CD status moves and sector deltas between two balance frames
+
+    Banks are compared block-wise: a hash per bank × quarter block picks
+    out the banks and quarters that can differ, and only that sub-block is
+    compared with vectorized equality masks (NaN equals NaN). Returns a dict
+    of DataFrames plus the changed banks (the refresh pipeline updates the
+    peer index for just those) and changed quarters.
+    """
+    common = old.index.intersection(new.index, sort=False)
+    old_common, new_common = old.loc[common], new.loc[common]
+
+    block_changed = _block_hashes(old_common) != _block_hashes(new_common)
+    row_changed = block_changed.any(axis=1)
+    quarter_changed = block_changed.any(axis=0)
+    banks = common[row_changed]
+    quarter_index = np.flatnonzero(quarter_changed)
+
+    a = old_common.to_numpy()[row_changed].reshape(len(banks), len(QUARTER_KEYS), len(MEASURES))[:, quarter_index]
+    b = new_common.to_numpy()[row_changed].reshape(len(banks), len(QUARTER_KEYS), len(MEASURES))[:, quarter_index]
+    changed = ~((a == b) | (np.isnan(a) & np.isnan(b)))
+
+    bank_pos, quarter_pos, measure_pos = np.nonzero(changed)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cells = pd.DataFrame({
+            "bank_name": banks.to_numpy()[bank_pos],
+            "quarter": np.asarray(QUARTER_LABELS)[quarter_index[quarter_pos]],
+            "measure": np.asarray(MEASURES)[measure_pos],
+            "old": a[bank_pos, quarter_pos, measure_pos],
+            "new": b[bank_pos, quarter_pos, measure_pos],
+        })
+        cells["change"] = cells["new"] - cells["old"]
+        cells["pct_change"] = cells["change"] / cells["old"] * 100
+
+        # CD status of every changed bank × quarter, before and after
+        touched = changed.any(axis=2)
+        old_cd = a[..., 1] / a[..., 0] * 100
+        new_cd = b[..., 1] / b[..., 0] * 100
+    old_status, new_status = classify_cd_status(old_cd), classify_cd_status(new_cd)
+    moved_bank, moved_quarter = np.nonzero(touched & (old_status != new_status))
+    status_changes = pd.DataFrame({
+        "bank_name": banks.to_numpy()[moved_bank],
+        "quarter": np.asarray(QUARTER_LABELS)[quarter_index[moved_quarter]],
+        "old_cd": old_cd[moved_bank, moved_quarter],
+        "new_cd": new_cd[moved_bank, moved_quarter],
+        "old_status": np.asarray(STATUS_LABELS)[old_status[moved_bank, moved_quarter]],
+        "new_status": np.asarray(STATUS_LABELS)[new_status[moved_bank, moved_quarter]],
+    })
+
+    banks_added = new.index.difference(old.index).tolist()
+    banks_removed = old.index.difference(new.index).tolist()
+    changed_quarters = [QUARTER_LABELS[i] for i in quarter_index[touched.any(axis=0)]]
+    if banks_added or banks_removed:
+        changed_quarters = list(QUARTER_LABELS)
+
+    # Sector totals per quarter from the full frames (covers added/removed banks too)
+    shape = (-1, len(QUARTER_KEYS), len(MEASURES))
+    old_values, new_values = old.to_numpy().reshape(shape), new.to_numpy().reshape(shape)
+    sector = pd.DataFrame({
+        "old_weighted_cd": _weighted_cd(old_values[..., 0], old_values[..., 1]),
+        "new_weighted_cd": _weighted_cd(new_values[..., 0], new_values[..., 1]),
+        "deposits_change": np.nansum(new_values[..., 0], axis=0) - np.nansum(old_values[..., 0], axis=0),
+        "advances_change": np.nansum(new_values[..., 1], axis=0) - np.nansum(old_values[..., 1], axis=0),
+    }, index=pd.Index(QUARTER_LABELS, name="quarter"))
+    sector.insert(2, "weighted_cd_change", sector["new_weighted_cd"] - sector["old_weighted_cd"])
+
+    return {
+        "cells": cells,
+        "status_changes": status_changes,
+        "sector": sector.loc[changed_quarters],
+        "banks_added": banks_added,
+        "banks_removed": banks_removed,
+        "changed_banks": sorted(set(cells["bank_name"]) | set(banks_added)),
+        "changed_quarters": changed_quarters,
+        "blocks_compared": int(changed.size),
+        "blocks_total": len(common) * len(BALANCE_COLUMNS),
+    }
+
+def get_version_changes(old, new, root=DATA_VERSIONS_DIR):
+    """Memoized diff_balances between two versions (versions are immutable)"""
+    key = (old, new, root)
+    with _changes_lock:
+        changes = _changes_cache.get(key)
+    if changes is None:
+        changes = diff_balances(load_balances(old, root), load_balances(new, root))
+        with _changes_lock:
+            _changes_cache[key] = changes
+    return changes
+
+def summarize_changes(changes):
+    """Counts for logs and refresh reports"""
+    return {
+        "cells_changed": len(changes["cells"]),
+        "banks_changed": len(changes["changed_banks"]),
+        "status_changes": len(changes["status_changes"]),
+        "banks_added": len(changes["banks_added"]),
+        "banks_removed": len(changes["banks_removed"]),
+        "quarters_changed": changes["changed_quarters"],
+    }
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(__doc__)
+        sys.exit(1)
+    old_version, new_version = (None if arg == "None" else arg for arg in sys.argv[1:])
+    result = get_version_changes(old_version, new_version)
+    print(summarize_changes(result))
+    print(result["cells"].to_string(index=False))
+    print(result["status_changes"].to_string(index=False))
+    print(result["sector"].round(3).to_string())
@@ -0,0 +1,164 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Behavioural Clustering of Banks by CD Trajectory & Growth
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+from sklearn.cluster import AgglomerativeClustering, KMeans, MiniBatchKMeans
+from sklearn.metrics import adjusted_rand_score
+
+from analytics import QUARTERS_PER_YEAR, get_rolling_metrics, panel_fingerprint, panel_to_matrix
+
+CLUSTER_METHODS = {
+    "kmeans": "K-Means",
+    "hierarchical": "Hierarchical (Ward)",
+}
+
+# Above this many banks k-means switches to MiniBatchKMeans, and Ward
+# linkage runs on MiniBatchKMeans micro-clusters instead of every bank,
+# so memory stays bounded (full Ward linkage is O(banks²))
+MINIBATCH_MIN_BANKS = 1000
+MICRO_CLUSTERS = 256
+MINIBATCH_SIZE = 1024
+
+GROWTH_FEATURES = ["cd_level", "loan_growth", "deposit_growth"]
+
+_cluster_cache = LRUCache(maxsize=16)
+_pending = {}
+_pending_lock = threading.Lock()
+_dispatcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clustering")
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FEATURES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def build_cluster_features(panel):
+    """
+    One row per bank: z-normalised CD path (shape) plus standardised level and growth
+
+    Returns (features DataFrame, CD matrix, annualised growth %). The path
+    columns are scaled by 1/sqrt(quarters) so the whole trajectory weighs
+    about as much as one growth feature.
+    """
+    cd = panel_to_matrix(panel, "cd_ratio")
+    values = cd.to_numpy(dtype=float)
+    std = values.std(axis=1, keepdims=True)
+    path = np.where(std > 1e-9, (values - values.mean(axis=1, keepdims=True)) / np.where(std > 1e-9, std, 1), 0)
+
+    growth = get_rolling_metrics(panel).groupby("bank_name", observed=True)[
+        ["loan_growth_qoq", "deposit_growth_qoq"]].mean().reindex(cd.index) * QUARTERS_PER_YEAR
+    summary = np.column_stack([values.mean(axis=1), growth.to_numpy()])
+    summary = (summary - np.nanmean(summary, axis=0)) / np.maximum(np.nanstd(summary, axis=0), 1e-9)
+
+    features = pd.DataFrame(
+        np.hstack([path / np.sqrt(values.shape[1]), np.nan_to_num(summary)]),
+        index=cd.index,
+        columns=[f"path_{q}" for q in cd.columns.astype(str)] + GROWTH_FEATURES,
+    )
+    return features, cd, growth
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CLUSTERING
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _kmeans(features, n_clusters, seed):
+    if len(features) > MINIBATCH_MIN_BANKS:
+        model = MiniBatchKMeans(n_clusters=n_clusters, batch_size=MINIBATCH_SIZE, n_init=3, random_state=seed)
+    else:
+        model = KMeans(n_clusters=n_clusters, n_init=10, random_state=seed)
+    return model.fit_predict(features)
+
+def _hierarchical(features, n_clusters, seed):
+    if len(features) <= MINIBATCH_MIN_BANKS:
+        return AgglomerativeClustering(n_clusters=n_clusters, linkage="ward").fit_predict(features)
+
+    micro = MiniBatchKMeans(n_clusters=MICRO_CLUSTERS, batch_size=MINIBATCH_SIZE, n_init=3, random_state=seed)
+    micro_labels = micro.fit_predict(features)
+    merged = AgglomerativeClustering(n_clusters=n_clusters, linkage="ward").fit_predict(micro.cluster_centers_)
+    return merged[micro_labels]
+
+def _check_method(method):
+    if method not in CLUSTER_METHODS:
+        raise ValueError(f"Unknown clustering method '{method}', expected one of {list(CLUSTER_METHODS)}")
+    return method
+
+def cluster_banks(panel, n_clusters=4, method="kmeans", seed=42):
+    """
+    Cluster banks on CD trajectory and growth features
+
+    Returns a dict with:
+      assignments - bank_name, type, cluster (0 = lowest average CD)
+      centroids   - per-cluster mean CD by quarter plus size and growth summary
+      method, n_clusters
+    """
+    _check_method(method)
+    features, cd, growth = build_cluster_features(panel)
+    n_clusters = min(n_clusters, len(features))
+    labels = (_kmeans if method == "kmeans" else _hierarchical)(features.to_numpy(), n_clusters, seed)
+
+    # Relabel so cluster numbers are stable across reruns: ordered by average CD
+    order = np.argsort(pd.Series(cd.mean(axis=1).to_numpy()).groupby(labels).mean().reindex(
+        range(n_clusters)).fillna(np.inf).to_numpy(), kind="stable")
+    labels = np.argsort(order)[labels]
+
+    types = panel.drop_duplicates("bank_name").set_index("bank_name")["type"]
+    assignments = pd.DataFrame({
+        "bank_name": cd.index,
+        "type": types.reindex(cd.index).to_numpy(),
+        "cluster": labels,
+    })
+
+    centroids = cd.groupby(labels).mean()
+    centroids.columns = list(centroids.columns.astype(str))
+    centroids.index.name = "cluster"
+    latest = panel[panel["quarter"] == panel["quarter"].max()].set_index("bank_name").reindex(cd.index)
+    centroids["banks"] = np.bincount(labels, minlength=n_clusters)
+    centroids["avg_cd"] = cd.mean(axis=1).groupby(labels).mean()
+    centroids["total_advances"] = latest["advances"].groupby(labels).sum()
+    centroids["loan_growth"] = growth["loan_growth_qoq"].groupby(labels).mean().to_numpy()
+    centroids["deposit_growth"] = growth["deposit_growth_qoq"].groupby(labels).mean().to_numpy()
+
+    return {"assignments": assignments, "centroids": centroids, "method": method, "n_clusters": n_clusters}
+
+def get_clusters(panel, n_clusters=4, method="kmeans", wait=False):
+    """
+    Return cached clusters for this data version, or None while computing
+
+    The first request for a (data version, n_clusters, method) key is
+    dispatched to a background thread, as with forecasts; wait=True blocks.
+    A failed run raises its error once and is dropped, so the next call
+    dispatches it again.
+    """
+    key = (panel_fingerprint(panel), n_clusters, _check_method(method))
+    with _pending_lock:
+        clusters = _cluster_cache.get(key)
+        if clusters is not None:
+            return clusters
+        future = _pending.get(key)
+        if future is None:
+            future = _pending[key] = _dispatcher.submit(cluster_banks, panel, n_clusters, method)
+    if wait:
+        future.exception()  # blocks until done without raising
+    if not future.done():
+        return None
+
+    with _pending_lock:
+        _pending.pop(key, None)
+    clusters = future.result()
+    with _pending_lock:
+        _cluster_cache[key] = clusters
+    return clusters
+
+def cluster_type_crosstab(clusters):
+    """Bank counts by behavioural cluster × official bank type"""
+    return pd.crosstab(clusters["assignments"]["cluster"], clusters["assignments"]["type"])
+
+def type_agreement(clusters):
+    """Adjusted Rand index between behavioural clusters and official types (1 = identical, ~0 = unrelated)"""
+    assignments = clusters["assignments"]
+    return float(adjusted_rand_score(assignments["type"], assignments["cluster"]))
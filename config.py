@@ -5,6 +5,12 @@ Configuration File - Colors, Constants, and Settings
 Version 1.0.0
 """
 
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
 # ═══════════════════════════════════════════════════════════════════════════
 # BRANDING & PROJECT INFORMATION
 # ═══════════════════════════════════════════════════════════════════════════
@@ -157,7 +163,27 @@ CD_RATIO_STATUS = {
     "moderate": "🟡 MODERATE",
     "low": "⚠️ LOW",
     "high": "🟠 HIGH",
-    "critical": "🔴 CRITICAL"
+    "critical": "🔴 CRITICAL",
+    "na": "⚪ N/A"
+}
+
+# Composite liquidity-risk score component weights (see risk.py)
+RISK_SCORE_WEIGHTS = {
+    "level": 0.30,                  # CD percentile within the quarter
+    "momentum": 0.20,               # QoQ CD change
+    "divergence": 0.20,             # Advance growth - deposit growth
+    "volatility": 0.10,             # Rolling CD std dev
+    "proximity": 0.20,              # Distance to 85% / 95% thresholds
+}
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ASSET QUALITY & CAPITAL BENCHMARKS
+# ═══════════════════════════════════════════════════════════════════════════
+
+ASSET_QUALITY_BENCHMARKS = {
+    "min_car": 11.5,                # RBI CRAR 9% + 2.5% capital conservation buffer
+    "min_pcr": 70.0,                # Provision coverage ratio
+    "max_nnpa": 1.0,                # Net NPA %
 }
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -205,6 +231,9 @@ METRICS = {
     "loan_growth": "YoY Loan Growth % = ((Current Year Advances - Previous Year Advances) / Previous Year Advances) × 100",
     "deposit_growth": "YoY Deposit Growth % = ((Current Year Deposits - Previous Year Deposits) / Previous Year Deposits) × 100",
     "npa_ratio": "NPA Ratio % = (Non-Performing Assets / Total Assets) × 100",
+    "gnpa_ratio": "GNPA % = (Gross NPAs / Total Advances) × 100",
+    "nnpa_ratio": "NNPA % = (Net NPAs / Total Advances) × 100",
+    "pcr": "PCR % = (Provisions / Gross NPAs) × 100",
     "growth_divergence": "Growth Divergence = Advance Growth % - Deposit Growth %",
 }
 
@@ -272,6 +301,21 @@ CHART_COLORS = {
     "negative": COLORS["negative"],
 }
 
+# Multi-bank overlays: per-bank legend entries up to OVERLAY_LEGEND_MAX series,
+# a single merged WebGL trace beyond that, and at most OVERLAY_MAX_SERIES drawn
+OVERLAY_LEGEND_MAX = 12
+OVERLAY_MAX_SERIES = 300
+
+# Chart decimation: points kept per line series (LTTB), per series in a
+# multi-bank overlay, and outlier points drawn per box
+DECIMATION_MAX_POINTS = 500
+DECIMATION_OVERLAY_POINTS = 60
+BOX_MAX_OUTLIERS = 50
+
+# As-of quarter selector: per-quarter views kept per dataset (one per quarter
+# covers the full history; least recently viewed quarters are evicted beyond that)
+QUARTER_VIEW_CACHE_SIZE = 8
+
 # ═══════════════════════════════════════════════════════════════════════════
 # EXPORT FORMATS
 # ═══════════════════════════════════════════════════════════════════════════
@@ -282,6 +326,58 @@ EXPORT_FORMATS = {
     "json": "📋 JSON Format",
 }
 
+# ═══════════════════════════════════════════════════════════════════════════
+# FEATURE FLAGS & RUNTIME SETTINGS (from environment / .env, see env.example)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _env_flag(name, default):
+    """Read a true/false flag from the environment"""
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+ENABLE_ML_FEATURES = _env_flag("ENABLE_ML_FEATURES", False)
+ENABLE_STRESS_TESTING = _env_flag("ENABLE_STRESS_TESTING", True)
+ENABLE_PORTFOLIO_ANALYTICS = _env_flag("ENABLE_PORTFOLIO_ANALYTICS", False)
+
+# Gross NPA % above which a bank is flagged (kept within the health page's slider range)
+NPA_THRESHOLD_MIN, NPA_THRESHOLD_MAX = 0.5, 10.0
+NPA_THRESHOLD = min(max(float(os.getenv("NPA_THRESHOLD", "3.0")), NPA_THRESHOLD_MIN), NPA_THRESHOLD_MAX)
+
+# Forecasting
+FORECAST_HORIZON = int(os.getenv("FORECAST_HORIZON", "4"))          # Quarters ahead
+FORECAST_CONFIDENCE = float(os.getenv("FORECAST_CONFIDENCE", "0.95"))
+MAX_WORKERS = int(os.getenv("MAX_WORKERS", str(os.cpu_count() or 1)))
+
+# Derived analytics persisted per data version
+CACHE_DIR = os.getenv("CACHE_DIR", "data/cache")
+
+# Monte Carlo liquidity simulation (paths snap to the nearest page option)
+MONTE_CARLO_PATH_OPTIONS = [1000, 5000, 10000, 50000, 100000]
+MONTE_CARLO_PATHS = min(MONTE_CARLO_PATH_OPTIONS,
+                        key=lambda paths: abs(paths - int(os.getenv("MONTE_CARLO_PATHS", "10000"))))
+MONTE_CARLO_SEED = int(os.getenv("MONTE_CARLO_SEED", "42"))
+
+# Anomaly detection
+ANOMALY_Z_THRESHOLD = float(os.getenv("ANOMALY_Z_THRESHOLD", "3.5"))
+ANOMALY_CONTAMINATION = float(os.getenv("ANOMALY_CONTAMINATION", "0.05"))
+
+# Data sources and refresh (the refresh service swaps in new versions atomically)
+RBI_DATA_FOLDER = os.getenv("RBI_DATA_FOLDER", "data/rbi_monthly")
+BANK_REPORTS_FOLDER = os.getenv("BANK_REPORTS_FOLDER", "data/bank_reports")
+PDF_EXTRACT_TIMEOUT = float(os.getenv("PDF_EXTRACT_TIMEOUT", "60"))  # Seconds per file
+DATA_VERSIONS_DIR = os.getenv("DATA_VERSIONS_DIR", "data/versions")
+AUTO_UPDATE_DATA = _env_flag("AUTO_UPDATE_DATA", False)
+DATA_UPDATE_INTERVAL = float(os.getenv("DATA_UPDATE_INTERVAL", "24"))  # Hours
+RBI_UPDATE_DAY = int(os.getenv("RBI_UPDATE_DAY", "15"))               # Day of month
+
+# Data validation (banks failing these checks are quarantined by the refresh)
+VALIDATION_MIN_CD = float(os.getenv("VALIDATION_MIN_CD", "20"))
+VALIDATION_MAX_CD = float(os.getenv("VALIDATION_MAX_CD", "200"))
+VALIDATION_MAX_QOQ_CHANGE = float(os.getenv("VALIDATION_MAX_QOQ_CHANGE", "0.5"))  # Fraction
+
+# Market data ("yfinance" or "replay" from MARKET_REPLAY_FILE for offline use)
+MARKET_DATA_PROVIDER = os.getenv("MARKET_DATA_PROVIDER", "yfinance")
+MARKET_REPLAY_FILE = os.getenv("MARKET_REPLAY_FILE", "data/market/replay.csv")
+
 # ═══════════════════════════════════════════════════════════════════════════
 # APP METADATA
 # ═══════════════════════════════════════════════════════════════════════════
@@ -7,6 +7,14 @@ Data Generation & Processing
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from functools import partial
+import threading
+import zlib
+
+from cachetools import LRUCache
+
+from config import QUARTER_VIEW_CACHE_SIZE
+from decimation import box_stats
 
 def get_bank_cd_ratio_data():
     """
@@ -914,38 +922,262 @@ def get_bank_cd_ratio_data():
     
     return all_bank_data
 
-def generate_data():
+# ═══════════════════════════════════════════════════════════════════════════
+# BANK × QUARTER PANEL
+# ═══════════════════════════════════════════════════════════════════════════
+
+QUARTER_KEYS = ["q1_fy24", "q2_fy24", "q3_fy24", "q4_fy24", "q1_fy25", "q2_fy25", "q3_fy25"]
+QUARTER_LABELS = ["Q1 FY24", "Q2 FY24", "Q3 FY24", "Q4 FY24", "Q1 FY25", "Q2 FY25", "Q3 FY25"]
+LATEST_QUARTER = QUARTER_LABELS[-1]
+
+SECTOR_LABEL = "All Banks"
+
+def next_quarter_labels(label, count):
+    """Return the `count` fiscal-quarter labels following e.g. "Q3 FY25" """
+    quarter, fiscal_year = int(label[1]), int(label[-2:])
+    labels = []
+    for _ in range(count):
+        quarter += 1
+        if quarter > 4:
+            quarter, fiscal_year = 1, fiscal_year + 1
+        labels.append(f"Q{quarter} FY{fiscal_year:02d}")
+    return labels
+
+def build_panel(bank_data):
+    """
+    Reshape raw bank data into a long bank × quarter panel
+    Columns: bank_name, type, quarter (ordered categorical), deposits, advances, cd_ratio
+    """
+    raw = pd.DataFrame.from_dict(bank_data, orient="index")
+    deposits = raw[[f"{q}_deposits" for q in QUARTER_KEYS]].to_numpy(dtype=float)
+    advances = raw[[f"{q}_advances" for q in QUARTER_KEYS]].to_numpy(dtype=float)
+    n_banks, n_quarters = deposits.shape
+    
+    panel = pd.DataFrame({
+        "bank_name": np.repeat(raw.index.to_numpy(), n_quarters),
+        "type": np.repeat(raw["type"].to_numpy(), n_quarters),
+        "quarter": pd.Categorical(np.tile(QUARTER_LABELS, n_banks), categories=QUARTER_LABELS, ordered=True),
+        "deposits": deposits.ravel(),
+        "advances": advances.ravel(),
+    })
+    panel["cd_ratio"] = panel["advances"] / panel["deposits"] * 100
+    
+    return panel
+
+def aggregate_panel(panel):
+    """
+    Reduce the panel to per-type and sector-wide statistics for every quarter
+    
+    avg_cd/median_cd weigh every bank equally; weighted_cd is the system-level
+    ratio (sum of advances / sum of deposits). Returns a frame indexed by
+    (type, quarter), with sector-wide rows under SECTOR_LABEL.
+    """
+    stats = {
+        "count": ("cd_ratio", "size"),
+        "avg_cd": ("cd_ratio", "mean"),
+        "median_cd": ("cd_ratio", "median"),
+        "min_cd": ("cd_ratio", "min"),
+        "max_cd": ("cd_ratio", "max"),
+        "total_deposits": ("deposits", "sum"),
+        "total_advances": ("advances", "sum"),
+    }
+    by_type = panel.groupby(["type", "quarter"], observed=True, sort=False).agg(**stats)
+    sector = panel.groupby("quarter", observed=True).agg(**stats)
+    sector.index = pd.MultiIndex.from_product([[SECTOR_LABEL], sector.index], names=["type", "quarter"])
+    
+    aggregates = pd.concat([by_type, sector])
+    aggregates["weighted_cd"] = aggregates["total_advances"] / aggregates["total_deposits"] * 100
+    
+    return aggregates.sort_index(level="quarter", sort_remaining=False)
+
+def distribution_stats(panel):
+    """
+    CD box statistics per quarter and bank type (quartiles, whiskers, outliers)
+    
+    Precomputed once per dataset, so distribution charts are drawn from
+    summaries at a cost independent of the number of banks. Indexed by
+    (quarter, type).
+    """
+    return box_stats(panel["cd_ratio"], [panel["quarter"], panel["type"]])
+
+# ═══════════════════════════════════════════════════════════════════════════
+# MULTI-MEASURE PANEL STORE (bank × quarter × measure)
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Source tag for core values that came with the built-in dataset
+DEFAULT_SOURCE = "Built-in"
+
+ADVANCE_SEGMENTS = ["retail", "corporate", "msme", "agricultural"]
+DEPOSIT_SEGMENTS = ["savings", "current", "term"]
+
+MEASURE_GROUPS = {
+    "core": ["deposits", "advances"],
+    "deposit_mix": [f"deposits_{s}" for s in DEPOSIT_SEGMENTS],
+    "advance_mix": [f"advances_{s}" for s in ADVANCE_SEGMENTS],
+    "asset_quality": ["gross_npa", "net_npa", "provisions", "car"],
+}
+
+# Segment mix by bank type at Q1 FY24 and drift per quarter (shares of the total).
+# Used to estimate breakdowns until bank disclosures are ingested.
+SEGMENT_MIX_PROFILES = {
+    "PSB": {
+        "advances": ([0.24, 0.40, 0.18, 0.18], [0.004, -0.005, 0.001, 0.000]),
+        "deposits": ([0.35, 0.07, 0.58], [-0.003, 0.000, 0.003]),
+    },
+    "Private": {
+        "advances": ([0.45, 0.33, 0.15, 0.07], [0.003, -0.004, 0.001, 0.000]),
+        "deposits": ([0.30, 0.12, 0.58], [-0.004, -0.001, 0.005]),
+    },
+    "SFB": {
+        "advances": ([0.35, 0.05, 0.30, 0.30], [0.003, 0.000, 0.001, -0.004]),
+        "deposits": ([0.20, 0.05, 0.75], [-0.002, 0.000, 0.002]),
+    },
+    "Foreign": {
+        "advances": ([0.10, 0.70, 0.15, 0.05], [0.001, -0.002, 0.001, 0.000]),
+        "deposits": ([0.10, 0.35, 0.55], [0.000, -0.003, 0.003]),
+    },
+    "Historical PSB": {
+        "advances": ([0.22, 0.42, 0.18, 0.18], [0.004, -0.005, 0.001, 0.000]),
+        "deposits": ([0.36, 0.07, 0.57], [-0.003, 0.000, 0.003]),
+    },
+}
+
+# Asset quality & capital by bank type: Q1 FY24 GNPA %, GNPA drift per quarter,
+# provision coverage (share of GNPA) and capital adequacy ratio %.
+# Used to estimate NPA/CAR series until bank disclosures are ingested.
+ASSET_QUALITY_PROFILES = {
+    "PSB": {"gnpa": 4.5, "gnpa_drift": -0.25, "coverage": 0.80, "car": 15.5},
+    "Private": {"gnpa": 2.2, "gnpa_drift": -0.05, "coverage": 0.75, "car": 17.5},
+    "SFB": {"gnpa": 2.8, "gnpa_drift": 0.05, "coverage": 0.65, "car": 20.0},
+    "Foreign": {"gnpa": 1.5, "gnpa_drift": -0.02, "coverage": 0.85, "car": 18.0},
+    "Historical PSB": {"gnpa": 6.0, "gnpa_drift": -0.30, "coverage": 0.78, "car": 13.5},
+}
+
+def _bank_offsets(banks):
+    """Stable per-bank value in [-1, 1) so estimated series differ within a type"""
+    return np.array([zlib.crc32(name.encode()) / 2 ** 31 - 1 for name in banks], dtype=np.float32)
+
+def _estimate_asset_quality(advances, banks, bank_types):
+    """Estimate (banks, quarters, [gross_npa, net_npa, provisions, car]) from ASSET_QUALITY_PROFILES"""
+    profile = pd.DataFrame([ASSET_QUALITY_PROFILES[t] for t in bank_types]).to_numpy(dtype=np.float32)
+    gnpa, drift, coverage, car = profile.T
+    offset = _bank_offsets(banks)
+    quarters = np.arange(advances.shape[1], dtype=np.float32)
+    
+    gnpa_pct = np.maximum(gnpa[:, None] * (1 + 0.4 * offset[:, None]) + drift[:, None] * quarters, 0.1)
+    gross_npa = advances * gnpa_pct / 100
+    provisions = gross_npa * np.clip(coverage + 0.1 * offset, 0, 1)[:, None]
+    capital = np.broadcast_to((car + 1.5 * offset)[:, None], advances.shape)
+    
+    return np.stack([gross_npa, gross_npa - provisions, provisions, capital], axis=-1)
+
+def _estimate_segments(totals, bank_types, side):
+    """Split (banks, quarters) totals into (banks, quarters, segments) using SEGMENT_MIX_PROFILES"""
+    n_quarters = totals.shape[1]
+    base = np.array([SEGMENT_MIX_PROFILES[t][side][0] for t in bank_types], dtype=np.float32)
+    drift = np.array([SEGMENT_MIX_PROFILES[t][side][1] for t in bank_types], dtype=np.float32)
+    shares = base[:, None, :] + drift[:, None, :] * np.arange(n_quarters, dtype=np.float32)[None, :, None]
+    shares /= shares.sum(axis=-1, keepdims=True)
+    return totals[:, :, None] * shares
+
+def build_panel_store(bank_data):
+    """
+    Build a compact bank × quarter × measure store (float32)
+    
+    Core totals are loaded eagerly; segment measure groups are registered
+    as loaders and only materialised on first access via get_measures.
+    store["sources"] tags where each bank × quarter core value came from
+    (the optional "{quarter}_source" fields set by ingestion).
+    """
+    raw = pd.DataFrame.from_dict(bank_data, orient="index")
+    bank_types = raw["type"].to_numpy()
+    core = np.stack([
+        raw[[f"{q}_deposits" for q in QUARTER_KEYS]].to_numpy(dtype=np.float32),
+        raw[[f"{q}_advances" for q in QUARTER_KEYS]].to_numpy(dtype=np.float32),
+    ], axis=-1)
+    
+    source_columns = [f"{q}_source" for q in QUARTER_KEYS]
+    sources = raw.reindex(columns=source_columns).fillna(DEFAULT_SOURCE).to_numpy(dtype=object)
+    
+    store = {
+        "banks": raw.index.to_numpy(),
+        "types": bank_types,
+        "quarters": list(QUARTER_LABELS),
+        "groups": {"core": core},
+        "provenance": {"core": "Verified"},
+        "sources": sources,
+        "loaders": {
+            "deposit_mix": partial(_estimate_segments, core[..., 0], bank_types, "deposits"),
+            "advance_mix": partial(_estimate_segments, core[..., 1], bank_types, "advances"),
+            "asset_quality": partial(_estimate_asset_quality, core[..., 1], raw.index.to_numpy(), bank_types),
+        },
+    }
+    store["provenance"].update({group: "Estimated" for group in store["loaders"]})
+    
+    return store
+
+def _measure_group(name):
+    """Return (group, position) of a measure within MEASURE_GROUPS"""
+    for group, measures in MEASURE_GROUPS.items():
+        if name in measures:
+            return group, measures.index(name)
+    raise KeyError(f"Unknown measure '{name}'")
+
+def get_measures(store, names):
+    """
+    Return a (banks, quarters, len(names)) tensor for the requested measures
+    Measure groups not yet in memory are loaded on first access.
+    """
+    slices = []
+    for name in names:
+        group, position = _measure_group(name)
+        if group not in store["groups"]:
+            store["groups"][group] = store["loaders"][group]()
+        slices.append(store["groups"][group][..., position])
+    return np.stack(slices, axis=-1)
+
+def generate_data(bank_data=None):
     """
     Generate comprehensive dataset for the dashboard
+    Uses the built-in bank data unless a (versioned) bank_data dict is given
     Returns dictionary with all analysis data
     """
     
-    bank_data = get_bank_cd_ratio_data()
+    if bank_data is None:
+        bank_data = get_bank_cd_ratio_data()
+    panel = build_panel(bank_data)
+    aggregates = aggregate_panel(panel)
+    trends = generate_cd_ratio_trends(bank_data, panel)
+    latest = quarter_views(bank_data, panel, aggregates)
+    views = LRUCache(maxsize=QUARTER_VIEW_CACHE_SIZE)
+    views[LATEST_QUARTER] = latest
     
     # Process data into structured format
     processed_data = {
-        "banks": process_bank_data(bank_data),
-        "cd_ratio_trends": generate_cd_ratio_trends(bank_data),
-        "bank_wise_comparison": generate_bank_comparison(bank_data),
-        "sector_summary": generate_sector_summary(bank_data),
-        "metrics": generate_key_metrics(bank_data),
+        **latest,
+        "as_of_quarter": LATEST_QUARTER,
+        "cd_ratio_trends": trends,
+        "cd_ratio_matrix": pivot_trends(trends),
+        "cd_ratio_bands": trend_bands(trends),
+        "bank_data": bank_data,
+        "quarter_views": views,
+        "panel": panel,
+        "aggregates": aggregates,
+        "cd_distribution": distribution_stats(panel),
+        "store": build_panel_store(bank_data),
     }
     
     return processed_data
 
-def process_bank_data(bank_data):
-    """Process raw bank data into structured format"""
+def process_bank_data(bank_data, quarter=LATEST_QUARTER):
+    """Process raw bank data into structured format, as of `quarter`"""
     processed = []
+    as_of = QUARTER_LABELS.index(quarter)
+    as_of_key = QUARTER_KEYS[as_of]
     
     for bank_name, data in bank_data.items():
         # Calculate CD ratios for each quarter
-        q1_fy24_cd = (data["q1_fy24_advances"] / data["q1_fy24_deposits"]) * 100
-        q2_fy24_cd = (data["q2_fy24_advances"] / data["q2_fy24_deposits"]) * 100
-        q3_fy24_cd = (data["q3_fy24_advances"] / data["q3_fy24_deposits"]) * 100
-        q4_fy24_cd = (data["q4_fy24_advances"] / data["q4_fy24_deposits"]) * 100
-        q1_fy25_cd = (data["q1_fy25_advances"] / data["q1_fy25_deposits"]) * 100
-        q2_fy25_cd = (data["q2_fy25_advances"] / data["q2_fy25_deposits"]) * 100
-        q3_fy25_cd = (data["q3_fy25_advances"] / data["q3_fy25_deposits"]) * 100
+        cd = {q: (data[f"{q}_advances"] / data[f"{q}_deposits"]) * 100 for q in QUARTER_KEYS}
         
         processed.append({
             "bank_name": bank_name,
@@ -953,52 +1185,62 @@ def process_bank_data(bank_data):
             "headquarters": data["headquarters"],
             "nse_ticker": data["nse_ticker"],
             "bse_ticker": data["bse_ticker"],
-            "q1_fy24_cd": round(q1_fy24_cd, 2),
-            "q2_fy24_cd": round(q2_fy24_cd, 2),
-            "q3_fy24_cd": round(q3_fy24_cd, 2),
-            "q4_fy24_cd": round(q4_fy24_cd, 2),
-            "q1_fy25_cd": round(q1_fy25_cd, 2),
-            "q2_fy25_cd": round(q2_fy25_cd, 2),
-            "q3_fy25_cd": round(q3_fy25_cd, 2),
-            "latest_cd": round(q3_fy25_cd, 2),
-            "avg_cd": round(np.mean([q1_fy24_cd, q2_fy24_cd, q3_fy24_cd, q4_fy24_cd, 
-                                     q1_fy25_cd, q2_fy25_cd, q3_fy25_cd]), 2),
-            "deposits_cr": data.get("q3_fy25_deposits", 0),
-            "advances_cr": data.get("q3_fy25_advances", 0),
+            **{f"{q}_cd": round(cd[q], 2) for q in QUARTER_KEYS},
+            "latest_cd": round(cd[as_of_key], 2),
+            # Average over the quarters up to the as-of quarter (no look-ahead)
+            "avg_cd": round(np.mean([cd[q] for q in QUARTER_KEYS[:as_of + 1]]), 2),
+            "deposits_cr": data.get(f"{as_of_key}_deposits", 0),
+            "advances_cr": data.get(f"{as_of_key}_advances", 0),
         })
     
     return pd.DataFrame(processed)
 
-def generate_cd_ratio_trends(bank_data):
-    """Generate CD ratio trends over time"""
-    trends = {}
-    
-    for bank_name, data in bank_data.items():
-        quarters = ["Q1 FY24", "Q2 FY24", "Q3 FY24", "Q4 FY24", "Q1 FY25", "Q2 FY25", "Q3 FY25"]
-        cd_ratios = [
-            (data["q1_fy24_advances"] / data["q1_fy24_deposits"]) * 100,
-            (data["q2_fy24_advances"] / data["q2_fy24_deposits"]) * 100,
-            (data["q3_fy24_advances"] / data["q3_fy24_deposits"]) * 100,
-            (data["q4_fy24_advances"] / data["q4_fy24_deposits"]) * 100,
-            (data["q1_fy25_advances"] / data["q1_fy25_deposits"]) * 100,
-            (data["q2_fy25_advances"] / data["q2_fy25_deposits"]) * 100,
-            (data["q3_fy25_advances"] / data["q3_fy25_deposits"]) * 100,
-        ]
-        trends[bank_name] = {
-            "quarters": quarters,
-            "cd_ratios": [round(ratio, 2) for ratio in cd_ratios],
-            "bank_type": data["type"],
-        }
+def generate_cd_ratio_trends(bank_data, panel=None):
+    """
+    CD ratio trends as one long table: bank_name, type, quarter, cd_ratio
+
+    Bank, type and quarter are categoricals, so each label is stored once
+    and rows hold small integer codes; slice it with masks or pivot_trends.
+    """
+    if panel is None:
+        panel = build_panel(bank_data)
+    return pd.DataFrame({
+        "bank_name": pd.Categorical(panel["bank_name"], categories=list(bank_data)),
+        "type": panel["type"].astype("category"),
+        "quarter": panel["quarter"],
+        "cd_ratio": panel["cd_ratio"].round(2),
+    })
+
+def pivot_trends(trends):
+    """Bank × quarter CD matrix from the long trends table"""
+    return trends.pivot(index="bank_name", columns="quarter", values="cd_ratio")
+
+def trend_bands(trends):
+    """
+    CD quartile bands (q25, median, q75) per bank type and quarter
+
+    One grouped quantile over the long trends table; sector-wide bands are
+    added under SECTOR_LABEL. Indexed by (type, quarter).
+    """
+    quantiles = [0.25, 0.5, 0.75]
+    by_type = trends.groupby(["type", "quarter"], observed=True)["cd_ratio"].quantile(quantiles).unstack()
+    sector = trends.groupby("quarter", observed=True)["cd_ratio"].quantile(quantiles).unstack()
+    sector.index = pd.MultiIndex.from_product([[SECTOR_LABEL], sector.index], names=["type", "quarter"])
     
-    return trends
+    bands = pd.concat([by_type, sector])
+    bands.columns = ["q25", "median", "q75"]
+    return bands
 
-def generate_bank_comparison(bank_data):
-    """Generate bank-wise comparison data"""
+def generate_bank_comparison(bank_data, quarter=LATEST_QUARTER):
+    """Generate bank-wise comparison data for `quarter` against the quarter before"""
     comparison = []
+    as_of = QUARTER_LABELS.index(quarter)
+    latest_key = QUARTER_KEYS[as_of]
+    prev_key = QUARTER_KEYS[as_of - 1] if as_of else None
     
     for bank_name, data in bank_data.items():
-        latest_cd = (data["q3_fy25_advances"] / data["q3_fy25_deposits"]) * 100
-        prev_cd = (data["q2_fy25_advances"] / data["q2_fy25_deposits"]) * 100
+        latest_cd = (data[f"{latest_key}_advances"] / data[f"{latest_key}_deposits"]) * 100
+        prev_cd = (data[f"{prev_key}_advances"] / data[f"{prev_key}_deposits"]) * 100 if prev_key else np.nan
         cd_change = round(latest_cd - prev_cd, 2)
         
         comparison.append({
@@ -1008,56 +1250,90 @@ def generate_bank_comparison(bank_data):
             "latest_cd": round(latest_cd, 2),
             "prev_cd": round(prev_cd, 2),
             "cd_change": cd_change,
-            "deposits": data["q3_fy25_deposits"],
-            "advances": data["q3_fy25_advances"],
+            "deposits": data[f"{latest_key}_deposits"],
+            "advances": data[f"{latest_key}_advances"],
         })
     
     return pd.DataFrame(comparison)
 
-def generate_sector_summary(bank_data):
-    """Generate summary by bank type"""
-    summary = {"PSB": [], "Private": [], "SFB": [], "Foreign": [], "Historical PSB": []}
-    
-    for bank_name, data in bank_data.items():
-        bank_type = data["type"]
-        latest_cd = (data["q3_fy25_advances"] / data["q3_fy25_deposits"]) * 100
-        
-        # Handle different bank types
-        if bank_type not in summary:
-            summary[bank_type] = []
-        summary[bank_type].append(latest_cd)
+def generate_sector_summary(bank_data, aggregates=None, quarter=LATEST_QUARTER):
+    """Generate summary by bank type (equal-weighted and deposit-weighted) as of `quarter`"""
+    if aggregates is None:
+        aggregates = aggregate_panel(build_panel(bank_data))
     
     # Build sector summary dynamically
     sector_summary = {}
     
-    for bank_type, cd_ratios in summary.items():
-        if len(cd_ratios) > 0:  # Only include types that have banks
-            sector_summary[bank_type] = {
-                "count": len(cd_ratios),
-                "avg_cd": round(np.mean(cd_ratios), 2),
-                "median_cd": round(np.median(cd_ratios), 2),
-                "min_cd": round(np.min(cd_ratios), 2),
-                "max_cd": round(np.max(cd_ratios), 2),
-            }
+    for bank_type, rows in aggregates.drop(SECTOR_LABEL, level="type").groupby(level="type", sort=False):
+        rows = rows.droplevel("type")
+        latest = rows.loc[quarter]
+        sector_summary[bank_type] = {
+            "count": int(latest["count"]),
+            "avg_cd": round(latest["avg_cd"], 2),
+            "median_cd": round(latest["median_cd"], 2),
+            "min_cd": round(latest["min_cd"], 2),
+            "max_cd": round(latest["max_cd"], 2),
+            "weighted_cd": round(latest["weighted_cd"], 2),
+            "total_deposits": latest["total_deposits"],
+            "total_advances": latest["total_advances"],
+            "weighted_cd_by_quarter": rows["weighted_cd"].round(2).to_dict(),
+        }
     
     return sector_summary
 
-def generate_key_metrics(bank_data):
-    """Generate key metrics for the analysis"""
-    all_cd_ratios = []
+def generate_key_metrics(bank_data, panel=None, aggregates=None, quarter=LATEST_QUARTER):
+    """Generate key metrics for the analysis as of `quarter`"""
+    if panel is None:
+        panel = build_panel(bank_data)
+    if aggregates is None:
+        aggregates = aggregate_panel(panel)
     
-    for bank_name, data in bank_data.items():
-        cd = (data["q3_fy25_advances"] / data["q3_fy25_deposits"]) * 100
-        all_cd_ratios.append(cd)
+    sector = aggregates.loc[SECTOR_LABEL]
+    latest = sector.loc[quarter]
+    latest_cd = panel.loc[panel["quarter"] == quarter].set_index("bank_name")["cd_ratio"]
     
     metrics = {
         "total_banks": len(bank_data),
-        "sector_avg_cd": round(np.mean(all_cd_ratios), 2),
-        "sector_median_cd": round(np.median(all_cd_ratios), 2),
-        "highest_cd_bank": max(bank_data.items(), 
-                               key=lambda x: (x[1]["q3_fy25_advances"] / x[1]["q3_fy25_deposits"]) * 100)[0],
-        "lowest_cd_bank": min(bank_data.items(), 
-                              key=lambda x: (x[1]["q3_fy25_advances"] / x[1]["q3_fy25_deposits"]) * 100)[0],
+        "sector_avg_cd": round(latest["avg_cd"], 2),
+        "sector_median_cd": round(latest["median_cd"], 2),
+        "sector_weighted_cd": round(latest["weighted_cd"], 2),
+        "sector_weighted_cd_by_quarter": sector["weighted_cd"].round(2).to_dict(),
+        "highest_cd_bank": latest_cd.idxmax(),
+        "lowest_cd_bank": latest_cd.idxmin(),
     }
     
     return metrics
+
+# ═══════════════════════════════════════════════════════════════════════════
+# AS-OF QUARTER VIEWS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def quarter_views(bank_data, panel, aggregates, quarter=LATEST_QUARTER):
+    """The quarter-dependent entries of the dataset (bank tables, comparison, sector summary, metrics)"""
+    return {
+        "banks": process_bank_data(bank_data, quarter),
+        "bank_wise_comparison": generate_bank_comparison(bank_data, quarter),
+        "sector_summary": generate_sector_summary(bank_data, aggregates, quarter),
+        "metrics": generate_key_metrics(bank_data, panel, aggregates, quarter),
+    }
+
+# Sessions and warmup threads share a dataset's quarter-view LRU
+_quarter_view_lock = threading.Lock()
+
+def get_quarter_view(data, quarter):
+    """
+    The dataset re-pointed to an as-of quarter
+    
+    Views are memoized in the dataset's own bounded LRU (seeded with the
+    latest quarter), so switching quarters recomputes only the entries
+    that depend on the quarter, never the whole dataset. The LRU is only
+    touched under a lock; the view is computed outside it.
+    """
+    views = data["quarter_views"]
+    with _quarter_view_lock:
+        view = views.get(quarter)
+    if view is None:
+        view = quarter_views(data["bank_data"], data["panel"], data["aggregates"], quarter)
+        with _quarter_view_lock:
+            views[quarter] = view
+    return {**data, **view, "as_of_quarter": quarter}
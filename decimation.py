@@ -0,0 +1,125 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Chart Decimation - LTTB Line Downsampling & Pre-Aggregated Box Statistics
+
+Reduce what a figure ships to the browser before it is built: line series
+keep at most a point budget (largest-triangle-three-buckets keeps the
+visual shape), and distributions are sent as box statistics instead of
+every observation.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+
+from config import BOX_MAX_OUTLIERS, DECIMATION_MAX_POINTS
+
+_series_cache = LRUCache(maxsize=4096)
+_series_lock = threading.Lock()
+
+# ═══════════════════════════════════════════════════════════════════════════
+# LINE SERIES (LTTB)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def lttb_indices(y, threshold, x=None):
+    """
+    Positions of the points kept by largest-triangle-three-buckets
+
+    NaN points are dropped first and never picked, for candidates or for a
+    bucket's average, so no bucket is ever all-NaN. The first and last
+    finite points are always kept; each bucket in between keeps the point
+    forming the largest triangle with the previous pick and the next
+    bucket's average. x defaults to evenly spaced positions (regular
+    quarterly/monthly series).
+    """
+    y = np.asarray(y, dtype=float)
+    x = np.arange(len(y), dtype=float) if x is None else np.asarray(x, dtype=float)
+    valid = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    n_points = len(valid)
+    if threshold >= n_points or threshold < 3:
+        return valid
+    x, y = x[valid], y[valid]
+
+    edges = np.linspace(1, n_points - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n_points - 1
+    previous = 0
+
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n_points
+        next_x, next_y = x[end:next_end].mean(), y[end:next_end].mean()
+
+        area = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                      - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(area))
+        keep[bucket + 1] = previous
+
+    return valid[keep]
+
+def decimate_series(key, x, y, window=None, max_points=DECIMATION_MAX_POINTS):
+    """
+    (x, y) cut to the zoom window and reduced to at most max_points
+
+    Memoized per (key, window, max_points); key must identify the series
+    content, e.g. (data version, bank, measure). window is a (start, stop)
+    position slice, or None for the full history.
+    """
+    cache_key = (key, window, max_points)
+    with _series_lock:
+        series = _series_cache.get(cache_key)
+    if series is None:
+        x, y = np.asarray(x), np.asarray(y, dtype=float)
+        if window is not None:
+            x, y = x[window[0]:window[1]], y[window[0]:window[1]]
+        keep = lttb_indices(y, max_points)
+        series = (x[keep], y[keep])
+        with _series_lock:
+            _series_cache[cache_key] = series
+    return series
+
+# ═══════════════════════════════════════════════════════════════════════════
+# DISTRIBUTIONS (BOX STATISTICS)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def box_stats(values, groups, max_outliers=BOX_MAX_OUTLIERS):
+    """
+    Tukey box statistics per group, as plotly draws them
+
+    groups is one key array or a list of them (e.g. [quarter, type]).
+    Quartiles use linear interpolation (plotly's default); whiskers end at
+    the most extreme values within 1.5 × IQR of the box. Only the
+    max_outliers points furthest from the median are kept per group.
+    Returns a frame indexed by group: count, mean, q1, median, q3,
+    lowerfence, upperfence, outliers (list).
+    """
+    groups = list(groups) if isinstance(groups, list) else [groups]
+    keys = [getattr(group, "name", None) or f"group_{i}" for i, group in enumerate(groups)]
+    frame = pd.DataFrame({key: np.asarray(group) for key, group in zip(keys, groups)})
+    for key, group in zip(keys, groups):
+        if isinstance(getattr(group, "dtype", None), pd.CategoricalDtype):
+            frame[key] = pd.Categorical(frame[key], dtype=group.dtype)
+    frame["value"] = np.asarray(values, dtype=float)
+    frame = frame.dropna(subset=["value"])
+    grouped = frame.groupby(keys, observed=True, sort=False)["value"]
+
+    stats = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    stats.columns = ["q1", "median", "q3"]
+    stats = grouped.agg(["count", "mean"]).join(stats)
+
+    rows = frame.join(stats[["q1", "median", "q3"]], on=keys)
+    iqr = rows["q3"] - rows["q1"]
+    inside = (rows["value"] >= rows["q1"] - 1.5 * iqr) & (rows["value"] <= rows["q3"] + 1.5 * iqr)
+
+    whiskers = rows[inside].groupby(keys, observed=True)["value"].agg(["min", "max"])
+    stats["lowerfence"] = whiskers["min"]
+    stats["upperfence"] = whiskers["max"]
+
+    outside = rows[~inside].assign(distance=lambda f: (f["value"] - f["median"]).abs())
+    outside = outside.sort_values("distance", ascending=False).groupby(keys, observed=True).head(max_outliers)
+    outliers = outside.groupby(keys, observed=True)["value"].agg(list).reindex(stats.index)
+    stats["outliers"] = [points if isinstance(points, list) else [] for points in outliers]
+
+    return stats
@@ -0,0 +1,283 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+PDF Extraction of Bank Quarterly Disclosures (deposits & advances)
+
+Files in BANK_REPORTS_FOLDER are matched to banks by NSE ticker, either as
+the file name prefix (HDFCBANK_Q3FY25.pdf) or the parent folder
+(HDFCBANK/results.pdf). The quarter is read from the file name (q3_fy25,
+Q3FY25) or from the "quarter ended <date>" wording in the document.
+
+Run against the reports folder:
+    python disclosures.py
+"""
+
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import time
+from datetime import datetime
+from queue import Empty
+
+from config import BANK_REPORTS_FOLDER, CACHE_DIR, MAX_WORKERS, PDF_EXTRACT_TIMEOUT
+from data import QUARTER_KEYS, get_bank_cd_ratio_data
+
+DEPOSITS_LABEL = re.compile(r"^\s*(?:total\s+)?deposits\b(?!\s+with)", re.IGNORECASE)
+ADVANCES_LABEL = re.compile(r"^\s*(?:total\s+|net\s+)?advances\b", re.IGNORECASE)
+NUMBER = re.compile(r"\(?-?\d[\d,]*(?:\.\d+)?\)?")
+
+# Multipliers from the stated reporting unit to ₹ crore (the dataset's unit)
+UNIT_SCALES = [
+    (re.compile(r"in\s+lakhs?|₹\s*lakh|rs\.?\s*lakh", re.IGNORECASE), 0.01),
+    (re.compile(r"in\s+millions?|₹\s*mn", re.IGNORECASE), 0.1),
+    (re.compile(r"in\s+thousands?|₹\s*'?000|rs\.?\s*'?000", re.IGNORECASE), 0.0001),
+    (re.compile(r"in\s+crores?|₹\s*crore|rs\.?\s*crore|₹\s*cr\b", re.IGNORECASE), 1.0),
+]
+
+QUARTER_FILENAME = re.compile(r"q([1-4])[\s_-]*fy[\s_-]*(\d{2})", re.IGNORECASE)
+QUARTER_ENDED = re.compile(
+    r"(?:quarter|period|nine months|half year|year)\s+ended\s+(?:on\s+)?"
+    r"(\d{1,2}(?:st|nd|rd|th)?[\s./-]+(?:\d{1,2}|[a-z]+)[\s.,/-]+\d{4}|[a-z]+\s+\d{1,2},?\s+\d{4})",
+    re.IGNORECASE,
+)
+QUARTER_END_MONTHS = {6: 1, 9: 2, 12: 3, 3: 4}
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PAGE PARSING (pure functions, no PDF library needed)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _to_number(token):
+    value = float(token.strip("()").replace(",", ""))
+    return -value if token.startswith("(") else value
+
+def detect_scale(text):
+    """₹ crore multiplier for the unit stated on a page (crore if none stated)"""
+    for pattern, scale in UNIT_SCALES:
+        if pattern.search(text or ""):
+            return scale
+    return 1.0
+
+def quarter_from_date(text):
+    """Quarter key ('q3_fy25') for a quarter-end date string, or None"""
+    cleaned = re.sub(r"(\d)(st|nd|rd|th)", r"\1", text.strip(), flags=re.IGNORECASE)
+    cleaned = re.sub(r"[\s.,/-]+", " ", cleaned)
+    for fmt in ("%d %m %Y", "%d %B %Y", "%d %b %Y", "%B %d %Y", "%b %d %Y"):
+        try:
+            date = datetime.strptime(cleaned, fmt)
+        except ValueError:
+            continue
+        if date.month not in QUARTER_END_MONTHS:
+            return None
+        fiscal_year = date.year if date.month == 3 else date.year + 1
+        return f"q{QUARTER_END_MONTHS[date.month]}_fy{fiscal_year % 100:02d}"
+    return None
+
+def _first_value(cells):
+    """First numeric cell after the label (the current-period column)"""
+    for cell in cells:
+        match = NUMBER.fullmatch((cell or "").strip())
+        if match and any(ch.isdigit() for ch in match.group()):
+            return _to_number(match.group())
+    return None
+
+def parse_page(text, tables):
+    """
+    Deposits, advances, quarter and unit scale found on one page
+
+    Tables are searched first (label in the first cell); plain text lines
+    ("Deposits 23,45,678.90 ...") are the fallback. Values are in ₹ crore.
+    """
+    result = {"deposits": None, "advances": None, "quarter": None}
+    scale = detect_scale(text)
+
+    rows = [row for table in tables or [] for row in table if row]
+    rows += [[line[:match.start()]] + NUMBER.findall(line[match.start():])
+             for line in (text or "").splitlines() for match in [NUMBER.search(line)] if match]
+
+    for row in rows:
+        label = (row[0] or "").strip()
+        for field, pattern in (("deposits", DEPOSITS_LABEL), ("advances", ADVANCES_LABEL)):
+            if result[field] is None and pattern.match(label):
+                value = _first_value(row[1:])
+                if value is not None and value > 0:
+                    result[field] = value * scale
+
+    ended = QUARTER_ENDED.search(text or "")
+    if ended:
+        result["quarter"] = quarter_from_date(ended.group(1))
+    return result
+
+# ═══════════════════════════════════════════════════════════════════════════
+# FILE EXTRACTION WITH A PAGE-LEVEL CACHE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _cache_file(digest):
+    return os.path.join(CACHE_DIR, "pdf_pages", f"{digest}.json")
+
+def parse_pdf(path):
+    """Page-level parse results for one PDF (runs in a worker process)"""
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        return [parse_page(page.extract_text() or "", page.extract_tables()) for page in pdf.pages]
+
+def _parse_cached(path, digest):
+    """parse_pdf, reusing and filling the page cache keyed by file content hash"""
+    cache_file = _cache_file(digest)
+    if os.path.exists(cache_file):
+        with open(cache_file, encoding="utf-8") as handle:
+            return json.load(handle)
+
+    pages = parse_pdf(path)
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    temporary = f"{cache_file}.tmp.{os.getpid()}"
+    with open(temporary, "w", encoding="utf-8") as handle:
+        json.dump(pages, handle)
+    os.replace(temporary, cache_file)
+    return pages
+
+def _parse_worker(path, digest, results):
+    """Process entry point: parse one file and report (path, status, pages)"""
+    try:
+        results.put((path, "parsed", _parse_cached(path, digest)))
+    except Exception as error:
+        results.put((path, f"error: {type(error).__name__}: {error}", None))
+
+def _parse_files(paths, digests, max_workers, timeout):
+    """
+    {path: (status, pages)} parsing each file in its own process
+
+    At most max_workers files run at once, and each gets timeout seconds
+    from the moment its process starts (not from when the batch started).
+    A file that runs over is killed and reported as "timeout", so a hung
+    parse never holds a worker slot or delays the files behind it.
+    """
+    results, queued, running = {}, list(paths), {}
+    finished = multiprocessing.Queue()
+
+    while queued or running:
+        while queued and len(running) < max_workers:
+            path = queued.pop(0)
+            process = multiprocessing.Process(target=_parse_worker, args=(path, digests[path], finished), daemon=True)
+            process.start()
+            running[path] = (process, time.monotonic() + timeout)
+
+        # Drain every result waiting before the deadline checks; a result that
+        # lands after its file was killed keeps the recorded "timeout"
+        try:
+            message = finished.get(timeout=0.1)
+            while True:
+                path, status, pages = message
+                entry = running.pop(path, None)
+                if entry is not None:
+                    results[path] = (status, pages)
+                    entry[0].join()
+                message = finished.get_nowait()
+        except Empty:
+            pass
+
+        now = time.monotonic()
+        for path, (process, deadline) in list(running.items()):
+            if now > deadline:
+                process.terminate()
+                process.join()
+                results[path] = ("timeout", None)
+                del running[path]
+            elif not process.is_alive() and process.exitcode != 0:
+                results[path] = (f"error: worker exited with code {process.exitcode}", None)
+                del running[path]
+
+    return results
+
+def _identify(path, folder, tickers):
+    """(bank_name, quarter key from the file name or None) for a report path"""
+    relative = os.path.relpath(path, folder)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    candidates = [stem.split("_")[0].split("-")[0].upper()]
+    if os.path.dirname(relative):
+        candidates.append(relative.split(os.sep)[0].upper())
+
+    bank_name = next((tickers[c] for c in candidates if c in tickers), None)
+    match = QUARTER_FILENAME.search(stem)
+    quarter = f"q{match.group(1)}_fy{match.group(2)}" if match else None
+    return bank_name, quarter
+
+def _combine(pages):
+    """First page values for deposits/advances and the first quarter mention, with page numbers"""
+    combined = {"deposits": None, "advances": None, "quarter": None, "pages": {}}
+    for number, page in enumerate(pages, start=1):
+        for field in ("deposits", "advances", "quarter"):
+            if combined[field] is None and page[field] is not None:
+                combined[field] = page[field]
+                combined["pages"][field] = number
+    return combined
+
+def extract_reports(folder=BANK_REPORTS_FOLDER, max_workers=MAX_WORKERS, timeout=PDF_EXTRACT_TIMEOUT):
+    """
+    Extract deposits/advances from every PDF under folder
+
+    Files are parsed in up to max_workers processes; a file that runs
+    longer than timeout seconds (measured per file) is killed, reported and
+    skipped. Cached files (same content hash) are never sent to a worker.
+
+    Returns (records, report):
+      records - {bank_name: {"{quarter}_deposits", "{quarter}_advances",
+                 "{quarter}_source": "pdf:<file>#p<page>"}} ready for merge_bank_data
+      report  - one row per file with status and values
+    """
+    bank_data = get_bank_cd_ratio_data()
+    tickers = {info["nse_ticker"].upper(): name for name, info in bank_data.items()}
+    paths = sorted(glob.glob(os.path.join(folder, "**", "*.pdf"), recursive=True))
+    digests = {path: file_hash(path) for path in paths}
+
+    results = {}
+    uncached = [path for path in paths if not os.path.exists(_cache_file(digests[path]))]
+    for path in paths:
+        if path not in uncached:
+            results[path] = ("cached", _parse_cached(path, digests[path]))
+
+    if uncached:
+        results.update(_parse_files(uncached, digests, max(1, max_workers), timeout))
+
+    records, report = {}, []
+    for path in paths:
+        status, pages = results[path]
+        bank_name, quarter = _identify(path, folder, tickers)
+        row = {"file": os.path.relpath(path, folder), "bank_name": bank_name, "status": status}
+
+        if pages is not None:
+            combined = _combine(pages)
+            quarter = quarter or combined["quarter"]
+            row.update(quarter=quarter, deposits=combined["deposits"], advances=combined["advances"])
+
+            if bank_name is None:
+                row["status"] = "unknown bank"
+            elif quarter not in QUARTER_KEYS:
+                row["status"] = "unknown quarter"
+            elif combined["deposits"] is None or combined["advances"] is None:
+                row["status"] = "values not found"
+            else:
+                page = combined["pages"]["deposits"]
+                record = records.setdefault(bank_name, {})
+                record[f"{quarter}_deposits"] = combined["deposits"]
+                record[f"{quarter}_advances"] = combined["advances"]
+                record[f"{quarter}_source"] = f"pdf:{row['file']}#p{page}"
+
+        report.append(row)
+
+    return records, report
+
+if __name__ == "__main__":
+    extracted, files = extract_reports()
+    for row in files:
+        print(row)
+    print(f"Extracted {sum(len(r) // 3 for r in extracted.values())} bank-quarters from {len(files)} files")
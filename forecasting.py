@@ -0,0 +1,179 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Batch CD Ratio Forecasting (per-bank ETS/ARIMA + pooled panel regression)
+"""
+
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import statsmodels.api as sm
+from cachetools import LRUCache
+from scipy.stats import norm
+from statsmodels.tsa.arima.model import ARIMA
+from statsmodels.tsa.exponential_smoothing.ets import ETSModel
+
+from analytics import panel_fingerprint, panel_to_matrix
+from config import FORECAST_CONFIDENCE, FORECAST_HORIZON, MAX_WORKERS
+from data import next_quarter_labels
+
+FORECAST_METHODS = ["ets", "arima", "pooled"]
+
+# Below this many banks a process pool costs more than it saves
+MIN_BANKS_FOR_POOL = 64
+
+_forecast_cache = LRUCache(maxsize=16)
+_pending = {}
+_pending_lock = threading.Lock()
+_dispatcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="forecast")
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PER-BANK MODELS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _fit_ets(history, horizon, alpha):
+    """Damped additive-trend ETS forecast with prediction intervals"""
+    series = pd.Series(history)
+    result = ETSModel(series, error="add", trend="add", damped_trend=True).fit(disp=False)
+    frame = result.get_prediction(start=len(series), end=len(series) + horizon - 1).summary_frame(alpha=alpha)
+    return frame["mean"].to_numpy(), frame["pi_lower"].to_numpy(), frame["pi_upper"].to_numpy()
+
+def _fit_arima(history, horizon, alpha):
+    """ARIMA(1,1,0) with drift forecast with confidence intervals"""
+    result = ARIMA(np.asarray(history), order=(1, 1, 0), trend="t").fit()
+    frame = result.get_forecast(horizon).summary_frame(alpha=alpha)
+    return frame["mean"].to_numpy(), frame["mean_ci_lower"].to_numpy(), frame["mean_ci_upper"].to_numpy()
+
+_MODELS = {"ets": _fit_ets, "arima": _fit_arima}
+
+def _fit_chunk(histories, method, horizon, alpha):
+    """Fit one model per CD history; runs inside a worker process"""
+    fit = _MODELS[method]
+    results = []
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for history in histories:
+            try:
+                results.append(fit(history, horizon, alpha))
+            except (ValueError, np.linalg.LinAlgError):
+                # Flat or degenerate history: carry the last value forward
+                last = np.full(horizon, history[-1])
+                results.append((last, last, last))
+
+    return results
+
+# ═══════════════════════════════════════════════════════════════════════════
+# POOLED PANEL REGRESSION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _fit_pooled(cd, bank_types, horizon, alpha):
+    """
+    Pooled AR(1) across all banks with bank-type intercepts:
+    cd[i, t] = a[type(i)] + b * cd[i, t-1] + e
+    Forecasts for all banks are iterated together as array operations.
+    """
+    n_banks, n_quarters = cd.shape
+    dummies = pd.get_dummies(bank_types, dtype=float).to_numpy()
+    lagged = cd[:, :-1].ravel()
+    exog = np.column_stack([np.repeat(dummies, n_quarters - 1, axis=0), lagged])
+    result = sm.OLS(cd[:, 1:].ravel(), exog, missing="drop").fit()
+
+    intercepts = dummies @ result.params[:-1]
+    slope = result.params[-1]
+    sigma = np.sqrt(result.scale)
+
+    mean = np.empty((n_banks, horizon))
+    level = cd[:, -1]
+    for step in range(horizon):
+        level = intercepts + slope * level
+        mean[:, step] = level
+
+    # h-step AR(1) forecast error variance: sigma² · Σ b^(2k), k < h
+    spread = sigma * np.sqrt(np.cumsum(slope ** (2 * np.arange(horizon))))
+    z = norm.ppf(1 - alpha / 2)
+    return mean, mean - z * spread, mean + z * spread
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BATCH DRIVER
+# ═══════════════════════════════════════════════════════════════════════════
+
+def forecast_all_banks(panel, method="ets", horizon=FORECAST_HORIZON,
+                       confidence=FORECAST_CONFIDENCE, max_workers=MAX_WORKERS):
+    """
+    Forecast CD ratios for every bank in the panel
+
+    Per-bank models are fitted in chunks across a process pool (one chunk per
+    worker); the pooled regression is a single fit over the whole panel.
+    Returns a long frame: bank_name, quarter, step, forecast, lower, upper, model.
+    """
+    if method not in FORECAST_METHODS:
+        raise ValueError(f"Unknown forecast method '{method}', expected one of {FORECAST_METHODS}")
+
+    cd_matrix = panel_to_matrix(panel, "cd_ratio")
+    cd = cd_matrix.to_numpy(dtype=float)
+    banks = cd_matrix.index.to_numpy()
+    alpha = 1 - confidence
+
+    if method == "pooled":
+        bank_types = panel.drop_duplicates("bank_name").set_index("bank_name")["type"].reindex(banks)
+        mean, lower, upper = _fit_pooled(cd, bank_types, horizon, alpha)
+    else:
+        if len(banks) < MIN_BANKS_FOR_POOL or max_workers <= 1:
+            fits = _fit_chunk(cd, method, horizon, alpha)
+        else:
+            fit_chunk = partial(_fit_chunk, method=method, horizon=horizon, alpha=alpha)
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                fits = [fit for chunk_fits in pool.map(fit_chunk, np.array_split(cd, max_workers))
+                        for fit in chunk_fits]
+        mean, lower, upper = (np.vstack(part) for part in zip(*fits))
+
+    quarters = next_quarter_labels(str(cd_matrix.columns[-1]), horizon)
+
+    return pd.DataFrame({
+        "bank_name": np.repeat(banks, horizon),
+        "quarter": np.tile(quarters, len(banks)),
+        "step": np.tile(np.arange(1, horizon + 1), len(banks)),
+        "forecast": mean.ravel(),
+        "lower": lower.ravel(),
+        "upper": upper.ravel(),
+        "model": method,
+    })
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CACHED, NON-BLOCKING ACCESS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def get_forecasts(panel, method="ets", horizon=FORECAST_HORIZON, wait=False):
+    """
+    Return cached forecasts for this data version, or None if still fitting
+
+    The first call for a (data version, method, horizon) key schedules the
+    batch fit on a background thread and returns immediately, so callers
+    can render history and pick up the forecasts on a later rerun.
+    wait=True blocks until the fit finishes (used by cache warmup). A
+    failed fit raises its error once and is dropped, so the next call
+    schedules it again.
+    """
+    key = (panel_fingerprint(panel), method, horizon)
+    with _pending_lock:
+        forecasts = _forecast_cache.get(key)
+        if forecasts is not None:
+            return forecasts
+        future = _pending.get(key)
+        if future is None:
+            future = _pending[key] = _dispatcher.submit(forecast_all_banks, panel, method, horizon)
+    if wait:
+        future.exception()  # blocks until done without raising
+    if not future.done():
+        return None
+
+    with _pending_lock:
+        _pending.pop(key, None)
+    forecasts = future.result()
+    with _pending_lock:
+        _forecast_cache[key] = forecasts
+    return forecasts
@@ -0,0 +1,79 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Composite Health Screen - CD, Asset Quality & Capital
+"""
+
+import numpy as np
+import pandas as pd
+
+from analytics import STATUS_ORDER, classify_cd_status, compute_ratios
+from config import ASSET_QUALITY_BENCHMARKS, NPA_THRESHOLD
+
+HEALTH_FLAGS = {
+    "cd_flag": "CD outside 70-85%",
+    "npa_flag": "GNPA above threshold",
+    "nnpa_flag": "NNPA above limit",
+    "pcr_flag": "Low provision coverage",
+    "car_flag": "Capital below minimum",
+}
+
+HEALTH_STATUS = ["🟢 STRONG", "🟡 WATCH", "🔴 WEAK"]
+
+# Flags that do not depend on the user's GNPA threshold
+FIXED_FLAGS = [flag for flag in HEALTH_FLAGS if flag != "npa_flag"]
+
+def build_health_screen(store):
+    """
+    Flag every bank × quarter on CD, NNPA, PCR and CAR in one pass
+
+    The GNPA flag depends on the threshold chosen on the page, so it is
+    left out here and applied per query with quarter_health; the screen
+    itself can then be cached once per data version.
+
+    Returns a dict with:
+      table          - ratios and fixed flags, sorted by (quarter, gnpa_pct)
+      quarter_bounds - quarter → (start, stop) row range in table
+    The sort order makes GNPA threshold queries a binary search per quarter.
+    """
+    screen = compute_ratios(store)
+    healthy_codes = [STATUS_ORDER.index("healthy"), STATUS_ORDER.index("excellent")]
+
+    screen["cd_flag"] = ~np.isin(classify_cd_status(screen["cd_ratio"]), healthy_codes)
+    screen["nnpa_flag"] = screen["nnpa_pct"] > ASSET_QUALITY_BENCHMARKS["max_nnpa"]
+    screen["pcr_flag"] = screen["pcr"] < ASSET_QUALITY_BENCHMARKS["min_pcr"]
+    screen["car_flag"] = screen["car"] < ASSET_QUALITY_BENCHMARKS["min_car"]
+
+    table = screen.sort_values(["quarter", "gnpa_pct"], kind="stable").reset_index(drop=True)
+    codes = table["quarter"].cat.codes.to_numpy()
+    quarter_bounds = {
+        quarter: (int(np.searchsorted(codes, code, side="left")), int(np.searchsorted(codes, code, side="right")))
+        for code, quarter in enumerate(table["quarter"].cat.categories)
+    }
+
+    return {"table": table, "quarter_bounds": quarter_bounds}
+
+def screen_by_npa(screen, threshold=NPA_THRESHOLD, quarter=None):
+    """Rows with GNPA % above threshold, for one quarter or all, via binary search"""
+    quarters = [quarter] if quarter is not None else list(screen["quarter_bounds"])
+    blocks = []
+
+    for q in quarters:
+        start, stop = screen["quarter_bounds"][q]
+        gnpa = screen["table"]["gnpa_pct"].to_numpy()[start:stop]
+        blocks.append(screen["table"].iloc[start + int(np.searchsorted(gnpa, threshold, side="right")):stop])
+
+    return pd.concat(blocks) if blocks else screen["table"].iloc[:0]
+
+def quarter_health(screen, quarter, threshold=NPA_THRESHOLD):
+    """
+    One quarter of the screen with the GNPA flag, flag count and status for threshold
+
+    The GNPA flag comes from screen_by_npa, so only this quarter's rows
+    are touched when the threshold moves.
+    """
+    start, stop = screen["quarter_bounds"][quarter]
+    rows = screen["table"].iloc[start:stop].copy()
+    rows["npa_flag"] = rows.index.isin(screen_by_npa(screen, threshold, quarter).index)
+    rows["flag_count"] = rows[list(HEALTH_FLAGS)].sum(axis=1)
+    rows["health_status"] = np.array(HEALTH_STATUS)[np.minimum(rows["flag_count"], 2)]
+    return rows
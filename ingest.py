@@ -0,0 +1,188 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Data Ingestion - Local Source Files Merged onto the Bank Dataset
+"""
+
+import copy
+import glob
+import os
+import re
+
+import pandas as pd
+
+from config import RBI_DATA_FOLDER
+from data import QUARTER_KEYS, get_bank_cd_ratio_data
+from disclosures import NUMBER, QUARTER_ENDED, QUARTER_FILENAME, detect_scale, quarter_from_date
+
+BANK_INFO_FIELDS = ["type", "headquarters", "nse_ticker", "bse_ticker"]
+BALANCE_FIELDS = [f"{q}_{measure}" for q in QUARTER_KEYS for measure in ("deposits", "advances")]
+BANK_FIELDS = BANK_INFO_FIELDS + BALANCE_FIELDS
+SOURCE_FIELDS = [f"{q}_source" for q in QUARTER_KEYS]
+
+# Column headers of the bank-wise tables in RBI workbooks
+BANK_NAME_HEADER = re.compile(r"^\s*(?:name\s+of\s+(?:the\s+)?)?banks?(?:\s+name)?\s*$", re.IGNORECASE)
+DEPOSITS_HEADER = re.compile(r"\bdeposits\b", re.IGNORECASE)
+ADVANCES_HEADER = re.compile(r"\badvances\b|\bbank\s+credit\b", re.IGNORECASE)
+NAME_NOISE = re.compile(r"\b(?:the|ltd|limited)\b|[^a-z0-9 ]")
+
+# Rows read before giving up on finding a table header in a sheet
+HEADER_SCAN_ROWS = 50
+
+def _number(value):
+    """Balances as int where whole (matching the built-in dataset), else float"""
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+def read_bank_csv(path):
+    """
+    Bank records from a CSV in the bank schema
+
+    Requires a bank_name column; any of BANK_FIELDS may follow. Blank
+    cells are skipped, so a file can update just a few quarters.
+    """
+    frame = pd.read_csv(path, dtype={"bse_ticker": str})
+    if "bank_name" not in frame.columns:
+        raise ValueError(f"{path}: missing bank_name column")
+
+    records = {}
+    for row in frame.to_dict("records"):
+        name = str(row.pop("bank_name")).strip()
+        records[name] = {
+            field: (_number(value) if field in BALANCE_FIELDS else str(value))
+            for field, value in row.items() if field in BANK_FIELDS and pd.notna(value)
+        }
+        records[name].update(tag_sources(records[name], f"csv:{os.path.basename(path)}"))
+    return records
+
+def tag_sources(record, source):
+    """{quarter}_source fields for every quarter whose balances the record supplies"""
+    return {
+        f"{q}_source": source for q in QUARTER_KEYS
+        if f"{q}_deposits" in record or f"{q}_advances" in record
+    }
+
+def _name_key(name):
+    """Bank name reduced for matching ("HDFC Bank Ltd." → "hdfc bank")"""
+    return " ".join(NAME_NOISE.sub(" ", str(name).lower()).split())
+
+def _cell_number(value):
+    """Numeric cell value, or None for blanks, dashes and notes"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    match = NUMBER.fullmatch(str(value or "").strip())
+    return float(match.group().strip("()").replace(",", "")) if match else None
+
+def _header_columns(row):
+    """{field: column} for a bank-wise table header row, or None if row is not a header"""
+    cells = [str(cell).strip() if cell is not None else "" for cell in row]
+    name_column = next((i for i, cell in enumerate(cells) if BANK_NAME_HEADER.match(cell)), None)
+    if name_column is None:
+        return None
+
+    columns = {"bank_name": name_column}
+    for i, cell in enumerate(cells):
+        if cell in BANK_FIELDS:
+            columns[cell] = i
+        elif "deposits" not in columns and DEPOSITS_HEADER.search(cell):
+            columns["deposits"] = i
+        elif "advances" not in columns and ADVANCES_HEADER.search(cell):
+            columns["advances"] = i
+    return columns if len(columns) > 1 else None
+
+def read_bank_workbook(path):
+    """
+    Bank records from the bank-wise deposits/advances tables of an Excel workbook
+
+    The workbook is opened in openpyxl's read-only mode and streamed row
+    by row, so memory stays flat however large the file is. In each sheet
+    the first row with a bank name column and deposits/advances (or bank
+    schema) columns is taken as the table header; rows above it supply the
+    reporting unit and the "quarter ended <date>" when the sheet or file
+    name carries no quarter. Rows whose bank is not in the dataset are
+    skipped, as are sheets without a recognisable table.
+    """
+    from openpyxl import load_workbook
+
+    known = {_name_key(name): name for name in get_bank_cd_ratio_data()}
+    file_quarter = QUARTER_FILENAME.search(os.path.basename(path))
+    source = f"xlsx:{os.path.basename(path)}"
+    records = {}
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            preamble, columns, quarter, scale = [], None, None, 1.0
+
+            for number, row in enumerate(sheet.iter_rows(values_only=True)):
+                if columns is None:
+                    columns = _header_columns(row)
+                    if columns is None:
+                        if number >= HEADER_SCAN_ROWS:
+                            break
+                        preamble.append(" ".join(str(cell) for cell in row if cell is not None))
+                        continue
+
+                    text = "\n".join(preamble)
+                    ended = QUARTER_ENDED.search(text)
+                    match = QUARTER_FILENAME.search(sheet.title) or file_quarter
+                    quarter = f"q{match.group(1)}_fy{match.group(2)}" if match else (
+                        quarter_from_date(ended.group(1)) if ended else None)
+                    scale = detect_scale(text)
+                    continue
+
+                name = known.get(_name_key(row[columns["bank_name"]])) if columns["bank_name"] < len(row) else None
+                if name is None:
+                    continue
+
+                record = records.setdefault(name, {})
+                for field, column in columns.items():
+                    value = row[column] if column < len(row) else None
+                    if field in ("deposits", "advances"):
+                        value = _cell_number(value)
+                        if value is not None and quarter in QUARTER_KEYS:
+                            record[f"{quarter}_{field}"] = _number(value * scale)
+                    elif field in BALANCE_FIELDS:
+                        value = _cell_number(value)
+                        if value is not None:
+                            record[field] = _number(value)
+                    elif field in BANK_INFO_FIELDS and value is not None:
+                        record[field] = str(value)
+    finally:
+        workbook.close()
+
+    for record in records.values():
+        record.update(tag_sources(record, source))
+    return {name: record for name, record in records.items() if record}
+
+FILE_READERS = {
+    ".csv": read_bank_csv,
+    ".xlsx": read_bank_workbook,
+    ".xlsm": read_bank_workbook,
+}
+
+def ingest_folder(folder=RBI_DATA_FOLDER):
+    """Bank records from every CSV and Excel workbook in folder, later files (by name) taking precedence"""
+    updates = {}
+    for path in sorted(glob.glob(os.path.join(folder, "*"))):
+        reader = FILE_READERS.get(os.path.splitext(path)[1].lower())
+        if reader is None or os.path.basename(path).startswith("~$"):
+            continue
+        for name, record in reader(path).items():
+            updates.setdefault(name, {}).update(record)
+    return updates
+
+def merge_bank_data(base, updates):
+    """
+    Overlay update records onto base bank data
+
+    Existing banks take any supplied fields (including source tags); new
+    banks are added only when the update carries every field of the bank
+    schema.
+    """
+    merged = copy.deepcopy(base)
+    for name, record in updates.items():
+        if name in merged:
+            merged[name].update(record)
+        elif all(field in record for field in BANK_FIELDS):
+            merged[name] = dict(record)
+    return merged
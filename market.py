@@ -0,0 +1,189 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Market Data Layer - Pluggable Price Providers with a Local Columnar Cache
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from analytics import get_rolling_metrics
+from config import CACHE_DIR, MARKET_DATA_PROVIDER, MARKET_REPLAY_FILE
+from data import QUARTER_LABELS
+
+PRICE_COLUMNS = ["ticker", "date", "close"]
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PROVIDERS
+# ═══════════════════════════════════════════════════════════════════════════
+
+class YFinanceProvider:
+    """Daily closes from Yahoo Finance; NSE tickers take the '.NS' suffix"""
+
+    name = "yfinance"
+
+    def __init__(self, suffix=".NS"):
+        self.suffix = suffix
+
+    def fetch(self, ticker, start, end):
+        import yfinance as yf
+
+        history = yf.Ticker(f"{ticker}{self.suffix}").history(start=start, end=end + pd.Timedelta(days=1),
+                                                              auto_adjust=True)
+        if history.empty:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+        return pd.DataFrame({
+            "ticker": ticker,
+            "date": history.index.tz_localize(None).normalize(),
+            "close": history["Close"].to_numpy(dtype=float),
+        })
+
+class ReplayProvider:
+    """Replays prices from a CSV or parquet file (ticker, date, close) for offline use and testing"""
+
+    name = "replay"
+
+    def __init__(self, path=MARKET_REPLAY_FILE):
+        self.path = path
+        self._prices = None
+
+    def fetch(self, ticker, start, end):
+        if self._prices is None:
+            reader = pd.read_parquet if self.path.endswith(".parquet") else pd.read_csv
+            prices = reader(self.path)
+            prices["date"] = pd.to_datetime(prices["date"])
+            self._prices = prices[PRICE_COLUMNS]
+        prices = self._prices
+        return prices[(prices["ticker"] == ticker) & prices["date"].between(start, end)].reset_index(drop=True)
+
+PROVIDERS = {
+    "yfinance": YFinanceProvider,
+    "replay": ReplayProvider,
+}
+
+def get_provider(name=MARKET_DATA_PROVIDER):
+    """Instantiate a provider by name (see PROVIDERS)"""
+    if name not in PROVIDERS:
+        raise ValueError(f"Unknown market data provider: {name}")
+    return PROVIDERS[name]()
+
+# ═══════════════════════════════════════════════════════════════════════════
+# LOCAL CACHE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def cache_path(provider, ticker):
+    """Per-ticker parquet file under CACHE_DIR/market/<provider>"""
+    return os.path.join(CACHE_DIR, "market", provider.name, f"{ticker}.parquet")
+
+def _coverage_path(provider):
+    """Date range already requested per ticker (weekends and holidays carry no rows)"""
+    return os.path.join(CACHE_DIR, "market", provider.name, "coverage.parquet")
+
+def _read(path, columns):
+    if os.path.exists(path):
+        return pd.read_parquet(path)
+    return pd.DataFrame(columns=columns)
+
+def get_prices(tickers, start, end, provider=None):
+    """
+    Daily closes for tickers between start and end, served from the local cache
+
+    Only date ranges outside a ticker's cached coverage are fetched; new
+    rows are merged and written back. A provider failure for one ticker
+    leaves that ticker's cache and coverage unchanged, so it is retried on
+    the next request.
+    """
+    provider = provider or get_provider()
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    # Never mark today or later as covered: those closes may not exist yet
+    settled = min(end, pd.Timestamp.today().normalize() - pd.Timedelta(days=1))
+    coverage = _read(_coverage_path(provider), ["ticker", "start", "end"]).set_index("ticker")
+    coverage_changed = False
+    frames = []
+
+    for ticker in tickers:
+        path = cache_path(provider, ticker)
+        cached = _read(path, PRICE_COLUMNS)
+        if ticker in coverage.index:
+            covered_start, covered_end = coverage.loc[ticker, "start"], coverage.loc[ticker, "end"]
+            gaps = [(start, covered_start - pd.Timedelta(days=1)), (covered_end + pd.Timedelta(days=1), end)]
+        else:
+            covered_start, covered_end = start, settled
+            gaps = [(start, end)]
+
+        fetched, failed = [], False
+        for gap_start, gap_end in gaps:
+            if gap_start > gap_end:
+                continue
+            try:
+                fetched.append(provider.fetch(ticker, gap_start, gap_end))
+            except Exception:
+                failed = True
+
+        fetched = [frame for frame in fetched if not frame.empty]
+        if fetched:
+            cached = (pd.concat([cached] + fetched, ignore_index=True)
+                      .drop_duplicates(["ticker", "date"], keep="last").sort_values("date"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            cached.to_parquet(path, index=False)
+        if not failed:
+            coverage.loc[ticker, ["start", "end"]] = [min(start, covered_start), max(settled, covered_end)]
+            coverage_changed = True
+
+        frames.append(cached[cached["date"].between(start, end)])
+
+    if coverage_changed:
+        os.makedirs(os.path.dirname(_coverage_path(provider)), exist_ok=True)
+        coverage.astype("datetime64[ns]").rename_axis("ticker").reset_index().to_parquet(
+            _coverage_path(provider), index=False)
+
+    prices = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=PRICE_COLUMNS)
+    prices["date"] = pd.to_datetime(prices["date"])
+    prices["close"] = prices["close"].astype(float)
+    return prices
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CD MOMENTUM VS RETURNS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def quarter_end_dates(labels=QUARTER_LABELS):
+    """Calendar quarter-end dates for fiscal labels ('Q1 FY24' → 2023-06-30)"""
+    dates = []
+    for label in labels:
+        quarter, fiscal_year = int(label[1]), 2000 + int(label[-2:])
+        year = fiscal_year - 1 if quarter < 4 else fiscal_year
+        month = {1: 6, 2: 9, 3: 12, 4: 3}[quarter]
+        dates.append(pd.Timestamp(year=year, month=month, day=1) + pd.offsets.MonthEnd(0))
+    return pd.DatetimeIndex(dates)
+
+def quarterly_returns(prices, labels=QUARTER_LABELS):
+    """
+    Quarter-on-quarter price returns (%) per ticker, indexed by fiscal quarter label
+
+    Uses the last close on or before each quarter end.
+    """
+    ends = quarter_end_dates(labels)
+    closes = prices.pivot_table(index="date", columns="ticker", values="close").sort_index()
+    at_quarter_end = closes.reindex(closes.index.union(ends)).ffill().loc[ends]
+    at_quarter_end.index = list(labels)
+    return at_quarter_end.pct_change(fill_method=None) * 100
+
+def momentum_vs_returns(panel, banks, prices, lag=0):
+    """
+    Join QoQ CD change with quarterly stock returns per bank × quarter
+
+    lag=1 pairs each CD change with the following quarter's return.
+    Returns the joined table and the pooled Pearson correlation.
+    """
+    metrics = get_rolling_metrics(panel)[["bank_name", "type", "quarter", "cd_change_qoq"]].copy()
+    metrics["quarter"] = metrics["quarter"].astype(str)
+
+    returns = quarterly_returns(prices, list(panel["quarter"].cat.categories)).shift(-lag)
+    returns = returns.rename_axis("quarter").reset_index().melt(id_vars="quarter", var_name="nse_ticker",
+                                                                value_name="stock_return")
+    returns = returns.merge(banks[["nse_ticker", "bank_name"]], on="nse_ticker")
+
+    joined = metrics.merge(returns, on=["bank_name", "quarter"]).dropna(subset=["cd_change_qoq", "stock_return"])
+    correlation = joined["cd_change_qoq"].corr(joined["stock_return"]) if len(joined) > 2 else np.nan
+    return joined, correlation
@@ -0,0 +1,223 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Peer-Group Similarity Index ("banks like this one")
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+from sklearn.neighbors import NearestNeighbors
+
+from analytics import panel_fingerprint, panel_to_matrix
+
+# Weight of the (standardised log deposits/advances) size distance relative
+# to the trajectory correlation distance
+SIZE_WEIGHT = 0.05
+
+# Above this many banks, similarity queries use the nearest-neighbour
+# structure instead of the dense bank × bank correlation matrix
+DENSE_MATRIX_MAX_BANKS = 2000
+
+PEER_METRICS = {
+    "similarity": "Trend correlation + size",
+    "dtw": "Dynamic time warping (shape)",
+}
+
+_index_cache = LRUCache(maxsize=8)
+_query_cache = LRUCache(maxsize=1024)
+# Sessions and warmup threads share both caches
+_index_lock = threading.Lock()
+_query_lock = threading.Lock()
+
+# ═══════════════════════════════════════════════════════════════════════════
+# INDEX CONSTRUCTION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _size_features(deposits, advances):
+    """Standardised log deposits / log advances per bank"""
+    size = np.log(np.column_stack([deposits, advances]))
+    return (size - size.mean(axis=0)) / np.maximum(size.std(axis=0), 1e-9)
+
+def _refresh(index):
+    """Recompute correlations and the nearest-neighbour structure from running sums"""
+    n = index["trajectories"].shape[1]
+    mean = index["sum"] / n
+    std = np.sqrt(np.maximum(index["sum_sq"] / n - mean ** 2, 0))
+    flat = std < 1e-9
+
+    if len(index["banks"]) <= DENSE_MATRIX_MAX_BANKS:
+        cov = index["cross"] / n - np.outer(mean, mean)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        # Flat trajectories z-normalise to zero: 0.5 against any moving series,
+        # 1 against another flat one, matching the kNN feature distances below
+        corr[flat, :] = 0.5
+        corr[:, flat] = 0.5
+        corr[np.ix_(flat, flat)] = 1
+        np.fill_diagonal(corr, 1)
+        index["corr"] = np.clip(corr, -1, 1)
+    else:
+        index["corr"] = None
+
+    # ‖z_i − z_j‖² / 2n = 1 − ρ_ij for z-normalised rows, so Euclidean kNN on these
+    # features gives exactly sqrt((1 − ρ) + SIZE_WEIGHT · size distance²)
+    z = np.where(flat[:, None], 0, (index["trajectories"] - mean[:, None]) / np.where(flat, 1, std)[:, None])
+    index["z"] = z
+    index["features"] = np.hstack([z / np.sqrt(2 * n), np.sqrt(SIZE_WEIGHT) * index["size"]])
+    index["nn"] = NearestNeighbors().fit(index["features"])
+    return index
+
+def build_peer_index(panel):
+    """Build the similarity index over normalised CD trajectories and size features"""
+    cd = panel_to_matrix(panel, "cd_ratio")
+    deposits = panel_to_matrix(panel, "deposits").reindex_like(cd)
+    advances = panel_to_matrix(panel, "advances").reindex_like(cd)
+    trajectories = cd.to_numpy(dtype=float)
+
+    index = {
+        "banks": cd.index.to_numpy(),
+        "types": panel.drop_duplicates("bank_name").set_index("bank_name")["type"].reindex(cd.index).to_numpy(),
+        "quarters": list(cd.columns.astype(str)),
+        "trajectories": trajectories,
+        "size": _size_features(deposits.iloc[:, -1].to_numpy(), advances.iloc[:, -1].to_numpy()),
+        "sum": trajectories.sum(axis=1),
+        "sum_sq": np.square(trajectories).sum(axis=1),
+        "cross": trajectories @ trajectories.T,
+    }
+    return _refresh(index)
+
+def update_peer_index(index, panel, changed_banks):
+    """
+    Index for a revised panel, derived from the index of its earlier version
+
+    Only the trajectories, running sums and cross-product rows of
+    changed_banks are recomputed (O(changed × banks) instead of
+    O(banks²)); correlations, size features and the neighbour structure
+    are then refreshed. The earlier index is left untouched. Falls back to
+    a full build if the bank or quarter set differs.
+    """
+    cd = panel_to_matrix(panel, "cd_ratio")
+    if not np.array_equal(cd.index.to_numpy(), index["banks"]) or list(cd.columns.astype(str)) != index["quarters"]:
+        return build_peer_index(panel)
+    deposits = panel_to_matrix(panel, "deposits").reindex_like(cd)
+    advances = panel_to_matrix(panel, "advances").reindex_like(cd)
+    trajectories = cd.to_numpy(dtype=float)
+    changed = np.flatnonzero(np.isin(index["banks"], list(changed_banks)))
+
+    rows = trajectories[changed] @ trajectories.T
+    cross = index["cross"].copy()
+    cross[changed, :] = rows
+    cross[:, changed] = rows.T
+    updated = {
+        "banks": index["banks"],
+        "types": panel.drop_duplicates("bank_name").set_index("bank_name")["type"].reindex(cd.index).to_numpy(),
+        "quarters": list(index["quarters"]),
+        "trajectories": trajectories,
+        "size": _size_features(deposits.iloc[:, -1].to_numpy(), advances.iloc[:, -1].to_numpy()),
+        "sum": index["sum"].copy(),
+        "sum_sq": index["sum_sq"].copy(),
+        "cross": cross,
+    }
+    updated["sum"][changed] = trajectories[changed].sum(axis=1)
+    updated["sum_sq"][changed] = np.square(trajectories[changed]).sum(axis=1)
+    return _refresh(updated)
+
+def carry_peer_index(old_panel, panel, changed_banks):
+    """
+    Seed the index cache for panel from old_panel's cached index
+
+    Used by the refresh pipeline with the banks a version diff reports as
+    changed. Returns False (and leaves the full build to warmup) when
+    old_panel's index was never built.
+    """
+    key = panel_fingerprint(panel)
+    with _index_lock:
+        if key in _index_cache:
+            return True
+        previous = _index_cache.get(panel_fingerprint(old_panel))
+    if previous is None:
+        return False
+    index = update_peer_index(previous, panel, changed_banks)
+    with _index_lock:
+        _index_cache[key] = index
+    return True
+
+def get_peer_index(panel):
+    """Return the peer index for this data version, building it once"""
+    key = panel_fingerprint(panel)
+    with _index_lock:
+        index = _index_cache.get(key)
+    if index is None:
+        index = build_peer_index(panel)
+        with _index_lock:
+            _index_cache[key] = index
+    return index
+
+# ═══════════════════════════════════════════════════════════════════════════
+# QUERIES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def dtw_distances(query, candidates):
+    """DTW distance from one series (T,) to every row of candidates (B, T), vectorized over B"""
+    n, m = len(query), candidates.shape[1]
+    cost = np.abs(query[:, None, None] - candidates.T[None, :, :])        # (n, m, B)
+    acc = np.full((n + 1, m + 1, candidates.shape[0]), np.inf)
+    acc[0, 0] = 0
+
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            acc[i, j] = cost[i - 1, j - 1] + np.minimum(np.minimum(acc[i - 1, j], acc[i, j - 1]), acc[i - 1, j - 1])
+
+    return acc[n, m]
+
+def query_peers(index, bank_name, k=5, metric="similarity"):
+    """
+    The k banks most similar to bank_name (excluding itself)
+
+    similarity - sqrt((1 − correlation) + SIZE_WEIGHT · size distance²),
+                 from the dense matrix or the nearest-neighbour structure
+    dtw        - DTW distance between z-normalised CD trajectories
+    """
+    position = int(np.flatnonzero(index["banks"] == bank_name)[0])
+    k = min(k, len(index["banks"]) - 1)
+
+    if metric == "dtw":
+        distances = dtw_distances(index["z"][position], index["z"])
+        distances[position] = np.inf
+        candidates = np.argpartition(distances, k - 1)[:k]
+    elif index["corr"] is not None:
+        size_gap = np.square(index["size"] - index["size"][position]).sum(axis=1)
+        distances = np.sqrt(np.maximum(1 - index["corr"][position], 0) + SIZE_WEIGHT * size_gap)
+        distances[position] = np.inf
+        candidates = np.argpartition(distances, k - 1)[:k]
+    else:
+        neighbour_distances, neighbours = index["nn"].kneighbors(index["features"][[position]], n_neighbors=k + 1)
+        keep = neighbours[0] != position
+        candidates = neighbours[0][keep][:k]
+        distances = np.full(len(index["banks"]), np.inf)
+        distances[candidates] = neighbour_distances[0][keep][:k]
+
+    candidates = candidates[np.argsort(distances[candidates], kind="stable")]
+    trend = index["features"][:, :-2]
+    correlation = (index["corr"][position, candidates] if index["corr"] is not None
+                   else 1 - np.square(trend[candidates] - trend[position]).sum(axis=1))
+
+    return pd.DataFrame({
+        "bank_name": index["banks"][candidates],
+        "type": index["types"][candidates],
+        "distance": distances[candidates],
+        "correlation": correlation,
+    })
+
+def get_peers(panel, bank_name, k=5, metric="similarity"):
+    """query_peers on this data version's index, memoized per (bank, k, metric)"""
+    key = (panel_fingerprint(panel), bank_name, k, metric)
+    with _query_lock:
+        peers = _query_cache.get(key)
+    if peers is None:
+        peers = query_peers(get_peer_index(panel), bank_name, k, metric)
+        with _query_lock:
+            _query_cache[key] = peers
+    return peers
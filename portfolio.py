@@ -0,0 +1,145 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Portfolio CD-Ratio Analytics for Weighted Bank Baskets
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+from scipy.stats import norm
+
+from analytics import QUARTERS_PER_YEAR, get_rolling_metrics, panel_fingerprint, panel_to_matrix
+from stress import PRESET_SCENARIOS, apply_shocks
+
+# One-quarter confidence level for the correlated-stress CD
+STRESS_CONFIDENCE = 0.99
+
+_basket_cache = LRUCache(maxsize=1024)
+_basket_lock = threading.Lock()
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BASKETS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def ticker_index(banks):
+    """
+    Map tickers to bank names
+
+    NSE tickers are unique per bank; BSE codes are included only where a
+    single bank carries them (several codes are shared in the source data).
+    """
+    mapping = dict(zip(banks["nse_ticker"], banks["bank_name"]))
+    bse_counts = banks["bse_ticker"].value_counts()
+    unique_bse = banks[banks["bse_ticker"].map(bse_counts) == 1]
+    mapping.update(zip(unique_bse["bse_ticker"].astype(str), unique_bse["bank_name"]))
+    return mapping
+
+def basket_key(weights):
+    """Canonical, hashable form of a {ticker: weight} basket"""
+    return tuple(sorted((str(ticker), float(weight)) for ticker, weight in weights.items() if weight))
+
+def weight_matrix(baskets, tickers, bank_names):
+    """
+    Normalised (baskets, banks) weight matrix
+
+    baskets is a list of {ticker: weight}; weights are rescaled to sum to 1.
+    Raises ValueError for unknown tickers or baskets without positive weight.
+    """
+    position = {name: i for i, name in enumerate(bank_names)}
+    weights = np.zeros((len(baskets), len(bank_names)))
+
+    for row, basket in enumerate(baskets):
+        for ticker, weight in basket.items():
+            if str(ticker) not in tickers:
+                raise ValueError(f"Unknown or ambiguous ticker: {ticker}")
+            weights[row, position[tickers[str(ticker)]]] += weight
+
+    totals = weights.sum(axis=1, keepdims=True)
+    if (totals <= 0).any():
+        raise ValueError("Every basket needs a positive total weight")
+    return weights / totals
+
+# ═══════════════════════════════════════════════════════════════════════════
+# BATCHED EVALUATION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _weighted(weights, values):
+    """W @ values, renormalising weights over banks with missing values"""
+    present = ~np.isnan(values)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (weights @ np.where(present, values, 0)) / (weights @ present)
+
+def evaluate_baskets(panel, banks, baskets, confidence=STRESS_CONFIDENCE):
+    """
+    Portfolio metrics for many baskets in one batched matrix product
+
+    Per basket (rows, in input order):
+      weighted_cd           - Σ w·CD for the latest quarter
+      weighted_loan_growth  - Σ w·YoY loan growth (QoQ annualised where YoY is unavailable)
+      weighted_deposit_growth
+      hhi                   - Herfindahl index of weights, 0-10,000
+      effective_banks       - 1 / Σ w²
+      cd_volatility         - sqrt(wᵀ Σ w), Σ = covariance of QoQ CD changes across banks
+      stressed_cd           - weighted_cd + z(confidence) · cd_volatility
+      scenario: <name>      - weighted post-shock CD for each stress preset
+    Also returns the weighted CD path by quarter as a second frame.
+    """
+    cd = panel_to_matrix(panel, "cd_ratio")
+    bank_names = list(cd.index)
+    weights = weight_matrix(baskets, ticker_index(banks), bank_names)
+    values = cd.to_numpy(dtype=float)
+
+    metrics = get_rolling_metrics(panel)
+    latest = metrics[metrics["quarter"] == metrics["quarter"].max()].set_index("bank_name").reindex(bank_names)
+    loan_growth = latest["loan_growth"].fillna(latest["loan_growth_qoq"] * QUARTERS_PER_YEAR).to_numpy()
+    deposit_growth = latest["deposit_growth"].fillna(latest["deposit_growth_qoq"] * QUARTERS_PER_YEAR).to_numpy()
+
+    changes = np.diff(values, axis=1)
+    covariance = np.cov(changes) if changes.shape[1] > 1 else np.zeros((len(bank_names),) * 2)
+    volatility = np.sqrt(np.maximum(np.einsum("kb,bc,kc->k", weights, covariance, weights), 0))
+
+    scenarios = np.array(list(PRESET_SCENARIOS.values()))
+    deposits = panel_to_matrix(panel, "deposits").reindex(bank_names).iloc[:, -1].to_numpy()
+    advances = panel_to_matrix(panel, "advances").reindex(bank_names).iloc[:, -1].to_numpy()
+    post_cd = apply_shocks(deposits, advances, scenarios[:, 0], scenarios[:, 1]).astype(float)
+
+    result = pd.DataFrame({
+        "weighted_cd": weights @ values[:, -1],
+        "weighted_loan_growth": _weighted(weights, loan_growth),
+        "weighted_deposit_growth": _weighted(weights, deposit_growth),
+        "hhi": np.square(weights).sum(axis=1) * 10_000,
+        "effective_banks": 1 / np.square(weights).sum(axis=1),
+        "cd_volatility": volatility,
+    })
+    result["stressed_cd"] = result["weighted_cd"] + norm.ppf(confidence) * volatility
+    for position, name in enumerate(PRESET_SCENARIOS):
+        result[f"scenario: {name}"] = weights @ post_cd[position]
+
+    path = pd.DataFrame(weights @ values, columns=list(cd.columns.astype(str)))
+    return result, path
+
+def get_basket_metrics(panel, banks, baskets):
+    """
+    Memoized evaluate_baskets keyed by data version and canonical basket
+
+    Only baskets not already cached are evaluated, together in one batch.
+    Returns (metrics, path) frames in input order.
+    """
+    fingerprint = panel_fingerprint(panel)
+    keys = [(fingerprint, basket_key(basket)) for basket in baskets]
+    with _basket_lock:
+        rows = [_basket_cache.get(key) for key in keys]
+    missing = [i for i, row in enumerate(rows) if row is None]
+
+    if missing:
+        result, path = evaluate_baskets(panel, banks, [baskets[i] for i in missing])
+        for row, i in enumerate(missing):
+            rows[i] = (result.iloc[row], path.iloc[row])
+        with _basket_lock:
+            for i in missing:
+                _basket_cache[keys[i]] = rows[i]
+
+    return (pd.DataFrame([r for r, _ in rows]).reset_index(drop=True),
+            pd.DataFrame([p for _, p in rows]).reset_index(drop=True))
@@ -0,0 +1,178 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Scheduled Data Refresh - ingest → validate → recompute → snapshot → warmup → swap
+
+Run standalone as a daemon (or a single refresh with --once):
+    python refresh.py [--once]
+"""
+
+import sys
+import threading
+import time
+from datetime import datetime
+
+from config import (
+    AUTO_UPDATE_DATA, BANK_REPORTS_FOLDER, DATA_UPDATE_INTERVAL, DATA_VERSIONS_DIR, RBI_DATA_FOLDER, RBI_UPDATE_DAY
+)
+from data import build_panel, generate_data, get_bank_cd_ratio_data
+from changes import get_version_changes, summarize_changes
+from disclosures import extract_reports
+from ingest import ingest_folder, merge_bank_data
+from peers import carry_peer_index
+from validation import validate_bank_data
+from versions import current_version, load_version, save_quarantine, save_version, set_current_version
+from warmup import run_warmup
+
+PIPELINE_STAGES = ["ingest", "validate", "recompute", "snapshot", "warmup", "swap"]
+
+# How often the daemon thread checks whether a refresh is due
+POLL_SECONDS = 60
+
+def ingest_local(folder=RBI_DATA_FOLDER, reports_folder=BANK_REPORTS_FOLDER):
+    """Built-in bank data with local CSVs, then extracted bank report PDFs, merged on top"""
+    bank_data = merge_bank_data(get_bank_cd_ratio_data(), ingest_folder(folder))
+    return merge_bank_data(bank_data, extract_reports(reports_folder)[0])
+
+def carry_forward(previous, data, changes, root=DATA_VERSIONS_DIR):
+    """
+    Derive the new version's caches from the previous version's where a diff allows
+
+    The peer index is updated for the changed banks only when no bank was
+    added or removed; anything not carried is built by the warmups.
+    """
+    if changes["banks_added"] or changes["banks_removed"]:
+        return False
+    old_panel = build_panel(load_version(previous, root) if previous else get_bank_cd_ratio_data())
+    return carry_peer_index(old_panel, data["panel"], changes["changed_banks"])
+
+def warm_analytics(version, data):
+    """Populate the analytics caches and persisted batch outputs for every page and bank"""
+    return run_warmup(data)
+
+class RefreshService:
+    """
+    Runs the refresh pipeline on a schedule
+
+    A refresh is due DATA_UPDATE_INTERVAL hours after the last run, and
+    once on RBI_UPDATE_DAY each month. New versions are warmed before the
+    CURRENT pointer is swapped, so sessions only ever switch to a version
+    whose caches are already populated. Ingested data is validated first;
+    quarantined records are stored with the snapshot rather than published.
+    clock (epoch seconds), ingest and validate are injectable for tests.
+    """
+
+    def __init__(self, ingest=ingest_local, warmups=(warm_analytics,), clock=time.time,
+                 interval_hours=DATA_UPDATE_INTERVAL, rbi_day=RBI_UPDATE_DAY, root=DATA_VERSIONS_DIR,
+                 validate=validate_bank_data):
+        self.ingest = ingest
+        self.validate = validate
+        self.warmups = list(warmups)
+        self.clock = clock
+        self.interval = interval_hours * 3600
+        self.rbi_day = rbi_day
+        self.root = root
+        self.last_run = None
+        self.last_report = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def due(self, now=None):
+        """True if a refresh should run at now (epoch seconds)"""
+        now = self.clock() if now is None else now
+        if self.last_run is None or now - self.last_run >= self.interval:
+            return True
+        today = datetime.fromtimestamp(now).date()
+        return today.day == self.rbi_day and datetime.fromtimestamp(self.last_run).date() < today
+
+    def run_pipeline(self):
+        """
+        Run every stage once and return a report
+
+        Returns None if a refresh is already in progress. Any stage failure
+        stops the pipeline and leaves the current version in place.
+        """
+        if not self._lock.acquire(blocking=False):
+            return None
+
+        report = {"started": self.clock(), "stages": {}, "version": None, "changed": False, "error": None}
+        try:
+            stage_start = time.perf_counter()
+
+            def finish(stage):
+                nonlocal stage_start
+                report["stages"][stage] = time.perf_counter() - stage_start
+                stage_start = time.perf_counter()
+
+            bank_data = self.ingest()
+            finish("ingest")
+
+            bank_data, quarantine, report["validation"] = self.validate(bank_data)
+            finish("validate")
+
+            data = generate_data(bank_data)
+            finish("recompute")
+
+            previous = current_version(self.root)
+            version = save_version(bank_data, self.root)
+            report["version"] = version
+            report["changed"] = version != previous
+            save_quarantine(version, quarantine.to_dict("records"), self.root)
+            if report["changed"]:
+                changes = get_version_changes(previous, version, self.root)
+                report["changes"] = summarize_changes(changes)
+            finish("snapshot")
+
+            if report["changed"]:
+                report["carried_forward"] = carry_forward(previous, data, changes, self.root)
+                for warmup in self.warmups:
+                    result = warmup(version, data)
+                    if isinstance(result, dict):
+                        report["warmup"] = result
+                finish("warmup")
+
+                set_current_version(version, self.root)
+                finish("swap")
+        except Exception as error:
+            report["error"] = f"{type(error).__name__}: {error}"
+        finally:
+            self.last_run = report["started"]
+            self.last_report = report
+            self._lock.release()
+
+        return report
+
+    def run_pending(self):
+        """Run the pipeline if due; returns its report or None"""
+        return self.run_pipeline() if self.due() else None
+
+    def start(self, poll_seconds=POLL_SECONDS):
+        """Check for due refreshes on a daemon thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, args=(poll_seconds,), name="data-refresh",
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _loop(self, poll_seconds):
+        while not self._stop.is_set():
+            self.run_pending()
+            self._stop.wait(poll_seconds)
+
+if __name__ == "__main__":
+    service = RefreshService()
+
+    if "--once" in sys.argv:
+        print(service.run_pipeline())
+    elif not AUTO_UPDATE_DATA:
+        print("AUTO_UPDATE_DATA is disabled; use --once for a manual refresh")
+    else:
+        while True:
+            result = service.run_pending()
+            if result:
+                print(result)
+            time.sleep(POLL_SECONDS)
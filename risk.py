@@ -0,0 +1,94 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Composite Liquidity-Risk Score & Early-Warning Ranking
+"""
+
+import threading
+
+import numpy as np
+from cachetools import LRUCache
+
+from analytics import QUARTERS_PER_YEAR, get_rolling_metrics, panel_fingerprint
+from config import CD_RATIO_BENCHMARKS, RISK_SCORE_WEIGHTS
+
+RISK_COMPONENTS = list(RISK_SCORE_WEIGHTS)
+
+EARLY_WARNING_BANDS = [(70, "🔴 ALERT"), (50, "🟠 WATCH"), (0, "🟢 NORMAL")]
+
+_score_cache = LRUCache(maxsize=16)
+_score_lock = threading.Lock()
+
+def _clip01(values):
+    return np.clip(values, 0.0, 1.0)
+
+def compute_risk_scores(panel, window=4):
+    """
+    Score every bank × quarter on liquidity risk (0 = lowest, 100 = highest)
+
+    Component sub-scores (0-1), combined with RISK_SCORE_WEIGHTS:
+      level       - cross-sectional percentile of CD within the quarter
+      momentum    - rising QoQ CD change, 0-2pp mapped onto 0-1
+      divergence  - loan growth minus deposit growth (YoY, or annualised QoQ
+                    before a full year of history), 0-10pp mapped onto 0-1
+      volatility  - rolling CD standard deviation, 0-2pp mapped onto 0-1
+      proximity   - closeness to the HIGH and CRITICAL CD thresholds
+    """
+    metrics = get_rolling_metrics(panel, window=window).copy()
+    high, critical = CD_RATIO_BENCHMARKS["high"][0], CD_RATIO_BENCHMARKS["critical"][0]
+
+    divergence = metrics["growth_divergence"].fillna(
+        (metrics["loan_growth_qoq"] - metrics["deposit_growth_qoq"]) * QUARTERS_PER_YEAR
+    )
+    cd = metrics["cd_ratio"].to_numpy()
+
+    components = np.column_stack([
+        metrics.groupby("quarter", observed=True)["cd_ratio"].rank(pct=True).to_numpy(),
+        _clip01(metrics["cd_change_qoq"].fillna(0).to_numpy() / 2),
+        _clip01(divergence.fillna(0).to_numpy() / 10),
+        _clip01(metrics["rolling_std_cd"].fillna(0).to_numpy() / 2),
+        0.5 * _clip01(1 - (high - cd) / 15) + 0.5 * _clip01(1 - (critical - cd) / 25),
+    ])
+    weights = np.array([RISK_SCORE_WEIGHTS[c] for c in RISK_COMPONENTS])
+
+    for position, component in enumerate(RISK_COMPONENTS):
+        metrics[f"{component}_score"] = components[:, position] * 100
+    metrics["risk_score"] = components @ weights / weights.sum() * 100
+
+    metrics["early_warning"] = np.select(
+        [metrics["risk_score"] >= threshold for threshold, _ in EARLY_WARNING_BANDS],
+        [label for _, label in EARLY_WARNING_BANDS],
+        default=EARLY_WARNING_BANDS[-1][1],
+    )
+    metrics["risk_rank"] = metrics.groupby("quarter", observed=True)["risk_score"].rank(
+        ascending=False, method="min").astype(int)
+
+    return metrics
+
+def get_risk_scores(panel, window=4):
+    """Return risk scores, cached per data version (panel content hash) and window"""
+    key = (panel_fingerprint(panel), window)
+    with _score_lock:
+        scores = _score_cache.get(key)
+    if scores is None:
+        scores = compute_risk_scores(panel, window)
+        with _score_lock:
+            _score_cache[key] = scores
+    return scores
+
+def top_k(scores, k=10, quarter=None, column="risk_score", largest=True):
+    """
+    Top-k rows by a score column without sorting the whole table
+
+    np.argpartition selects the k candidates in linear time; only those k
+    rows are then sorted for display.
+    """
+    if quarter is not None:
+        scores = scores[scores["quarter"] == quarter]
+    values = scores[column].to_numpy()
+    k = min(k, len(values))
+    if k == 0:
+        return scores.iloc[:0]
+
+    keys = -values if largest else values
+    candidates = np.argpartition(keys, k - 1)[:k]
+    return scores.iloc[candidates[np.argsort(keys[candidates], kind="stable")]]
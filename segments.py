@@ -0,0 +1,82 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Segment-Level CD Ratios & Mix Analysis
+"""
+
+import numpy as np
+import pandas as pd
+
+from data import ADVANCE_SEGMENTS, DEPOSIT_SEGMENTS, get_measures
+
+SEGMENT_LABELS = {
+    "retail": "Retail",
+    "corporate": "Corporate",
+    "msme": "MSME",
+    "agricultural": "Agricultural",
+    "savings": "Savings",
+    "current": "Current",
+    "term": "Term",
+}
+
+def compute_segment_ratios(store):
+    """
+    Vectorized segment analytics over the whole store
+
+    Returns a dict of (banks, quarters, ...) arrays:
+      segment_cd      - segment advances / total deposits × 100 (sums to total CD)
+      advance_mix     - segment share of total advances
+      deposit_mix     - segment share of total deposits
+      casa_ratio      - (savings + current) / total deposits × 100
+      cd_ratio        - total CD
+    """
+    core = get_measures(store, ["deposits", "advances"])
+    deposits, advances = core[..., 0], core[..., 1]
+    advance_segments = get_measures(store, [f"advances_{s}" for s in ADVANCE_SEGMENTS])
+    deposit_segments = get_measures(store, [f"deposits_{s}" for s in DEPOSIT_SEGMENTS])
+
+    deposit_mix = deposit_segments / deposits[..., None]
+
+    return {
+        "segment_cd": advance_segments / deposits[..., None] * 100,
+        "advance_mix": advance_segments / advances[..., None],
+        "deposit_mix": deposit_mix,
+        "casa_ratio": (deposit_mix[..., 0] + deposit_mix[..., 1]) * 100,
+        "cd_ratio": advances / deposits * 100,
+    }
+
+def segment_cd_contributions(ratios, start=0, end=-1):
+    """
+    Attribute the CD change between two quarters to each advance segment
+
+    Because segment CDs sum to total CD, the per-segment changes add up
+    exactly to the total CD change. Returns a (banks, segments) array.
+    """
+    return ratios["segment_cd"][:, end, :] - ratios["segment_cd"][:, start, :]
+
+def segment_frame(store, ratios, bank_index):
+    """Long table of one bank's segment CD, advance mix and deposit mix by quarter"""
+    quarters = store["quarters"]
+    frame = pd.DataFrame({"quarter": quarters, "cd_ratio": ratios["cd_ratio"][bank_index],
+                          "casa_ratio": ratios["casa_ratio"][bank_index]})
+
+    for position, segment in enumerate(ADVANCE_SEGMENTS):
+        frame[f"{segment}_cd"] = ratios["segment_cd"][bank_index, :, position]
+        frame[f"{segment}_share"] = ratios["advance_mix"][bank_index, :, position] * 100
+    for position, segment in enumerate(DEPOSIT_SEGMENTS):
+        frame[f"{segment}_share"] = ratios["deposit_mix"][bank_index, :, position] * 100
+
+    return frame
+
+def sector_segment_mix(store, quarter=-1):
+    """Advance-weighted segment mix and CASA ratio per bank type for one quarter"""
+    advance_segments = get_measures(store, [f"advances_{s}" for s in ADVANCE_SEGMENTS])[:, quarter, :]
+    deposit_segments = get_measures(store, [f"deposits_{s}" for s in DEPOSIT_SEGMENTS])[:, quarter, :]
+
+    frame = pd.DataFrame(np.hstack([advance_segments, deposit_segments]),
+                         columns=ADVANCE_SEGMENTS + DEPOSIT_SEGMENTS)
+    frame["type"] = store["types"]
+    totals = frame.groupby("type", sort=False).sum()
+
+    mix = totals[ADVANCE_SEGMENTS].div(totals[ADVANCE_SEGMENTS].sum(axis=1), axis=0) * 100
+    mix["casa_ratio"] = (totals["savings"] + totals["current"]) / totals[DEPOSIT_SEGMENTS].sum(axis=1) * 100
+    return mix
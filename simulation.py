@@ -0,0 +1,156 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Monte Carlo Liquidity Simulation - Correlated Deposit & Advance Paths
+"""
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from analytics import panel_to_matrix
+from config import CD_RATIO_BENCHMARKS, MAX_WORKERS, MONTE_CARLO_PATHS, MONTE_CARLO_SEED
+
+# Thresholds reported as crossing probabilities: HIGH (85%) and CRITICAL (95%)
+THRESHOLDS = (CD_RATIO_BENCHMARKS["high"][0], CD_RATIO_BENCHMARKS["critical"][0])
+
+# Memory cap for one chunk's working set in simulate_chunk
+MAX_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Peak working set of simulate_chunk in (paths × banks × quarters × 2) float64
+# arrays: the draws, the einsum result and the shocks are alive together,
+# then the per-quarter CD arrays (half that size each) on top
+CHUNK_TEMPORARIES = 4
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SHOCK MODEL
+# ═══════════════════════════════════════════════════════════════════════════
+
+def estimate_shock_model(panel):
+    """
+    Estimate quarterly log-growth drift and covariance for deposits/advances
+
+    Drift is bank-specific; the 2×2 covariance is pooled within each bank
+    type because a handful of quarters per bank cannot pin down a stable
+    correlation on its own.
+    """
+    deposits = panel_to_matrix(panel, "deposits")
+    advances = panel_to_matrix(panel, "advances").reindex_like(deposits)
+    banks = deposits.index
+    bank_types = panel.drop_duplicates("bank_name").set_index("bank_name")["type"].reindex(banks)
+
+    # (banks, quarters - 1, 2) log growth: [..., 0] = deposits, [..., 1] = advances
+    growth = np.stack([np.diff(np.log(deposits.to_numpy(dtype=float)), axis=1),
+                       np.diff(np.log(advances.to_numpy(dtype=float)), axis=1)], axis=-1)
+    drift = growth.mean(axis=1)
+    residuals = growth - drift[:, None, :]
+
+    chol = np.empty((len(banks), 2, 2))
+    for bank_type in bank_types.unique():
+        members = (bank_types == bank_type).to_numpy()
+        pooled = residuals[members].reshape(-1, 2)
+        cov = pooled.T @ pooled / max(len(pooled) - members.sum(), 1)
+        chol[members] = np.linalg.cholesky(cov + np.eye(2) * 1e-10)
+
+    return {
+        "banks": banks.to_numpy(),
+        "types": bank_types.to_numpy(),
+        "drift": drift,
+        "chol": chol,
+        "deposits": deposits.iloc[:, -1].to_numpy(dtype=float),
+        "advances": advances.iloc[:, -1].to_numpy(dtype=float),
+    }
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SIMULATION
+# ═══════════════════════════════════════════════════════════════════════════
+
+def simulate_chunk(model, n_paths, horizon, seed, thresholds=THRESHOLDS):
+    """
+    Simulate one chunk of paths for every bank
+
+    Returns sufficient statistics so chunks can be merged in any order:
+    crossing counts per threshold (banks, thresholds), and sum / sum of
+    squares of the terminal CD ratio per bank.
+    """
+    rng = np.random.default_rng(seed)
+    n_banks = len(model["banks"])
+
+    z = rng.standard_normal((n_paths, n_banks, horizon, 2))
+    shocks = model["drift"][None, :, None, :] + np.einsum("bij,pbhj->pbhi", model["chol"], z)
+    log_cd = np.cumsum(shocks[..., 1] - shocks[..., 0], axis=-1)      # (paths, banks, horizon)
+
+    base_cd = model["advances"] / model["deposits"] * 100
+    cd_paths = base_cd[None, :, None] * np.exp(log_cd)
+    peak_cd = cd_paths.max(axis=-1)
+    terminal_cd = cd_paths[..., -1]
+
+    return {
+        "paths": n_paths,
+        "crossings": np.stack([(peak_cd > t).sum(axis=0) for t in thresholds], axis=-1),
+        "cd_sum": terminal_cd.sum(axis=0),
+        "cd_sq_sum": np.square(terminal_cd).sum(axis=0),
+    }
+
+def _chunk_plan(n_paths, n_banks, horizon, seed, max_chunk_bytes):
+    """Fixed chunk sizes and child seeds, independent of the worker count"""
+    chunk_paths = max(1, max_chunk_bytes // (CHUNK_TEMPORARIES * n_banks * horizon * 2 * 8))
+    sizes = [min(chunk_paths, n_paths - start) for start in range(0, n_paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    return list(zip(sizes, seeds))
+
+def _summarize(model, totals, thresholds):
+    """Turn merged chunk statistics into a per-bank probability table"""
+    paths = totals["paths"]
+    mean_cd = totals["cd_sum"] / paths
+    variance = np.maximum(totals["cd_sq_sum"] / paths - np.square(mean_cd), 0)
+
+    result = pd.DataFrame({
+        "bank_name": model["banks"],
+        "type": model["types"],
+        "current_cd": model["advances"] / model["deposits"] * 100,
+        "expected_cd": mean_cd,
+        "cd_std": np.sqrt(variance),
+    })
+    for index, threshold in enumerate(thresholds):
+        result[f"prob_above_{threshold:g}"] = totals["crossings"][:, index] / paths
+
+    return result
+
+def iter_monte_carlo(panel, n_paths=MONTE_CARLO_PATHS, horizon=4, seed=MONTE_CARLO_SEED,
+                     thresholds=THRESHOLDS, max_workers=MAX_WORKERS, max_chunk_bytes=MAX_CHUNK_BYTES):
+    """
+    Run the simulation in memory-capped chunks, yielding partial results
+
+    Each yield is (paths_done, probability_table) after another chunk has
+    finished. Chunks are seeded from a SeedSequence, so the final table is
+    reproducible for a given seed regardless of worker count or completion order.
+    """
+    model = estimate_shock_model(panel)
+    plan = _chunk_plan(n_paths, len(model["banks"]), horizon, seed, max_chunk_bytes)
+    finished = {}
+
+    def merge(index, chunk):
+        # Sum in plan order so floating-point totals do not depend on completion order
+        finished[index] = chunk
+        chunks = [finished[i] for i in sorted(finished)]
+        totals = {key: sum(c[key] for c in chunks) for key in chunks[0]}
+        return totals["paths"], _summarize(model, totals, thresholds)
+
+    if max_workers <= 1 or len(plan) == 1:
+        for index, (size, child_seed) in enumerate(plan):
+            yield merge(index, simulate_chunk(model, size, horizon, child_seed, thresholds))
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(simulate_chunk, model, size, horizon, child_seed, thresholds): index
+                   for index, (size, child_seed) in enumerate(plan)}
+        for future in as_completed(futures):
+            yield merge(futures[future], future.result())
+
+def run_monte_carlo(panel, **kwargs):
+    """Run the full simulation and return the final per-bank probability table"""
+    result = None
+    for _, result in iter_monte_carlo(panel, **kwargs):
+        pass
+    return result
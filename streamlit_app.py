@@ -7,16 +7,41 @@ Version 1.0.0
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from config import (
     BRAND_NAME, PROJECT_TITLE, PROJECT_SUBTITLE, AUTHOR, EXPERIENCE, 
     LOCATION, YEAR, COLORS, PAGES, PSB_BANKS, PRIVATE_BANKS, SFB_BANKS,
-    CD_RATIO_BENCHMARKS, SECTOR_AVERAGES, ANALYSIS_PERIOD
+    CD_RATIO_BENCHMARKS, SECTOR_AVERAGES, ANALYSIS_PERIOD, ENABLE_ML_FEATURES,
+    ENABLE_STRESS_TESTING, ENABLE_PORTFOLIO_ANALYTICS, MONTE_CARLO_PATHS, MONTE_CARLO_PATH_OPTIONS, MONTE_CARLO_SEED,
+    NPA_THRESHOLD, NPA_THRESHOLD_MIN, NPA_THRESHOLD_MAX,
+    AUTO_UPDATE_DATA, OVERLAY_LEGEND_MAX, OVERLAY_MAX_SERIES, DECIMATION_OVERLAY_POINTS
 )
-from data import generate_data
+from data import ADVANCE_SEGMENTS, DEPOSIT_SEGMENTS, SECTOR_LABEL, generate_data, get_quarter_view
+from analytics import STATUS_LABELS, get_rolling_metrics
+from forecasting import FORECAST_METHODS, get_forecasts
+from stress import preset_scenarios, run_stress_test, scenario_grid
+from simulation import THRESHOLDS, iter_monte_carlo
+from segments import (
+    SEGMENT_LABELS, compute_segment_ratios, segment_cd_contributions,
+    segment_frame, sector_segment_mix
+)
+from health import HEALTH_FLAGS, build_health_screen, quarter_health, screen_by_npa
+from risk import RISK_COMPONENTS, get_risk_scores, top_k
+from anomaly import load_anomaly_scores, pending_anomaly_scores
+from peers import PEER_METRICS, get_peers
+from clustering import CLUSTER_METHODS, cluster_type_crosstab, get_clusters, type_agreement
+from portfolio import get_basket_metrics
+from market import get_prices, momentum_vs_returns, quarter_end_dates
+from refresh import RefreshService, warm_analytics
+from warmup import run_warmup
+from versions import current_version, load_quarantine, load_version
+from changes import get_version_changes, parent_version
+from decimation import decimate_series
 from styles import (
     get_custom_css, render_section_header, render_subsection_header,
     render_divider, render_info_box, render_warning_box, render_success_box,
@@ -80,6 +105,10 @@ pages_list = [
     "💡 Investment Insights",
     "📋 Data Explorer",
     "🎓 Education",
+    "🧪 Stress Testing",
+    "🧩 Segment Drivers",
+    "🩺 Asset Quality & Health",
+    "🧭 Behavioral Clusters",
 ]
 
 page = st.sidebar.radio(
@@ -107,11 +136,90 @@ st.sidebar.markdown("""
 # LOAD DATA
 # ═══════════════════════════════════════════════════════════════════════════
 
-@st.cache_data
-def load_dashboard_data():
-    return generate_data()
+# One dataset per version, shared by every session (its tables are never
+# modified; only its locked quarter-view cache fills in as quarters are viewed);
+# a few recent versions stay resident so pinned sessions survive a swap
+@st.cache_resource(max_entries=3)
+def load_dashboard_data(version=None):
+    return generate_data(load_version(version) if version else None)
+
+@st.cache_resource
+def start_refresh_service():
+    # One service per server process; it warms the data cache for a new
+    # version before swapping the pointer, so sessions switch without recomputing
+    service = RefreshService(warmups=[lambda version, _: load_dashboard_data(version), warm_analytics])
+    return service.start()
+
+if AUTO_UPDATE_DATA:
+    start_refresh_service()
+
+# A session keeps the version it started on for its lifetime, so a swap or
+# rollback never changes the data under an open page
+latest_version = current_version()
+if "data_version" not in st.session_state:
+    st.session_state.data_version = latest_version
+data_version = st.session_state.data_version
+
+st.sidebar.caption(f"🗂️ Data version: {data_version or 'built-in'}")
+if data_version != latest_version and st.sidebar.button("🔄 Load latest data", key="load_latest_data"):
+    st.session_state.data_version = latest_version
+    st.rerun()
+
+# Every page reads the quarter-dependent tables of the as-of view; views are
+# memoized with the dataset, so scrubbing quarters never reruns generate_data
+dataset = load_dashboard_data(data_version)
+quarter_options = list(dataset["panel"]["quarter"].cat.categories)
+as_of_quarter = st.sidebar.select_slider(
+    "📅 As of quarter",
+    options=quarter_options,
+    value=quarter_options[-1],
+    key="as_of_quarter"
+)
+data = get_quarter_view(dataset, as_of_quarter)
+
+@st.cache_resource
+def start_cache_warmup(version):
+    # Once per data version and server: warm every page and trend bank in the
+    # background so the first visitor to each page does not pay for it
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-warmup")
+    future = executor.submit(run_warmup, load_dashboard_data(version), pages_list)
+    executor.shutdown(wait=False)
+    return future
+
+warmup_job = start_cache_warmup(data_version)
+if warmup_job.done() and warmup_job.exception() is None:
+    warmup_report = warmup_job.result()
+    st.sidebar.caption(
+        f"⚡ Cache warm: {warmup_report['pages_warmed']}/{warmup_report['pages']} pages, "
+        f"{warmup_report['banks_warmed']}/{warmup_report['banks']} banks "
+        f"({warmup_report['coverage']:.0%}) in {warmup_report['seconds']:.1f}s"
+    )
+
+quarantined = load_quarantine(data_version) if data_version else []
+if quarantined:
+    held_back = {row["bank_name"] for row in quarantined if row["action"] == "bank"}
+    st.sidebar.caption(
+        f"🚧 Validation: {len(held_back)} banks quarantined, "
+        f"{sum(row['action'] == 'field' for row in quarantined)} identifiers cleared"
+    )
 
-data = load_dashboard_data()
+@st.cache_data
+def load_anomaly_flags(version, _panel):
+    # Keyed by data version rather than by hashing the panel on every rerun;
+    # raising while the batch is pending keeps that state out of the cache
+    scores = load_anomaly_scores(_panel)
+    if scores is None:
+        raise LookupError(f"Anomaly scores for {version or 'built-in'} are not ready")
+    return scores
+
+@st.cache_resource(max_entries=3)
+def load_health_screen(version, _store):
+    # Threshold-free, so slider moves reuse it; keyed by data version like the dataset
+    return build_health_screen(_store)
+
+@st.cache_data(ttl=6 * 3600)
+def load_market_prices(tickers, start, end):
+    return get_prices(list(tickers), start, end)
 
 # ═══════════════════════════════════════════════════════════════════════════
 # PAGE 0: ABOUT THIS ANALYSIS
@@ -231,7 +339,7 @@ elif page_index == 1:
     render_divider()
     
     # Key metrics
-    render_subsection_header("📊 Key Sector Metrics")
+    render_subsection_header(f"📊 Key Sector Metrics - {as_of_quarter}")
     
     col1, col2, col3, col4, col5 = st.columns(5)
     
@@ -272,6 +380,77 @@ elif page_index == 1:
     
     render_divider()
     
+    render_subsection_header("🔁 What Changed This Refresh")
+    
+    if data_version is None:
+        st.info("Serving the built-in dataset - no refresh has been applied yet.")
+    else:
+        previous_version = parent_version(data_version)
+        changes = get_version_changes(previous_version, data_version)
+        st.caption(f"Version {data_version} compared with {previous_version or 'the built-in dataset'}")
+        
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Figures Revised", len(changes["cells"]))
+        col2.metric("Banks Changed", len(changes["changed_banks"]))
+        col3.metric("CD Status Changes", len(changes["status_changes"]))
+        col4.metric("Banks Added / Removed", f"{len(changes['banks_added'])} / {len(changes['banks_removed'])}")
+        
+        if changes["cells"].empty and not changes["banks_added"] and not changes["banks_removed"]:
+            render_success_box("No deposit or advance figures changed in this refresh.")
+        else:
+            if changes["banks_added"] or changes["banks_removed"]:
+                st.markdown(
+                    f"**Added:** {', '.join(changes['banks_added']) or 'none'}  \n"
+                    f"**Removed:** {', '.join(changes['banks_removed']) or 'none'}"
+                )
+            
+            cells_tab, status_tab, sector_tab = st.tabs(["Revised Figures", "CD Status Changes", "Sector Impact"])
+            
+            with cells_tab:
+                st.dataframe(
+                    changes["cells"].sort_values("pct_change", key=np.abs, ascending=False).rename(columns={
+                        "bank_name": "Bank Name",
+                        "quarter": "Quarter",
+                        "measure": "Measure",
+                        "old": "Previous (₹ Cr)",
+                        "new": "Revised (₹ Cr)",
+                        "change": "Change (₹ Cr)",
+                        "pct_change": "Change (%)"
+                    }).style.format(precision=2),
+                    use_container_width=True,
+                    hide_index=True
+                )
+            
+            with status_tab:
+                st.dataframe(
+                    changes["status_changes"].rename(columns={
+                        "bank_name": "Bank Name",
+                        "quarter": "Quarter",
+                        "old_cd": "Previous CD (%)",
+                        "new_cd": "Revised CD (%)",
+                        "old_status": "Previous Status",
+                        "new_status": "Revised Status"
+                    }).style.format(precision=2),
+                    use_container_width=True,
+                    hide_index=True
+                )
+            
+            with sector_tab:
+                st.dataframe(
+                    changes["sector"].reset_index().rename(columns={
+                        "quarter": "Quarter",
+                        "old_weighted_cd": "Previous Weighted CD (%)",
+                        "new_weighted_cd": "Revised Weighted CD (%)",
+                        "weighted_cd_change": "Change (pp)",
+                        "deposits_change": "Deposits Change (₹ Cr)",
+                        "advances_change": "Advances Change (₹ Cr)"
+                    }).style.format(precision=2),
+                    use_container_width=True,
+                    hide_index=True
+                )
+    
+    render_divider()
+    
     # Sector summary
     render_subsection_header("🏛️ CD Ratio by Bank Type")
     
@@ -282,6 +461,7 @@ elif page_index == 1:
             f"**Public Sector Banks (PSBs)**\n\n"
             f"Count: {data['sector_summary']['PSB']['count']}\n"
             f"Avg CD: {data['sector_summary']['PSB']['avg_cd']:.2f}%\n"
+            f"Weighted CD: {data['sector_summary']['PSB']['weighted_cd']:.2f}%\n"
             f"Range: {data['sector_summary']['PSB']['min_cd']:.2f}% - {data['sector_summary']['PSB']['max_cd']:.2f}%"
         )
     
@@ -290,6 +470,7 @@ elif page_index == 1:
             f"**Private Banks**\n\n"
             f"Count: {data['sector_summary']['Private']['count']}\n"
             f"Avg CD: {data['sector_summary']['Private']['avg_cd']:.2f}%\n"
+            f"Weighted CD: {data['sector_summary']['Private']['weighted_cd']:.2f}%\n"
             f"Range: {data['sector_summary']['Private']['min_cd']:.2f}% - {data['sector_summary']['Private']['max_cd']:.2f}%"
         )
     
@@ -298,9 +479,41 @@ elif page_index == 1:
             f"**Small Finance Banks (SFBs)**\n\n"
             f"Count: {data['sector_summary']['SFB']['count']}\n"
             f"Avg CD: {data['sector_summary']['SFB']['avg_cd']:.2f}%\n"
+            f"Weighted CD: {data['sector_summary']['SFB']['weighted_cd']:.2f}%\n"
             f"Range: {data['sector_summary']['SFB']['min_cd']:.2f}% - {data['sector_summary']['SFB']['max_cd']:.2f}%"
         )
     
+    render_subsection_header("⚖️ Deposit-Weighted CD Ratio by Quarter")
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(
+        x=list(data["metrics"]["sector_weighted_cd_by_quarter"].keys()),
+        y=list(data["metrics"]["sector_weighted_cd_by_quarter"].values()),
+        mode='lines+markers',
+        name='All Banks',
+        line=dict(color=COLORS["primary_dark"], width=4)
+    ))
+    
+    for bank_type, summary in data["sector_summary"].items():
+        fig.add_trace(go.Scatter(
+            x=list(summary["weighted_cd_by_quarter"].keys()),
+            y=list(summary["weighted_cd_by_quarter"].values()),
+            mode='lines+markers',
+            name=bank_type
+        ))
+    
+    fig.update_layout(
+        title="System-Level CD Ratio (Total Advances / Total Deposits)",
+        xaxis_title="Quarter",
+        yaxis_title="CD Ratio (%)",
+        hovermode="x unified",
+        height=450,
+        template="plotly_white"
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
     render_divider()
     
     render_subsection_header("💡 Key Insights")
@@ -339,22 +552,132 @@ elif page_index == 2:
         key="bank_selector"
     )
     
+    rolling_window = st.select_slider(
+        "Rolling window (quarters):",
+        options=[2, 3, 4],
+        value=4,
+        key="rolling_window"
+    )
+    
+    col1, col2, col3 = st.columns([1, 1, 2])
+    
+    with col1:
+        show_peers = st.checkbox("Overlay nearest peers", value=False, key="show_peers")
+    
+    with col2:
+        peer_count = st.number_input("Peers:", min_value=1, max_value=10, value=3, key="peer_count",
+                                     disabled=not show_peers)
+    
+    with col3:
+        peer_metric = st.radio(
+            "Similarity:",
+            list(PEER_METRICS),
+            format_func=PEER_METRICS.get,
+            horizontal=True,
+            key="peer_metric",
+            disabled=not show_peers
+        )
+    
     # Get trend data for selected bank
-    if selected_bank in data["cd_ratio_trends"]:
-        trend_data = data["cd_ratio_trends"][selected_bank]
+    cd_matrix = data["cd_ratio_matrix"]
+    quarter_labels = list(cd_matrix.columns.astype(str))
+    
+    trend_zoom = st.select_slider(
+        "Zoom (quarters):",
+        options=quarter_labels,
+        value=(quarter_labels[0], quarter_labels[-1]),
+        key="trend_zoom"
+    )
+    # Position window shared by every series below; line series are decimated per window
+    zoom = (quarter_labels.index(trend_zoom[0]), quarter_labels.index(trend_zoom[1]) + 1)
+    
+    if selected_bank in cd_matrix.index:
+        bank_trend = cd_matrix.loc[selected_bank].to_numpy()
+        rolling = get_rolling_metrics(data["panel"], window=rolling_window)
+        bank_rolling = rolling[rolling["bank_name"] == selected_bank]
         
         # Create chart
         fig = go.Figure()
         
+        trend_x, trend_y = decimate_series((data_version, selected_bank, "cd_ratio"), quarter_labels, bank_trend, zoom)
+        rolling_x, rolling_y = decimate_series(
+            (data_version, selected_bank, f"rolling_mean_cd_{rolling_window}"),
+            bank_rolling["quarter"].astype(str), bank_rolling["rolling_mean_cd"], zoom
+        )
+        
         fig.add_trace(go.Scatter(
-            x=trend_data["quarters"],
-            y=trend_data["cd_ratios"],
+            x=trend_x,
+            y=trend_y,
             mode='lines+markers',
             name='CD Ratio %',
             line=dict(color=COLORS["primary_dark"], width=3),
             marker=dict(size=10)
         ))
         
+        fig.add_trace(go.Scatter(
+            x=rolling_x,
+            y=rolling_y,
+            mode='lines',
+            name=f'{rolling_window}Q Rolling Mean',
+            line=dict(color=COLORS["gold"], width=2, dash='dot')
+        ))
+        
+        # Peer overlay ("banks like this one")
+        if show_peers:
+            peers = get_peers(data["panel"], selected_bank, k=int(peer_count), metric=peer_metric)
+            
+            for peer, peer_trend in zip(peers["bank_name"], cd_matrix.loc[peers["bank_name"]].to_numpy()):
+                peer_x, peer_y = decimate_series((data_version, peer, "cd_ratio"), quarter_labels, peer_trend, zoom)
+                fig.add_trace(go.Scatter(
+                    x=peer_x,
+                    y=peer_y,
+                    mode='lines',
+                    name=f'Peer: {peer}',
+                    line=dict(width=1.5),
+                    opacity=0.6
+                ))
+        
+        # Forecast overlay (fitted in the background, never blocks the page)
+        if ENABLE_ML_FEATURES:
+            forecast_method = st.radio(
+                "Forecast model:",
+                FORECAST_METHODS,
+                format_func=lambda m: {"ets": "ETS", "arima": "ARIMA", "pooled": "Pooled Panel"}[m],
+                horizontal=True,
+                key="forecast_method"
+            )
+            try:
+                forecasts = get_forecasts(data["panel"], method=forecast_method)
+            except Exception as error:
+                forecasts = None
+                st.caption(f"⚠️ Forecast fit failed ({type(error).__name__}: {error}); it is retried on the next refresh.")
+            else:
+                if forecasts is None:
+                    st.caption("⏳ Forecasts are being fitted in the background and will appear on the next refresh.")
+            
+            if forecasts is not None and zoom[1] == len(quarter_labels):
+                bank_forecast = forecasts[forecasts["bank_name"] == selected_bank]
+                x_band = list(bank_forecast["quarter"]) + list(bank_forecast["quarter"])[::-1]
+                y_band = list(bank_forecast["upper"]) + list(bank_forecast["lower"])[::-1]
+                
+                fig.add_trace(go.Scatter(
+                    x=x_band,
+                    y=y_band,
+                    fill='toself',
+                    fillcolor='rgba(30, 144, 255, 0.15)',
+                    line=dict(width=0),
+                    hoverinfo='skip',
+                    name='Forecast Interval'
+                ))
+                
+                fig.add_trace(go.Scatter(
+                    x=[quarter_labels[-1]] + list(bank_forecast["quarter"]),
+                    y=[bank_trend[-1]] + list(bank_forecast["forecast"]),
+                    mode='lines+markers',
+                    name='Forecast',
+                    line=dict(color=COLORS["primary_bright"], width=2, dash='dash')
+                ))
+        
         # Add benchmark line
         fig.add_hline(
             y=75,
@@ -375,24 +698,156 @@ elif page_index == 2:
         
         st.plotly_chart(fig, use_container_width=True)
         
+        if show_peers:
+            st.dataframe(
+                peers.rename(columns={
+                    "bank_name": "Peer Bank",
+                    "type": "Type",
+                    "distance": "Distance",
+                    "correlation": "Trend Similarity"
+                }).style.format({"Distance": "{:.3f}", "Trend Similarity": "{:.3f}"}),
+                use_container_width=True,
+                hide_index=True
+            )
+        
         # Summary statistics
         render_subsection_header("📊 Trend Summary")
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            st.metric("Latest CD Ratio", f"{trend_data['cd_ratios'][-1]:.2f}%")
+            st.metric("Latest CD Ratio", f"{bank_trend[-1]:.2f}%")
         
         with col2:
-            st.metric("Q1 FY24", f"{trend_data['cd_ratios'][0]:.2f}%")
+            st.metric(quarter_labels[0], f"{bank_trend[0]:.2f}%")
         
         with col3:
-            change = trend_data['cd_ratios'][-1] - trend_data['cd_ratios'][0]
+            change = bank_trend[-1] - bank_trend[0]
             st.metric("Change (7 Q)", f"{change:.2f}%", delta=f"{change:+.2f}%")
         
         with col4:
-            avg_cd = sum(trend_data['cd_ratios']) / len(trend_data['cd_ratios'])
+            avg_cd = bank_trend.mean()
             st.metric("Average CD", f"{avg_cd:.2f}%")
+        
+        render_subsection_header("🔄 Growth & Momentum (Latest Quarter)")
+        
+        latest = bank_rolling.iloc[-1]
+        
+        col1, col2, col3, col4, col5 = st.columns(5)
+        
+        with col1:
+            st.metric("QoQ CD Change", f"{latest['cd_change_qoq']:+.2f} pp")
+        
+        with col2:
+            st.metric("YoY CD Change", f"{latest['cd_change_yoy']:+.2f} pp")
+        
+        with col3:
+            st.metric("Loan Growth (YoY)", f"{latest['loan_growth']:.2f}%")
+        
+        with col4:
+            st.metric("Deposit Growth (YoY)", f"{latest['deposit_growth']:.2f}%")
+        
+        with col5:
+            st.metric(
+                "Growth Divergence",
+                f"{latest['growth_divergence']:+.2f} pp",
+                delta=f"{rolling_window}Q Volatility: {latest['rolling_std_cd']:.2f}",
+                delta_color="off"
+            )
+    
+    render_divider()
+    
+    render_subsection_header("🧮 Multi-Bank Overlay & Sector Bands")
+    
+    bands = data["cd_ratio_bands"]
+    band_types = [SECTOR_LABEL] + [t for t in bands.index.get_level_values("type").unique() if t != SECTOR_LABEL]
+    
+    col1, col2 = st.columns([3, 1])
+    
+    with col2:
+        band_type = st.selectbox("Quartile band:", band_types, key="band_type")
+        overlay_band_banks = st.checkbox("Overlay every bank in the band", value=False, key="overlay_band_banks")
+    
+    with col1:
+        overlay_banks = st.multiselect(
+            "Banks to overlay:",
+            options=list(cd_matrix.index),
+            default=[selected_bank],
+            key="overlay_banks",
+            disabled=overlay_band_banks
+        )
+    
+    if overlay_band_banks:
+        trends = data["cd_ratio_trends"]
+        in_band = trends["bank_name"] if band_type == SECTOR_LABEL else trends.loc[trends["type"] == band_type, "bank_name"]
+        overlay_banks = list(in_band.unique())
+    
+    band = bands.loc[band_type].iloc[zoom[0]:zoom[1]]
+    band_x = list(band.index.astype(str))
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scatter(x=band_x, y=band["q75"], mode='lines', line=dict(width=0), showlegend=False,
+                             hoverinfo='skip'))
+    fig.add_trace(go.Scatter(
+        x=band_x,
+        y=band["q25"],
+        mode='lines',
+        fill='tonexty',
+        fillcolor='rgba(212, 175, 55, 0.2)',
+        line=dict(width=0),
+        name=f'{band_type} Interquartile Range'
+    ))
+    fig.add_trace(go.Scatter(
+        x=band_x,
+        y=band["median"],
+        mode='lines',
+        name=f'{band_type} Median',
+        line=dict(color=COLORS["gold"], width=2, dash='dash')
+    ))
+    
+    overlay = cd_matrix.loc[overlay_banks]
+    if len(overlay) > OVERLAY_MAX_SERIES:
+        # Keep an even spread of the selection by latest CD rather than the first N banks
+        order = np.argsort(overlay.iloc[:, -1].to_numpy())
+        overlay = overlay.iloc[order[np.linspace(0, len(order) - 1, OVERLAY_MAX_SERIES).astype(int)]]
+        st.caption(f"Showing {OVERLAY_MAX_SERIES} of {len(overlay_banks)} selected banks, spread evenly by latest CD ratio.")
+    
+    if len(overlay) <= OVERLAY_LEGEND_MAX:
+        for bank_name, values in zip(overlay.index, overlay.to_numpy()):
+            x, y = decimate_series((data_version, bank_name, "cd_ratio"), quarter_labels, values, zoom)
+            fig.add_trace(go.Scattergl(x=x, y=y, mode='lines+markers', name=str(bank_name)))
+    else:
+        # One WebGL trace for every series, each decimated and followed by a NaN gap, instead of a trace per bank
+        xs, ys, names = [], [], []
+        for bank_name, values in zip(overlay.index, overlay.to_numpy()):
+            x, y = decimate_series((data_version, bank_name, "cd_ratio"), quarter_labels, values, zoom,
+                                   DECIMATION_OVERLAY_POINTS)
+            xs += [x, x[-1:]]
+            ys += [y, [np.nan]]
+            names.append(np.repeat(str(bank_name), len(x) + 1))
+        
+        fig.add_trace(go.Scattergl(
+            x=np.concatenate(xs),
+            y=np.concatenate(ys),
+            text=np.concatenate(names),
+            mode='lines',
+            name=f'{len(overlay)} Banks',
+            line=dict(color=COLORS["primary_dark"], width=1),
+            opacity=0.5,
+            hovertemplate='%{text}<br>%{x}: %{y:.2f}%<extra></extra>'
+        ))
+    
+    fig.update_layout(
+        title=f"CD Ratio Overlay vs {band_type} Quartile Band",
+        xaxis_title="Quarter",
+        yaxis_title="CD Ratio (%)",
+        hovermode="x unified" if len(overlay) <= OVERLAY_LEGEND_MAX else "closest",
+        height=500,
+        template="plotly_white"
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
 
 # ═══════════════════════════════════════════════════════════════════════════
 # PAGE 3: BANK-WISE COMPARISON
@@ -407,7 +862,7 @@ elif page_index == 3:
     
     render_divider()
     
-    render_subsection_header("📊 Latest CD Ratios - All Banks")
+    render_subsection_header(f"📊 CD Ratios as of {as_of_quarter} - All Banks")
     
     # Sort by latest CD ratio
     comparison_df = data["bank_wise_comparison"].sort_values("latest_cd", ascending=False)
@@ -415,37 +870,119 @@ elif page_index == 3:
     # Color code based on status
     comparison_df["Status"] = comparison_df["latest_cd"].apply(render_cd_ratio_status)
     
+    # Attach YoY growth metrics for the as-of quarter
+    rolling = get_rolling_metrics(data["panel"])
+    latest_rolling = rolling[rolling["quarter"] == as_of_quarter]
+    comparison_df = comparison_df.merge(
+        latest_rolling[["bank_name", "cd_change_yoy", "loan_growth", "deposit_growth", "growth_divergence"]].round(2),
+        on="bank_name",
+        how="left"
+    )
+    
+    # Flag anomalies from the persisted batch scores (no model runs here)
+    try:
+        anomalies = load_anomaly_flags(data_version, data["panel"])
+    except LookupError:
+        anomalies = pending_anomaly_scores(data["panel"])
+        st.caption("🚩 Anomaly scores are being computed in the background and will appear on a later refresh.")
+    latest_anomalies = anomalies[anomalies["quarter"] == as_of_quarter]
+    comparison_df = comparison_df.merge(
+        latest_anomalies[["bank_name", "is_anomaly", "anomaly_reason"]], on="bank_name", how="left"
+    )
+    comparison_df["Anomaly"] = comparison_df["anomaly_reason"].where(comparison_df["is_anomaly"], "").map(
+        lambda reason: f"🚩 {reason}" if reason else ""
+    )
+    
+    comparison_table = comparison_df[["bank_name", "bank_type", "latest_cd", "cd_change", "cd_change_yoy",
+                                      "loan_growth", "deposit_growth", "growth_divergence", "Anomaly"]].rename(columns={
+        "bank_name": "Bank Name",
+        "bank_type": "Type",
+        "latest_cd": "Latest CD %",
+        "cd_change": "QoQ Change %",
+        "cd_change_yoy": "YoY Change %",
+        "loan_growth": "Loan Growth YoY %",
+        "deposit_growth": "Deposit Growth YoY %",
+        "growth_divergence": "Growth Divergence"
+    })
+    
     st.dataframe(
-        comparison_df[["bank_name", "bank_type", "latest_cd", "cd_change"]].rename(columns={
-            "bank_name": "Bank Name",
-            "bank_type": "Type",
-            "latest_cd": "Latest CD %",
-            "cd_change": "Change from Q2 %"
-        }),
+        comparison_table.style.apply(
+            lambda row: ["background-color: #FDEDEC" if row["Anomaly"] else ""] * len(row), axis=1
+        ).format(precision=2),
         use_container_width=True,
         hide_index=True
     )
     
+    flagged = anomalies[anomalies["is_anomaly"]]
+    if len(flagged) > 0:
+        with st.expander(f"🚩 Flagged bank-quarters across history ({len(flagged)})"):
+            st.dataframe(
+                flagged[["bank_name", "type", "quarter", "max_abs_z", "isolation_score", "anomaly_reason"]].round(2).rename(columns={
+                    "bank_name": "Bank Name",
+                    "type": "Type",
+                    "quarter": "Quarter",
+                    "max_abs_z": "Max |Robust Z|",
+                    "isolation_score": "Isolation Score",
+                    "anomaly_reason": "Reason"
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+    
     render_divider()
     
     render_subsection_header("📈 CD Ratio Distribution")
     
-    # Create distribution chart
-    fig = px.box(
-        data["banks"],
-        x="type",
-        y="latest_cd",
-        color="type",
-        color_discrete_map={
-            "PSB": COLORS["psb_color"],
-            "Private": COLORS["private_color"],
-            "SFB": COLORS["sfb_color"]
-        },
-        title="CD Ratio Distribution by Bank Type",
-        labels={"type": "Bank Type", "latest_cd": "CD Ratio (%)"}
+    # Starts at the sidebar's as-of quarter (keyed by it, so a new as-of resets the slider)
+    quarters = list(data["cd_distribution"].index.get_level_values("quarter").categories)
+    distribution_quarter = st.select_slider(
+        "Quarter:",
+        options=quarters,
+        value=as_of_quarter,
+        key=f"distribution_quarter_{as_of_quarter}"
     )
     
-    fig.update_layout(height=500, template="plotly_white")
+    # Boxes are drawn from the per-quarter statistics precomputed with the dataset
+    distribution = data["cd_distribution"].xs(distribution_quarter, level="quarter")
+    type_colors = {
+        "PSB": COLORS["psb_color"],
+        "Private": COLORS["private_color"],
+        "SFB": COLORS["sfb_color"]
+    }
+    
+    fig = go.Figure()
+    
+    for bank_type, stats in distribution.iterrows():
+        fig.add_trace(go.Box(
+            x=[bank_type],
+            q1=[stats["q1"]],
+            median=[stats["median"]],
+            q3=[stats["q3"]],
+            lowerfence=[stats["lowerfence"]],
+            upperfence=[stats["upperfence"]],
+            mean=[stats["mean"]],
+            name=bank_type,
+            marker_color=type_colors.get(bank_type),
+            boxpoints=False
+        ))
+        
+        if stats["outliers"]:
+            fig.add_trace(go.Scatter(
+                x=[bank_type] * len(stats["outliers"]),
+                y=stats["outliers"],
+                mode='markers',
+                marker=dict(color=type_colors.get(bank_type)),
+                name=f'{bank_type} Outliers',
+                showlegend=False
+            ))
+    
+    fig.update_layout(
+        title=f"CD Ratio Distribution by Bank Type - {distribution_quarter}",
+        xaxis_title="Bank Type",
+        yaxis_title="CD Ratio (%)",
+        height=500,
+        template="plotly_white"
+    )
     st.plotly_chart(fig, use_container_width=True)
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -462,7 +999,7 @@ elif page_index == 4:
     # Filter PSB data
     psb_df = data["banks"][data["banks"]["type"] == "PSB"].sort_values("latest_cd", ascending=False)
     
-    render_subsection_header("📊 PSB CD Ratios (Sorted)")
+    render_subsection_header(f"📊 PSB CD Ratios as of {as_of_quarter} (Sorted)")
     
     st.dataframe(
         psb_df[["bank_name", "latest_cd", "avg_cd", "deposits_cr", "advances_cr"]],
@@ -480,7 +1017,7 @@ elif page_index == 4:
         y="latest_cd",
         color="latest_cd",
         color_continuous_scale="Blues",
-        title="Public Sector Banks - CD Ratio Comparison"
+        title=f"Public Sector Banks - CD Ratio Comparison - {as_of_quarter}"
     )
     
     fig.update_layout(height=500, template="plotly_white", xaxis_tickangle=-45)
@@ -496,7 +1033,7 @@ elif page_index == 5:
     # Filter Private bank data
     private_df = data["banks"][data["banks"]["type"] == "Private"].sort_values("latest_cd", ascending=False)
     
-    render_subsection_header("📊 Private Bank CD Ratios (Sorted)")
+    render_subsection_header(f"📊 Private Bank CD Ratios as of {as_of_quarter} (Sorted)")
     
     st.dataframe(
         private_df[["bank_name", "latest_cd", "avg_cd", "deposits_cr", "advances_cr"]],
@@ -514,7 +1051,7 @@ elif page_index == 5:
         y="latest_cd",
         color="latest_cd",
         color_continuous_scale="Greens",
-        title="Private Banks - CD Ratio Comparison"
+        title=f"Private Banks - CD Ratio Comparison - {as_of_quarter}"
     )
     
     fig.update_layout(height=500, template="plotly_white", xaxis_tickangle=-45)
@@ -530,7 +1067,7 @@ elif page_index == 6:
     # Filter SFB data
     sfb_df = data["banks"][data["banks"]["type"] == "SFB"].sort_values("latest_cd", ascending=False)
     
-    render_subsection_header("📊 SFB CD Ratios (Sorted)")
+    render_subsection_header(f"📊 SFB CD Ratios as of {as_of_quarter} (Sorted)")
     
     st.dataframe(
         sfb_df[["bank_name", "latest_cd", "avg_cd", "deposits_cr", "advances_cr"]],
@@ -548,7 +1085,7 @@ elif page_index == 6:
         y="latest_cd",
         color="latest_cd",
         color_continuous_scale="Oranges",
-        title="Small Finance Banks - CD Ratio Comparison"
+        title=f"Small Finance Banks - CD Ratio Comparison - {as_of_quarter}"
     )
     
     fig.update_layout(height=500, template="plotly_white", xaxis_tickangle=-45)
@@ -1591,8 +2128,158 @@ CD ratio is one of the most important metrics for banking sector investors. Use
 
 But always combine with other metrics (deposit growth, NIM, ROA, asset quality) for a complete picture!
 """)
-
-
+    
+    render_divider()
+    
+    # ===== EARLY-WARNING LEADERBOARD =====
+    st.markdown("### 🚨 Liquidity-Risk Early-Warning Leaderboard")
+    
+    st.markdown(
+        "Composite score (0-100) combining CD level, CD momentum, advance-vs-deposit growth divergence, "
+        "CD volatility and distance to the 85% / 95% thresholds. Higher = greater liquidity risk."
+    )
+    
+    risk_scores = get_risk_scores(data["panel"])
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        risk_quarter = st.selectbox("Quarter:", options=list(risk_scores["quarter"].cat.categories)[::-1],
+                                    key="risk_quarter")
+    
+    with col2:
+        risk_top_n = st.slider("Show top N banks", 5, len(risk_scores["bank_name"].unique()), 10, key="risk_top_n")
+    
+    with col3:
+        risk_order = st.radio("Rank by:", ["Highest risk", "Lowest risk"], horizontal=True, key="risk_order")
+    
+    leaderboard = top_k(risk_scores, risk_top_n, quarter=risk_quarter, largest=risk_order == "Highest risk")
+    
+    st.dataframe(
+        leaderboard[["risk_rank", "bank_name", "type", "cd_ratio", "risk_score", "early_warning"]
+                    + [f"{c}_score" for c in RISK_COMPONENTS]].round(1).rename(columns={
+            "risk_rank": "Rank",
+            "bank_name": "Bank Name",
+            "type": "Type",
+            "cd_ratio": "CD %",
+            "risk_score": "Risk Score",
+            "early_warning": "Signal",
+            **{f"{c}_score": c.title() for c in RISK_COMPONENTS}
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    # CD momentum vs stock returns (prices served from the local market-data cache)
+    st.markdown("---")
+    st.markdown("### 📉 CD Momentum vs Stock Returns")
+    
+    return_lag = st.radio(
+        "Pair QoQ CD change with:",
+        [0, 1],
+        format_func=lambda lag: "Same-quarter return" if lag == 0 else "Next-quarter return",
+        horizontal=True,
+        key="return_lag"
+    )
+    
+    quarter_ends = quarter_end_dates(list(data["panel"]["quarter"].cat.categories))
+    prices = load_market_prices(
+        tuple(data["banks"]["nse_ticker"]),
+        quarter_ends[0] - pd.Timedelta(days=10),
+        quarter_ends[-1]
+    )
+    
+    if prices.empty:
+        render_warning_box(
+            "**Market data unavailable:** no prices could be fetched or replayed. "
+            "Check MARKET_DATA_PROVIDER / MARKET_REPLAY_FILE in your .env."
+        )
+    else:
+        momentum_returns, momentum_corr = momentum_vs_returns(data["panel"], data["banks"], prices, lag=return_lag)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("Pooled Correlation", f"{momentum_corr:+.2f}")
+        
+        with col2:
+            st.metric("Bank-Quarters", len(momentum_returns))
+        
+        fig = px.scatter(
+            momentum_returns,
+            x="cd_change_qoq",
+            y="stock_return",
+            color="type",
+            hover_name="bank_name",
+            hover_data=["quarter"],
+            labels={"cd_change_qoq": "QoQ CD Change (pp)", "stock_return": "Quarterly Return (%)", "type": "Bank Type"}
+        )
+        fig.update_layout(height=450, template="plotly_white")
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Portfolio basket analytics (Phase 3)
+    if ENABLE_PORTFOLIO_ANALYTICS:
+        st.markdown("---")
+        st.markdown("### 💼 Portfolio Basket CD Analytics")
+        
+        st.markdown(
+            "Define weighted baskets by NSE ticker (or unambiguous BSE code). Weights are normalised "
+            "within each basket."
+        )
+        
+        basket_rows = st.data_editor(
+            pd.DataFrame({
+                "basket": ["Large Private"] * 3 + ["Large PSB"] * 3,
+                "ticker": ["HDFCBANK", "ICICIBANK", "AXISBANK", "SBIN", "BANKBARODA", "PNB"],
+                "weight": [40.0, 35.0, 25.0, 50.0, 25.0, 25.0],
+            }),
+            num_rows="dynamic",
+            use_container_width=True,
+            key="portfolio_baskets"
+        ).dropna()
+        
+        basket_names = list(basket_rows["basket"].unique())
+        baskets = [
+            dict(zip(group["ticker"].str.strip().str.upper(), group["weight"]))
+            for _, group in basket_rows.groupby("basket", sort=False)
+        ]
+        
+        try:
+            basket_metrics, basket_paths = get_basket_metrics(data["panel"], data["banks"], baskets)
+        except ValueError as error:
+            st.error(f"❌ {error}")
+        else:
+            basket_metrics.insert(0, "basket", basket_names)
+            
+            st.dataframe(
+                basket_metrics.round(2).rename(columns={
+                    "basket": "Basket",
+                    "weighted_cd": "Weighted CD %",
+                    "weighted_loan_growth": "Loan Growth %",
+                    "weighted_deposit_growth": "Deposit Growth %",
+                    "hhi": "HHI",
+                    "effective_banks": "Effective Banks",
+                    "cd_volatility": "CD Volatility (pp)",
+                    "stressed_cd": "Stressed CD % (99%)"
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+            
+            fig = go.Figure()
+            
+            for name, (_, path) in zip(basket_names, basket_paths.iterrows()):
+                fig.add_trace(go.Scatter(x=list(path.index), y=path.to_numpy(), mode='lines+markers', name=name))
+            
+            fig.update_layout(
+                title="Weighted CD Ratio by Basket",
+                xaxis_title="Quarter",
+                yaxis_title="Weighted CD Ratio (%)",
+                hovermode="x unified",
+                height=400,
+                template="plotly_white"
+            )
+            st.plotly_chart(fig, use_container_width=True)
 
 elif page_index == 9:
     render_section_header("📋 Data Explorer - All Bank Data")
@@ -1622,6 +2309,42 @@ elif page_index == 9:
         file_name="indian_banks_cd_ratio.csv",
         mime="text/csv"
     )
+    
+    render_subsection_header("📈 CD Ratio Trends (Filtered)")
+    
+    trends = data["cd_ratio_trends"]
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        trend_types = st.multiselect(
+            "Bank types:",
+            list(trends["type"].cat.categories),
+            default=list(trends["type"].cat.categories),
+            key="trend_download_types"
+        )
+    
+    with col2:
+        trend_quarters = st.select_slider(
+            "Quarters:",
+            options=list(trends["quarter"].cat.categories),
+            value=(trends["quarter"].cat.categories[0], trends["quarter"].cat.categories[-1]),
+            key="trend_download_quarters"
+        )
+    
+    filtered_trends = trends[
+        trends["type"].isin(trend_types)
+        & (trends["quarter"] >= trend_quarters[0])
+        & (trends["quarter"] <= trend_quarters[1])
+    ]
+    
+    st.caption(f"{filtered_trends['bank_name'].nunique()} banks × {filtered_trends['quarter'].nunique()} quarters")
+    st.download_button(
+        label="📥 Download trends as CSV",
+        data=filtered_trends.to_csv(index=False),
+        file_name="indian_banks_cd_ratio_trends.csv",
+        mime="text/csv",
+        key="trend_download"
+    )
 
 elif page_index == 10:
     render_section_header("🎓 CD Ratio Education & Learning Center")
@@ -2165,6 +2888,499 @@ The Credit-to-Deposit ratio is a critical indicator for bank investors. It revea
 ---
 """)
 
+# ═══════════════════════════════════════════════════════════════════════════
+# PAGE 11: STRESS TESTING
+# ═══════════════════════════════════════════════════════════════════════════
+
+elif page_index == 11:
+    render_section_header("🧪 Stress Testing - Deposit Run-off & Credit Shocks")
+    
+    st.markdown("**How would CD ratios move under deposit outflows and advance growth shocks?**")
+    
+    render_divider()
+    
+    if not ENABLE_STRESS_TESTING:
+        render_info_box("Stress testing is disabled. Set `ENABLE_STRESS_TESTING=true` in your `.env` to enable it.")
+    else:
+        # ===== PRESET SCENARIOS =====
+        render_subsection_header("📋 Preset Scenarios")
+        
+        presets = run_stress_test(data["panel"], preset_scenarios(), keep_matrices=False)["scenarios"]
+        
+        st.dataframe(
+            presets[["scenario", "deposit_shock", "advance_shock", "system_cd",
+                     "banks_above_85", "critical_banks", "low_banks"]].round(2).rename(columns={
+                "scenario": "Scenario",
+                "deposit_shock": "Deposit Shock %",
+                "advance_shock": "Advance Shock %",
+                "system_cd": "System CD %",
+                "banks_above_85": "Banks > 85%",
+                "critical_banks": "Banks > 95%",
+                "low_banks": "Banks < 65%"
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        render_divider()
+        
+        # ===== GRID SWEEP =====
+        render_subsection_header("🗺️ Scenario Grid Sweep")
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            deposit_range = st.slider("Deposit shock range (%)", -40, 10, (-30, 0), key="stress_deposit_range")
+        
+        with col2:
+            advance_range = st.slider("Advance shock range (%)", -30, 30, (-20, 20), key="stress_advance_range")
+        
+        with col3:
+            grid_steps = st.slider("Grid steps per axis", 5, 200, 41, key="stress_grid_steps")
+        
+        deposit_shocks = np.linspace(deposit_range[0], deposit_range[1], grid_steps)
+        advance_shocks = np.linspace(advance_range[0], advance_range[1], grid_steps)
+        sweep = run_stress_test(data["panel"], scenario_grid(deposit_shocks, advance_shocks),
+                                keep_matrices=False)["scenarios"]
+        
+        fig = go.Figure(go.Heatmap(
+            x=advance_shocks,
+            y=deposit_shocks,
+            z=sweep["banks_above_85"].to_numpy().reshape(grid_steps, grid_steps),
+            colorscale="Reds",
+            colorbar=dict(title="Banks > 85%"),
+            hovertemplate="Deposit shock: %{y:.1f}%<br>Advance shock: %{x:.1f}%<br>Banks > 85%: %{z}<extra></extra>"
+        ))
+        
+        fig.update_layout(
+            title=f"Banks Breaching 85% CD Across {len(sweep):,} Scenarios",
+            xaxis_title="Advance Shock (%)",
+            yaxis_title="Deposit Shock (%)",
+            height=500,
+            template="plotly_white"
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+        
+        render_divider()
+        
+        # ===== SINGLE SCENARIO DRILL-DOWN =====
+        render_subsection_header("🔎 Scenario Drill-Down - Bank Level")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            deposit_shock = st.slider("Deposit shock (%)", -40.0, 10.0, -10.0, 0.5, key="stress_deposit_shock")
+        
+        with col2:
+            advance_shock = st.slider("Advance shock (%)", -30.0, 30.0, 5.0, 0.5, key="stress_advance_shock")
+        
+        scenario = pd.DataFrame({"deposit_shock": [deposit_shock], "advance_shock": [advance_shock]})
+        result = run_stress_test(data["panel"], scenario)
+        
+        bank_results = result["banks"][["bank_name", "type", "base_cd"]].copy()
+        bank_results["post_cd"] = result["post_cd"][0]
+        bank_results["cd_impact"] = bank_results["post_cd"] - bank_results["base_cd"]
+        bank_results["status"] = [STATUS_LABELS[code] for code in result["status"][0]]
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("System CD (Post-Shock)", f"{result['scenarios']['system_cd'].iloc[0]:.2f}%")
+        
+        with col2:
+            st.metric("Banks > 85%", int(result["scenarios"]["banks_above_85"].iloc[0]))
+        
+        with col3:
+            st.metric("Banks > 95%", int(result["scenarios"]["critical_banks"].iloc[0]))
+        
+        st.dataframe(
+            bank_results.sort_values("post_cd", ascending=False).round(2).rename(columns={
+                "bank_name": "Bank Name",
+                "type": "Type",
+                "base_cd": "Current CD %",
+                "post_cd": "Post-Shock CD %",
+                "cd_impact": "Impact (pp)",
+                "status": "Post-Shock Status"
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+        
+        render_divider()
+        
+        # ===== MONTE CARLO SIMULATION =====
+        render_subsection_header("🎲 Monte Carlo Liquidity Simulation")
+        
+        st.markdown(
+            f"Simulates correlated quarterly deposit and advance growth paths per bank, "
+            f"with drift and covariance estimated from the quarterly history, and reports the "
+            f"probability of each bank crossing the **{THRESHOLDS[0]}%** and **{THRESHOLDS[1]}%** "
+            f"CD thresholds at any point over the horizon."
+        )
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            mc_paths = st.select_slider("Simulated paths", MONTE_CARLO_PATH_OPTIONS,
+                                        value=MONTE_CARLO_PATHS, key="mc_paths")
+        
+        with col2:
+            mc_horizon = st.slider("Horizon (quarters)", 1, 12, 4, key="mc_horizon")
+        
+        with col3:
+            mc_seed = st.number_input("Random seed", value=MONTE_CARLO_SEED, step=1, key="mc_seed")
+        
+        if st.button("▶️ Run Simulation", key="mc_run"):
+            progress = st.progress(0.0)
+            table = st.empty()
+            
+            for paths_done, mc_result in iter_monte_carlo(data["panel"], n_paths=mc_paths, horizon=mc_horizon,
+                                                          seed=int(mc_seed), max_chunk_bytes=8 * 1024 * 1024):
+                progress.progress(paths_done / mc_paths, text=f"{paths_done:,} / {mc_paths:,} paths")
+                table.dataframe(
+                    mc_result.sort_values(f"prob_above_{THRESHOLDS[0]:g}", ascending=False).round(3).rename(columns={
+                        "bank_name": "Bank Name",
+                        "type": "Type",
+                        "current_cd": "Current CD %",
+                        "expected_cd": "Expected CD %",
+                        "cd_std": "CD Std Dev",
+                        f"prob_above_{THRESHOLDS[0]:g}": f"P(CD > {THRESHOLDS[0]}%)",
+                        f"prob_above_{THRESHOLDS[1]:g}": f"P(CD > {THRESHOLDS[1]}%)"
+                    }),
+                    use_container_width=True,
+                    hide_index=True
+                )
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PAGE 12: SEGMENT DRIVERS
+# ═══════════════════════════════════════════════════════════════════════════
+
+elif page_index == 12:
+    render_section_header("🧩 Segment Drivers - From Total CD to Lending & Deposit Mix")
+    
+    st.markdown("**Which lending segments (retail, corporate, MSME, agri) and deposit types drive CD ratios?**")
+    
+    store = data["store"]
+    ratios = compute_segment_ratios(store)
+    
+    estimated = [group for group, flag in store["provenance"].items() if flag == "Estimated"]
+    if estimated:
+        render_warning_box(
+            "**Estimated breakdowns:** Segment figures are derived from bank-type mix profiles applied to reported "
+            "totals, pending ingestion of bank disclosures. Totals and total CD ratios are reported figures."
+        )
+    
+    render_divider()
+    
+    # ===== SECTOR MIX =====
+    render_subsection_header("🏛️ Advance Mix & CASA by Bank Type (Latest Quarter)")
+    
+    sector_mix = sector_segment_mix(store)
+    
+    st.dataframe(
+        sector_mix.round(2).rename(columns={**{s: f"{SEGMENT_LABELS[s]} %" for s in ADVANCE_SEGMENTS},
+                                            "casa_ratio": "CASA %"}),
+        use_container_width=True
+    )
+    
+    render_divider()
+    
+    # ===== BANK DRILL-DOWN =====
+    render_subsection_header("🔎 Bank Drill-Down")
+    
+    segment_bank = st.selectbox("Choose a bank:", options=store["banks"], key="segment_bank")
+    bank_index = int(np.flatnonzero(store["banks"] == segment_bank)[0])
+    bank_segments = segment_frame(store, ratios, bank_index)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        fig = go.Figure()
+        
+        for segment in ADVANCE_SEGMENTS:
+            fig.add_trace(go.Scatter(
+                x=bank_segments["quarter"],
+                y=bank_segments[f"{segment}_cd"],
+                mode='lines',
+                stackgroup='cd',
+                name=SEGMENT_LABELS[segment]
+            ))
+        
+        fig.update_layout(
+            title=f"{segment_bank} - CD Ratio by Lending Segment",
+            xaxis_title="Quarter",
+            yaxis_title="Contribution to CD Ratio (%)",
+            hovermode="x unified",
+            height=450,
+            template="plotly_white"
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        contributions = segment_cd_contributions(ratios)[bank_index]
+        
+        fig = go.Figure(go.Bar(
+            x=[SEGMENT_LABELS[s] for s in ADVANCE_SEGMENTS],
+            y=contributions,
+            marker_color=[COLORS["positive"] if c >= 0 else COLORS["negative"] for c in contributions]
+        ))
+        
+        fig.update_layout(
+            title=f"Drivers of CD Change ({store['quarters'][0]} → {store['quarters'][-1]}): "
+                  f"{contributions.sum():+.2f} pp",
+            xaxis_title="Lending Segment",
+            yaxis_title="CD Change Contribution (pp)",
+            height=450,
+            template="plotly_white"
+        )
+        
+        st.plotly_chart(fig, use_container_width=True)
+    
+    render_subsection_header("💰 Deposit Mix")
+    
+    fig = go.Figure()
+    
+    for segment in DEPOSIT_SEGMENTS:
+        fig.add_trace(go.Bar(
+            x=bank_segments["quarter"],
+            y=bank_segments[f"{segment}_share"],
+            name=SEGMENT_LABELS[segment]
+        ))
+    
+    fig.add_trace(go.Scatter(
+        x=bank_segments["quarter"],
+        y=bank_segments["casa_ratio"],
+        mode='lines+markers',
+        name='CASA Ratio',
+        line=dict(color=COLORS["primary_dark"], width=3)
+    ))
+    
+    fig.update_layout(
+        barmode='stack',
+        title=f"{segment_bank} - Deposit Mix (%)",
+        xaxis_title="Quarter",
+        yaxis_title="Share of Deposits (%)",
+        height=450,
+        template="plotly_white"
+    )
+    
+    st.plotly_chart(fig, use_container_width=True)
+    
+    st.dataframe(bank_segments.round(2), use_container_width=True, hide_index=True)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PAGE 13: ASSET QUALITY & HEALTH SCREEN
+# ═══════════════════════════════════════════════════════════════════════════
+
+elif page_index == 13:
+    render_section_header("🩺 Asset Quality & Capital - Composite Health Screen")
+    
+    st.markdown("**CD ratio alongside GNPA, NNPA, provision coverage and capital adequacy**")
+    
+    if data["store"]["provenance"].get("asset_quality") == "Estimated":
+        render_warning_box(
+            "**Estimated asset quality:** NPA, provision and CAR series are derived from bank-type profiles "
+            "pending ingestion of bank disclosures. CD ratios are reported figures."
+        )
+    
+    render_divider()
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        npa_threshold = st.slider("GNPA threshold (%)", NPA_THRESHOLD_MIN, NPA_THRESHOLD_MAX, NPA_THRESHOLD, 0.25,
+                                  key="npa_threshold")
+    
+    with col2:
+        health_quarter = st.selectbox("Quarter:", options=data["store"]["quarters"][::-1], key="health_quarter")
+    
+    # The screen is built once per data version; the threshold only re-flags one quarter
+    screen = load_health_screen(data_version, data["store"])
+    quarter_screen = quarter_health(screen, health_quarter, npa_threshold)
+    above_threshold = screen_by_npa(screen, npa_threshold, health_quarter)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        st.metric(f"Banks with GNPA > {npa_threshold:.2f}%", len(above_threshold))
+    
+    with col2:
+        st.metric("🔴 Weak (2+ flags)", int((quarter_screen["flag_count"] >= 2).sum()))
+    
+    with col3:
+        st.metric("Median GNPA", f"{quarter_screen['gnpa_pct'].median():.2f}%")
+    
+    with col4:
+        st.metric("Median CAR", f"{quarter_screen['car'].median():.2f}%")
+    
+    render_divider()
+    
+    render_subsection_header("📊 CD Ratio vs Gross NPA")
+    
+    fig = px.scatter(
+        quarter_screen,
+        x="cd_ratio",
+        y="gnpa_pct",
+        color="type",
+        size="car",
+        hover_name="bank_name",
+        labels={"cd_ratio": "CD Ratio (%)", "gnpa_pct": "Gross NPA (%)", "type": "Bank Type", "car": "CAR (%)"},
+        title=f"CD Ratio vs Asset Quality - {health_quarter}"
+    )
+    fig.add_hline(y=npa_threshold, line_dash="dash", line_color="red", annotation_text="GNPA Threshold")
+    fig.add_vrect(x0=70, x1=85, fillcolor="green", opacity=0.08, line_width=0, annotation_text="CD 70-85%")
+    fig.update_layout(height=500, template="plotly_white")
+    st.plotly_chart(fig, use_container_width=True)
+    
+    render_divider()
+    
+    render_subsection_header("🚩 Health Screen")
+    
+    st.dataframe(
+        quarter_screen.sort_values(["flag_count", "gnpa_pct"], ascending=False)[
+            ["bank_name", "type", "cd_ratio", "gnpa_pct", "nnpa_pct", "pcr", "car", "health_status"]
+            + list(HEALTH_FLAGS)
+        ].round(2).rename(columns={
+            "bank_name": "Bank Name",
+            "type": "Type",
+            "cd_ratio": "CD %",
+            "gnpa_pct": "GNPA %",
+            "nnpa_pct": "NNPA %",
+            "pcr": "PCR %",
+            "car": "CAR %",
+            "health_status": "Health",
+            **HEALTH_FLAGS
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PAGE 14: BEHAVIORAL CLUSTERS
+# ═══════════════════════════════════════════════════════════════════════════
+
+elif page_index == 14:
+    render_section_header("🧭 Behavioral Clusters - Data-Driven Peer Groups")
+    
+    st.markdown("**Banks grouped by CD ratio trajectory, level and growth, compared with official bank types**")
+    
+    render_divider()
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        cluster_method = st.radio(
+            "Clustering method:",
+            list(CLUSTER_METHODS),
+            format_func=CLUSTER_METHODS.get,
+            horizontal=True,
+            key="cluster_method"
+        )
+    
+    with col2:
+        n_clusters = st.slider("Number of clusters:", 2, 8, 4, key="n_clusters")
+    
+    try:
+        clusters = get_clusters(data["panel"], n_clusters=n_clusters, method=cluster_method)
+    except Exception as error:
+        clusters = None
+        st.error(f"❌ Clustering failed ({type(error).__name__}: {error}). Refresh to retry.")
+    else:
+        if clusters is None:
+            render_info_box("⏳ Clusters are being computed in the background for this data version.")
+    
+    if clusters is None:
+        if st.button("🔄 Refresh", key="cluster_refresh"):
+            st.rerun()
+    else:
+        assignments = clusters["assignments"]
+        centroids = clusters["centroids"]
+        quarter_columns = [q for q in data["store"]["quarters"] if q in centroids.columns]
+        
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.metric("Clusters", clusters["n_clusters"])
+        
+        with col2:
+            st.metric("Largest Cluster", f"{int(centroids['banks'].max())} banks")
+        
+        with col3:
+            st.metric(
+                "Agreement with Bank Types",
+                f"{type_agreement(clusters):.2f}",
+                help="Adjusted Rand index: 1 = clusters match official types exactly, ~0 = unrelated"
+            )
+        
+        render_divider()
+        
+        render_subsection_header("📈 Cluster Centroid CD Paths")
+        
+        fig = go.Figure()
+        
+        for cluster, row in centroids.iterrows():
+            fig.add_trace(go.Scatter(
+                x=quarter_columns,
+                y=row[quarter_columns],
+                mode='lines+markers',
+                name=f"Cluster {cluster} ({int(row['banks'])} banks)"
+            ))
+        
+        fig.add_hrect(y0=70, y1=85, fillcolor="green", opacity=0.08, line_width=0)
+        fig.update_layout(
+            xaxis_title="Quarter",
+            yaxis_title="Average CD Ratio (%)",
+            hovermode="x unified",
+            height=450,
+            template="plotly_white"
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+        render_subsection_header("🏷️ Clusters vs Official Bank Types")
+        
+        crosstab = cluster_type_crosstab(clusters)
+        fig = px.imshow(
+            crosstab,
+            text_auto=True,
+            color_continuous_scale="Blues",
+            labels={"x": "Bank Type", "y": "Cluster", "color": "Banks"},
+            aspect="auto"
+        )
+        fig.update_layout(height=400, template="plotly_white")
+        st.plotly_chart(fig, use_container_width=True)
+        
+        st.dataframe(
+            centroids[["banks", "avg_cd", "total_advances", "loan_growth", "deposit_growth"]].round(2).rename(columns={
+                "banks": "Banks",
+                "avg_cd": "Avg CD %",
+                "total_advances": "Total Advances (₹ Cr)",
+                "loan_growth": "Loan Growth % (ann.)",
+                "deposit_growth": "Deposit Growth % (ann.)"
+            }),
+            use_container_width=True
+        )
+        
+        render_divider()
+        
+        render_subsection_header("🔎 Cluster Members")
+        
+        selected_cluster = st.selectbox("Cluster:", options=list(centroids.index), key="selected_cluster")
+        members = assignments[assignments["cluster"] == selected_cluster].merge(
+            data["banks"][["bank_name", "latest_cd"]], on="bank_name", how="left"
+        )
+        
+        st.dataframe(
+            members.sort_values("latest_cd", ascending=False)[["bank_name", "type", "latest_cd"]].rename(columns={
+                "bank_name": "Bank Name",
+                "type": "Official Type",
+                "latest_cd": "Latest CD %"
+            }).round(2),
+            use_container_width=True,
+            hide_index=True
+        )
+
 # ═══════════════════════════════════════════════════════════════════════════
 # FOOTER
 # ═══════════════════════════════════════════════════════════════════════════
@@ -0,0 +1,120 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Stress Testing Engine - Deposit Run-off & Credit Shock Scenarios
+"""
+
+import numpy as np
+import pandas as pd
+
+from analytics import STATUS_ORDER, classify_cd_status
+from data import LATEST_QUARTER
+
+# Cap on scenario × bank cells materialised per batch (~5 bytes per cell)
+MAX_BATCH_CELLS = 2_000_000
+
+PRESET_SCENARIOS = {
+    "Baseline": (0.0, 0.0),
+    "Mild Deposit Run-off": (-5.0, 0.0),
+    "Severe Deposit Run-off": (-15.0, 0.0),
+    "Credit Boom": (0.0, 10.0),
+    "Credit Crunch": (0.0, -10.0),
+    "Run-off + Credit Boom": (-10.0, 10.0),
+    "Systemic Stress": (-20.0, -5.0),
+}
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SCENARIOS
+# ═══════════════════════════════════════════════════════════════════════════
+
+def scenario_grid(deposit_shocks, advance_shocks):
+    """Every combination of deposit and advance shocks (in %) as a scenario table"""
+    deposit, advance = np.meshgrid(np.asarray(deposit_shocks, dtype=float),
+                                   np.asarray(advance_shocks, dtype=float), indexing="ij")
+    return pd.DataFrame({"deposit_shock": deposit.ravel(), "advance_shock": advance.ravel()})
+
+def preset_scenarios():
+    """Named preset scenarios as a scenario table"""
+    return pd.DataFrame(
+        [(name, deposit, advance) for name, (deposit, advance) in PRESET_SCENARIOS.items()],
+        columns=["scenario", "deposit_shock", "advance_shock"],
+    )
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ENGINE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _latest_balances(panel, quarter):
+    """Deposits and advances per bank for the base quarter"""
+    base = panel.loc[panel["quarter"] == quarter, ["bank_name", "type", "deposits", "advances"]]
+    return base.reset_index(drop=True)
+
+def apply_shocks(deposits, advances, deposit_shocks, advance_shocks):
+    """
+    Post-shock CD ratios for scenarios × banks by broadcasting
+
+    deposits/advances have shape (banks,), shocks have shape (scenarios,)
+    and are % changes. Returns a (scenarios, banks) float32 array.
+    """
+    deposit_factor = 1 + np.asarray(deposit_shocks, dtype=np.float32)[:, None] / 100
+    advance_factor = 1 + np.asarray(advance_shocks, dtype=np.float32)[:, None] / 100
+    base_cd = (np.asarray(advances, dtype=np.float32) / np.asarray(deposits, dtype=np.float32)) * 100
+    return base_cd[None, :] * (advance_factor / deposit_factor)
+
+def iter_stress_batches(panel, scenarios, quarter=LATEST_QUARTER, max_cells=MAX_BATCH_CELLS):
+    """
+    Yield (scenario_slice, post_cd, status) batches sized so that
+    scenarios × banks never exceeds max_cells
+    """
+    base = _latest_balances(panel, quarter)
+    batch_size = max(1, max_cells // max(len(base), 1))
+
+    for start in range(0, len(scenarios), batch_size):
+        batch = scenarios.iloc[start:start + batch_size]
+        post_cd = apply_shocks(base["deposits"], base["advances"],
+                               batch["deposit_shock"], batch["advance_shock"])
+        yield batch, post_cd, classify_cd_status(post_cd)
+
+def run_stress_test(panel, scenarios, quarter=LATEST_QUARTER, max_cells=MAX_BATCH_CELLS,
+                    keep_matrices=True):
+    """
+    Run every scenario against every bank
+
+    Returns a dict with:
+      banks        - base-quarter bank table (bank_name, type, deposits, advances, base_cd)
+      scenarios    - scenario table with per-status bank counts and system CD
+      post_cd      - (scenarios, banks) post-shock CD ratios (None if keep_matrices=False)
+      status       - (scenarios, banks) STATUS_ORDER codes (None if keep_matrices=False)
+
+    Large grid sweeps should pass keep_matrices=False so that only the
+    per-scenario summary is retained and memory stays bounded by max_cells.
+    """
+    base = _latest_balances(panel, quarter)
+    base["base_cd"] = base["advances"] / base["deposits"] * 100
+
+    summaries, cd_batches, status_batches = [], [], []
+    for batch, post_cd, status in iter_stress_batches(panel, scenarios, quarter, max_cells):
+        summaries.append(summarize_scenarios(base, batch, status))
+        if keep_matrices:
+            cd_batches.append(post_cd)
+            status_batches.append(status)
+
+    return {
+        "banks": base,
+        "scenarios": pd.concat(summaries, ignore_index=True) if summaries else scenarios.copy(),
+        "post_cd": np.vstack(cd_batches) if keep_matrices and cd_batches else None,
+        "status": np.vstack(status_batches) if keep_matrices and status_batches else None,
+    }
+
+def summarize_scenarios(base, scenarios, status):
+    """Per-scenario bank counts by status bucket and post-shock system CD"""
+    summary = scenarios.reset_index(drop=True).copy()
+
+    for code, name in enumerate(STATUS_ORDER):
+        summary[f"{name}_banks"] = (status == code).sum(axis=1)
+
+    total_advances = base["advances"].sum() * (1 + summary["advance_shock"] / 100)
+    total_deposits = base["deposits"].sum() * (1 + summary["deposit_shock"] / 100)
+    summary["system_cd"] = total_advances / total_deposits * 100
+    summary["banks_above_85"] = summary["high_banks"] + summary["critical_banks"]
+
+    return summary
@@ -0,0 +1,14 @@
+import numpy as np
+
+from analytics import STATUS_ORDER, classify_cd_status
+
+def _statuses(values):
+    return [STATUS_ORDER[code] for code in np.ravel(classify_cd_status(values))]
+
+def test_benchmark_edges():
+    assert _statuses([60, 65, 70, 78, 85, 85.1, 95, 95.1]) == [
+        "low", "moderate", "healthy", "excellent", "excellent", "high", "high", "critical"]
+
+def test_missing_ratio_is_not_classified():
+    assert _statuses([np.nan, np.inf, 80]) == ["na", "critical", "excellent"]
+    assert classify_cd_status(np.full((2, 3), np.nan)).shape == (2, 3)
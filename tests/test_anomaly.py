@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+import anomaly
+from data import build_panel, get_bank_cd_ratio_data
+
+@pytest.fixture
+def panel(tmp_path, monkeypatch):
+    monkeypatch.setattr(anomaly, "CACHE_DIR", str(tmp_path))
+    return build_panel(get_bank_cd_ratio_data())
+
+def test_missing_scores_are_pending_not_computed(panel, monkeypatch):
+    monkeypatch.setattr(anomaly, "score_anomalies", lambda *args, **kwargs: pytest.fail("scored on read"))
+    assert anomaly.load_anomaly_scores(panel) is None
+    pending = anomaly.pending_anomaly_scores(panel)
+    assert len(pending) == len(panel) and not pending["is_anomaly"].any()
+
+def test_batch_persists_atomically(panel):
+    scores = anomaly.run_anomaly_batch(panel, max_workers=1)
+    path = anomaly.anomaly_path(panel)
+    assert os.listdir(os.path.dirname(path)) == [os.path.basename(path)]
+    loaded = anomaly.load_anomaly_scores(panel)
+    assert loaded["is_anomaly"].tolist() == scores["is_anomaly"].tolist()
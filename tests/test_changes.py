@@ -0,0 +1,93 @@
+import copy
+
+import numpy as np
+import pytest
+
+import peers
+from changes import BALANCE_COLUMNS, diff_balances, get_version_changes, load_balances
+from data import build_panel, get_bank_cd_ratio_data
+from versions import save_version, split_columns
+
+SBI = "State Bank of India"
+
+def split_balances(bank_data):
+    return split_columns(bank_data)["balances"].reindex(columns=BALANCE_COLUMNS)
+
+@pytest.fixture
+def revised(tmp_path):
+    """The built-in data snapshotted, and a revision of one SBI quarter"""
+    base = get_bank_cd_ratio_data()
+    revision = copy.deepcopy(base)
+    revision[SBI]["q2_fy25_advances"] = revision[SBI]["q2_fy25_deposits"] * 0.9
+    return base, revision, save_version(base, tmp_path), save_version(revision, tmp_path), tmp_path
+
+def test_diff_finds_the_revised_cell(revised):
+    base, revision, v1, v2, root = revised
+    changes = get_version_changes(v1, v2, root)
+    assert changes["cells"][["bank_name", "quarter", "measure"]].values.tolist() == [[SBI, "Q2 FY25", "advances"]]
+    assert changes["changed_banks"] == [SBI]
+    assert changes["changed_quarters"] == ["Q2 FY25"]
+    assert changes["status_changes"]["new_cd"].round(1).tolist() == [90.0]
+    assert list(changes["sector"].index) == ["Q2 FY25"]
+
+def test_identical_versions_have_no_changes(revised):
+    _, _, v1, _, root = revised
+    changes = diff_balances(load_balances(v1, root), load_balances(v1, root))
+    assert changes["cells"].empty and changes["changed_banks"] == []
+
+def test_added_and_removed_banks():
+    old = load_balances(None)
+    new = old.drop(index=SBI)
+    changes = diff_balances(old, new)
+    assert changes["banks_removed"] == [SBI]
+    assert len(changes["changed_quarters"]) == len(old.columns) // 2
+
+def test_peer_index_update_matches_full_build(revised):
+    base, revision, *_ = revised
+    old_panel, new_panel = build_panel(base), build_panel(revision)
+    previous = peers.build_peer_index(old_panel)
+    updated = peers.update_peer_index(previous, new_panel, [SBI])
+    rebuilt = peers.build_peer_index(new_panel)
+    for field in ("sum", "sum_sq", "cross", "corr", "features"):
+        np.testing.assert_allclose(updated[field], rebuilt[field])
+    assert not np.allclose(previous["cross"], updated["cross"])
+
+def test_carry_needs_a_cached_index(revised, monkeypatch):
+    base, revision, *_ = revised
+    monkeypatch.setattr(peers, "_index_cache", {})
+    old_panel, new_panel = build_panel(base), build_panel(revision)
+    assert not peers.carry_peer_index(old_panel, new_panel, [SBI])
+    peers.get_peer_index(old_panel)
+    assert peers.carry_peer_index(old_panel, new_panel, [SBI])
+    assert peers.panel_fingerprint(new_panel) in peers._index_cache
+
+def test_swapped_values_are_detected():
+    old = load_balances(None)
+    within_bank = old.copy()
+    within_bank.loc[SBI, ["q2_fy25_deposits", "q2_fy25_advances"]] = old.loc[SBI, ["q2_fy25_advances", "q2_fy25_deposits"]].to_numpy()
+    across_banks = old.copy()
+    other = old.index[1]
+    across_banks.loc[[SBI, other], "q1_fy25_deposits"] = old.loc[[other, SBI], "q1_fy25_deposits"].to_numpy()
+
+    changes = diff_balances(old, within_bank)
+    assert changes["changed_banks"] == [SBI] and changes["changed_quarters"] == ["Q2 FY25"]
+    assert len(changes["cells"]) == 2
+
+    changes = diff_balances(old, across_banks)
+    assert changes["changed_banks"] == sorted([SBI, other]) and changes["changed_quarters"] == ["Q1 FY25"]
+    assert len(changes["cells"]) == 2
+
+def test_carried_peer_index_after_a_swap_matches_a_rebuild(monkeypatch):
+    base = get_bank_cd_ratio_data()
+    swapped = copy.deepcopy(base)
+    other = list(base)[1]
+    swapped[SBI]["q1_fy25_advances"], swapped[other]["q1_fy25_advances"] = (
+        base[other]["q1_fy25_advances"], base[SBI]["q1_fy25_advances"])
+    changes = diff_balances(split_balances(base), split_balances(swapped))
+
+    monkeypatch.setattr(peers, "_index_cache", {})
+    old_panel, new_panel = build_panel(base), build_panel(swapped)
+    peers.get_peer_index(old_panel)
+    assert peers.carry_peer_index(old_panel, new_panel, changes["changed_banks"])
+    carried = peers._index_cache[peers.panel_fingerprint(new_panel)]
+    np.testing.assert_allclose(carried["corr"], peers.build_peer_index(new_panel)["corr"])
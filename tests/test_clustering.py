@@ -0,0 +1,37 @@
+import pytest
+
+import clustering
+from clustering import CLUSTER_METHODS, cluster_banks, get_clusters
+from data import build_panel, get_bank_cd_ratio_data
+
+@pytest.fixture(scope="module")
+def panel():
+    return build_panel(get_bank_cd_ratio_data())
+
+@pytest.mark.parametrize("method", list(CLUSTER_METHODS))
+def test_known_methods(panel, method):
+    clusters = cluster_banks(panel, n_clusters=3, method=method)
+    assert clusters["assignments"]["cluster"].nunique() == 3
+
+def test_unknown_method_is_rejected(panel):
+    with pytest.raises(ValueError):
+        cluster_banks(panel, method="dbscan")
+    with pytest.raises(ValueError):
+        get_clusters(panel, method="dbscan")
+
+def test_failed_run_is_reported_then_retried(panel, monkeypatch):
+    attempts = []
+
+    def flaky(panel, n_clusters, method):
+        attempts.append(method)
+        if len(attempts) == 1:
+            raise RuntimeError("did not converge")
+        return "clusters"
+    monkeypatch.setattr(clustering, "cluster_banks", flaky)
+    monkeypatch.setattr(clustering, "_cluster_cache", {})
+
+    with pytest.raises(RuntimeError):
+        get_clusters(panel, n_clusters=5, wait=True)
+    assert not clustering._pending
+    assert get_clusters(panel, n_clusters=5, wait=True) == "clusters"
+    assert len(attempts) == 2
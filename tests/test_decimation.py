@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from decimation import box_stats, lttb_indices
+
+def test_short_series_kept_whole():
+    assert lttb_indices(np.arange(10.0), 20).tolist() == list(range(10))
+
+def test_keeps_endpoints_and_budget():
+    y = np.sin(np.linspace(0, 20, 5000))
+    keep = lttb_indices(y, 100)
+    assert len(keep) == 100 and keep[0] == 0 and keep[-1] == 4999
+    assert np.all(np.diff(keep) > 0)
+
+def test_keeps_a_spike():
+    y = np.zeros(1000)
+    y[437] = 50
+    assert 437 in lttb_indices(y, 20)
+
+def test_nan_points_never_picked():
+    y = np.sin(np.linspace(0, 6, 100))
+    y[10:40] = np.nan
+    y[[0, 99]] = np.nan
+    keep = lttb_indices(y, 10)
+    assert len(keep) == 10
+    assert np.isfinite(y[keep]).all()
+    assert keep[0] == 1 and keep[-1] == 98
+
+def test_all_nan():
+    assert len(lttb_indices(np.full(50, np.nan), 10)) == 0
+
+def test_box_stats_match_tukey():
+    values = pd.Series([1.0, 2, 3, 4, 5, 6, 7, 8, 100])
+    stats = box_stats(values, pd.Series(["a"] * 9, name="group")).loc["a"]
+    assert (stats["q1"], stats["median"], stats["q3"]) == (3, 5, 7)
+    assert (stats["lowerfence"], stats["upperfence"]) == (1, 8)
+    assert stats["outliers"] == [100]
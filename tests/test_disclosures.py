@@ -0,0 +1,81 @@
+import queue
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import disclosures
+
+def _fake_parse(path):
+    """Stand-in for pdfplumber: the file body says how long to take"""
+    with open(path) as handle:
+        seconds = float(handle.read())
+    time.sleep(seconds)
+    return [{"deposits": 100.0, "advances": 80.0, "quarter": "q3_fy25"}]
+
+@pytest.fixture
+def reports(tmp_path, monkeypatch):
+    monkeypatch.setattr(disclosures, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(disclosures, "parse_pdf", _fake_parse)
+    folder = tmp_path / "reports"
+    folder.mkdir()
+
+    def write(name, seconds):
+        # Padded with the name so every file has its own content hash
+        (folder / name).write_text(f"{seconds}{' ' * len(name)}")
+    return folder, write
+
+def test_timeout_is_per_file(reports):
+    folder, write = reports
+    for ticker in ("SBIN", "HDFCBANK", "ICICIBANK"):
+        write(f"{ticker}_Q3FY25.pdf", 0.6)
+
+    records, report = disclosures.extract_reports(str(folder), max_workers=1, timeout=1.5)
+
+    assert [row["status"] for row in report] == ["parsed"] * 3
+    assert len(records) == 3
+
+def test_hung_file_is_killed(reports):
+    folder, write = reports
+    write("SBIN_Q3FY25.pdf", 60)
+    write("HDFCBANK_Q3FY25.pdf", 0.1)
+
+    started = time.monotonic()
+    _, report = disclosures.extract_reports(str(folder), max_workers=1, timeout=1)
+
+    assert {row["file"]: row["status"] for row in report} == {
+        "HDFCBANK_Q3FY25.pdf": "parsed", "SBIN_Q3FY25.pdf": "timeout"}
+    assert time.monotonic() - started < 10
+
+def test_parsed_files_are_cached(reports):
+    folder, write = reports
+    write("SBIN_Q3FY25.pdf", 0)
+    disclosures.extract_reports(str(folder), max_workers=1, timeout=5)
+    _, report = disclosures.extract_reports(str(folder), max_workers=1, timeout=5)
+    assert report[0]["status"] == "cached"
+
+class _LateProcess:
+    """Process stand-in that never finishes but reports a result as it is killed"""
+    def __init__(self, target, args, daemon):
+        self.path, _, self.results = args
+        self.exitcode = None
+
+    def start(self):
+        pass
+
+    def is_alive(self):
+        return True
+
+    def terminate(self):
+        self.results.put((self.path, "parsed", []))
+
+    def join(self):
+        pass
+
+def test_late_result_keeps_the_timeout(monkeypatch):
+    monkeypatch.setattr(disclosures, "multiprocessing", SimpleNamespace(Queue=queue.Queue, Process=_LateProcess))
+    paths = ["SBIN_Q3FY25.pdf", "HDFCBANK_Q3FY25.pdf"]
+
+    results = disclosures._parse_files(paths, dict.fromkeys(paths), max_workers=1, timeout=0)
+
+    assert results == dict.fromkeys(paths, ("timeout", None))
@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+import forecasting
+
+def test_failed_fit_is_reported_then_retried(monkeypatch):
+    attempts = []
+
+    def flaky(panel, method, horizon):
+        attempts.append(method)
+        if len(attempts) == 1:
+            raise RuntimeError("fit diverged")
+        return "forecasts"
+    monkeypatch.setattr(forecasting, "forecast_all_banks", flaky)
+    monkeypatch.setattr(forecasting, "_forecast_cache", {})
+    panel = pd.DataFrame({"bank_name": ["A"], "deposits": [1.0]})
+
+    with pytest.raises(RuntimeError):
+        forecasting.get_forecasts(panel, wait=True)
+    assert not forecasting._pending
+    assert forecasting.get_forecasts(panel, wait=True) == "forecasts"
+    assert len(attempts) == 2
@@ -0,0 +1,16 @@
+import numpy as np
+
+from data import build_panel_store, get_bank_cd_ratio_data
+from health import HEALTH_STATUS, build_health_screen, quarter_health, screen_by_npa
+
+def test_threshold_applied_per_query():
+    screen = build_health_screen(build_panel_store(get_bank_cd_ratio_data()))
+    assert "npa_flag" not in screen["table"]
+    quarter = list(screen["quarter_bounds"])[-1]
+
+    for threshold in (0.5, 2.5, 10.0):
+        rows = quarter_health(screen, quarter, threshold)
+        assert rows["npa_flag"].sum() == len(screen_by_npa(screen, threshold, quarter))
+        np.testing.assert_array_equal(rows["npa_flag"], rows["gnpa_pct"] > threshold)
+        assert set(rows["health_status"]) <= set(HEALTH_STATUS)
+    assert "npa_flag" not in screen["table"]
@@ -0,0 +1,50 @@
+import pytest
+
+from data import get_bank_cd_ratio_data
+from ingest import ingest_folder, merge_bank_data, read_bank_csv, read_bank_workbook
+
+SBI, HDFC = "State Bank of India", "HDFC Bank"
+
+def test_csv_updates_only_supplied_quarters(tmp_path):
+    path = tmp_path / "revisions.csv"
+    path.write_text("bank_name,q3_fy25_deposits,q3_fy25_advances\nState Bank of India,4300000,\n")
+    records = read_bank_csv(path)
+    assert records == {SBI: {"q3_fy25_deposits": 4300000, "q3_fy25_source": "csv:revisions.csv"}}
+
+def test_csv_requires_bank_name(tmp_path):
+    path = tmp_path / "bad.csv"
+    path.write_text("name,q3_fy25_deposits\nX,1\n")
+    with pytest.raises(ValueError):
+        read_bank_csv(path)
+
+def test_workbook_table_with_unit_and_quarter(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Bank-wise deposits and advances for the quarter ended 31st December 2024"])
+    sheet.append(["(₹ in lakh)"])
+    sheet.append([])
+    sheet.append(["Sr. No.", "Name of the Bank", "Total Deposits", "Total Advances"])
+    sheet.append([1, "State Bank of India Ltd.", 430000000, "3,20,000,00"])
+    sheet.append([2, "Unknown Co-operative Bank", 1000, 900])
+    sheet.append([3, "HDFC Bank Limited", "-", 192000000])
+    path = tmp_path / "rbi.xlsx"
+    workbook.save(path)
+
+    records = read_bank_workbook(str(path))
+    assert records[SBI]["q3_fy25_deposits"] == 4300000
+    assert records[SBI]["q3_fy25_advances"] == 320000
+    assert records[HDFC] == {"q3_fy25_advances": 1920000, "q3_fy25_source": "xlsx:rbi.xlsx"}
+    assert len(records) == 2
+
+def test_folder_and_merge(tmp_path):
+    (tmp_path / "a.csv").write_text("bank_name,q3_fy25_deposits\nState Bank of India,1\n")
+    (tmp_path / "b.csv").write_text("bank_name,q3_fy25_deposits\nState Bank of India,2\n")
+    (tmp_path / "~$b.xlsx").write_text("lock file")
+    updates = ingest_folder(str(tmp_path))
+    assert updates[SBI]["q3_fy25_deposits"] == 2
+
+    base = get_bank_cd_ratio_data()
+    merged = merge_bank_data(base, {**updates, "Partial New Bank": {"type": "SFB"}})
+    assert merged[SBI]["q3_fy25_deposits"] == 2 and base[SBI]["q3_fy25_deposits"] != 2
+    assert "Partial New Bank" not in merged
@@ -0,0 +1,27 @@
+import pytest
+
+import peers
+from data import build_panel, get_bank_cd_ratio_data
+
+SBI = "State Bank of India"
+
+@pytest.fixture(scope="module")
+def panel():
+    return build_panel(get_bank_cd_ratio_data())
+
+def test_dense_and_nearest_neighbour_paths_agree(panel, monkeypatch):
+    dense = peers.query_peers(peers.build_peer_index(panel), SBI, k=5)
+    monkeypatch.setattr(peers, "DENSE_MATRIX_MAX_BANKS", 0)
+    sparse_index = peers.build_peer_index(panel)
+    assert sparse_index["corr"] is None
+    sparse = peers.query_peers(sparse_index, SBI, k=5)
+
+    assert list(dense["bank_name"]) == list(sparse["bank_name"])
+    assert dense["distance"].to_numpy() == pytest.approx(sparse["distance"].to_numpy())
+    assert dense["correlation"].to_numpy() == pytest.approx(sparse["correlation"].to_numpy())
+
+@pytest.mark.parametrize("metric", list(peers.PEER_METRICS))
+def test_queries_exclude_the_bank_and_sort_by_distance(panel, metric):
+    result = peers.get_peers(panel, SBI, k=4, metric=metric)
+    assert len(result) == 4 and SBI not in set(result["bank_name"])
+    assert result["distance"].is_monotonic_increasing
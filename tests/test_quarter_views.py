@@ -0,0 +1,33 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from cachetools import LRUCache
+
+from data import LATEST_QUARTER, QUARTER_LABELS, generate_data, get_quarter_view
+
+def test_latest_view_is_the_dataset():
+    data = generate_data()
+    view = get_quarter_view(data, LATEST_QUARTER)
+    assert view["banks"] is data["banks"]
+    assert view["as_of_quarter"] == LATEST_QUARTER
+
+def test_views_repoint_quarter_dependent_entries():
+    data = generate_data()
+    view = get_quarter_view(data, "Q1 FY24")
+    sbi = view["banks"].set_index("bank_name").loc["State Bank of India"]
+    assert sbi["latest_cd"] == sbi["q1_fy24_cd"] == sbi["avg_cd"]
+    assert view["bank_wise_comparison"]["prev_cd"].isna().all()
+    assert view["metrics"]["sector_weighted_cd"] != data["metrics"]["sector_weighted_cd"]
+
+def test_concurrent_views_with_a_small_cache():
+    data = generate_data()
+    data["quarter_views"] = LRUCache(maxsize=2)
+    expected = {quarter: get_quarter_view(data, quarter)["metrics"] for quarter in QUARTER_LABELS}
+
+    def scrub(offset):
+        for i in range(50):
+            quarter = QUARTER_LABELS[(i + offset) % len(QUARTER_LABELS)]
+            assert get_quarter_view(data, quarter)["metrics"] == expected[quarter]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(scrub, range(8)))
+    assert len(data["quarter_views"]) <= 2
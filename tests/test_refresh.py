@@ -0,0 +1,91 @@
+import copy
+from datetime import datetime
+
+import pytest
+
+import peers
+from data import build_panel, get_bank_cd_ratio_data
+from refresh import RefreshService
+from versions import current_version, version_history
+
+SBI = "State Bank of India"
+
+class Clock:
+    def __init__(self, when):
+        self.now = when.timestamp()
+
+    def __call__(self):
+        return self.now
+
+def _service(tmp_path, ingest=get_bank_cd_ratio_data, warmups=(), clock=None, **kwargs):
+    return RefreshService(ingest=ingest, warmups=warmups, clock=clock or Clock(datetime(2025, 1, 10, 9)),
+                          interval_hours=24, rbi_day=15, root=tmp_path, **kwargs)
+
+def test_due_on_interval_and_rbi_day(tmp_path):
+    clock = Clock(datetime(2025, 1, 14, 9))
+    service = _service(tmp_path, clock=clock)
+    assert service.due()
+    service.run_pipeline()
+    assert not service.due()
+
+    clock.now = datetime(2025, 1, 15, 0, 5).timestamp()    # RBI publication day, before the interval ends
+    assert service.due()
+    service.run_pipeline()
+    clock.now = datetime(2025, 1, 15, 23).timestamp()
+    assert not service.due()
+    clock.now = datetime(2025, 1, 16, 0, 6).timestamp()
+    assert service.due()
+
+def test_run_pending_uses_the_clock(tmp_path):
+    clock = Clock(datetime(2025, 1, 10, 9))
+    service = _service(tmp_path, clock=clock)
+    assert service.run_pending()["version"] is not None
+    clock.now += 3600
+    assert service.run_pending() is None
+    clock.now += 24 * 3600
+    assert service.run_pending() is not None
+
+def test_warmup_runs_before_the_swap(tmp_path):
+    seen = []
+    service = _service(tmp_path, warmups=[lambda version, data: seen.append(current_version(tmp_path))])
+    report = service.run_pipeline()
+    assert report["error"] is None and report["changed"]
+    assert seen == [None] and current_version(tmp_path) == report["version"]
+    assert list(report["stages"]) == ["ingest", "validate", "recompute", "snapshot", "warmup", "swap"]
+
+    # Same data again: nothing to warm or swap
+    again = service.run_pipeline()
+    assert not again["changed"] and len(version_history(tmp_path)) == 1
+
+def test_failed_stage_keeps_the_current_version(tmp_path):
+    service = _service(tmp_path)
+    first = service.run_pipeline()["version"]
+
+    def broken(version, data):
+        raise RuntimeError("warmup failed")
+    revised = copy.deepcopy(get_bank_cd_ratio_data())
+    revised[SBI]["q3_fy25_advances"] += 1000
+    failing = _service(tmp_path, ingest=lambda: revised, warmups=[broken])
+    report = failing.run_pipeline()
+    assert report["error"] == "RuntimeError: warmup failed"
+    assert current_version(tmp_path) == first
+
+def test_revision_reports_changes_and_carries_the_peer_index(tmp_path):
+    base = get_bank_cd_ratio_data()
+    _service(tmp_path).run_pipeline()
+    peers.get_peer_index(build_panel(base))
+
+    revised = copy.deepcopy(base)
+    revised[SBI]["q3_fy25_advances"] += 1000
+    report = _service(tmp_path, ingest=lambda: revised).run_pipeline()
+    assert report["changes"]["banks_changed"] == 1
+    assert report["changes"]["quarters_changed"] == ["Q3 FY25"]
+    assert report["carried_forward"]
+    assert peers.panel_fingerprint(build_panel(revised)) in peers._index_cache
+
+def test_overlapping_runs_are_skipped(tmp_path):
+    service = _service(tmp_path)
+    inner = []
+    service.warmups = [lambda version, data: inner.append(service.run_pipeline())]
+    service.run_pipeline()
+    assert inner == [None]
@@ -0,0 +1,18 @@
+import tracemalloc
+
+from data import build_panel, get_bank_cd_ratio_data
+from simulation import _chunk_plan, estimate_shock_model, simulate_chunk
+
+def test_chunk_peak_memory_stays_under_the_cap():
+    model = estimate_shock_model(build_panel(get_bank_cd_ratio_data()))
+    cap = 8 * 1024 * 1024
+    plan = _chunk_plan(100_000, len(model["banks"]), 4, 0, cap)
+    assert sum(size for size, _ in plan) == 100_000 and len(plan) > 1
+
+    tracemalloc.start()
+    try:
+        simulate_chunk(model, plan[0][0], 4, plan[0][1])
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak <= cap
@@ -0,0 +1,59 @@
+import copy
+
+import pytest
+
+from data import get_bank_cd_ratio_data
+from validation import QUARANTINE_COLUMNS, validate_bank_data
+
+SBI, HDFC, ICICI = "State Bank of India", "HDFC Bank", "ICICI Bank"
+
+@pytest.fixture
+def bank_data():
+    return copy.deepcopy(get_bank_cd_ratio_data())
+
+def _rules(quarantine, bank):
+    return set(quarantine.loc[quarantine["bank_name"] == bank, "rule"])
+
+def test_built_in_data_publishes_every_bank(bank_data):
+    # The built-in master data repeats a few BSE codes; only those fields are cleared
+    clean, quarantine, summary = validate_bank_data(bank_data)
+    assert list(clean) == list(bank_data)
+    assert list(quarantine.columns) == QUARANTINE_COLUMNS
+    assert set(quarantine["rule"]) <= {"duplicate bse_ticker"}
+    assert summary["banks_quarantined"] == 0
+
+@pytest.mark.parametrize("field, value, rule", [
+    ("q3_fy25_deposits", 0, "non-positive deposits"),
+    ("q3_fy25_advances", -5, "negative advances"),
+    ("q3_fy25_advances", "n/a", "missing value"),
+    ("q3_fy25_advances", 4200000 * 3, "CD ratio out of bounds"),
+])
+def test_balance_rules_quarantine_the_bank(bank_data, field, value, rule):
+    bank_data[SBI][field] = value
+    clean, quarantine, summary = validate_bank_data(bank_data)
+    assert rule in _rules(quarantine, SBI)
+    assert SBI not in clean and HDFC in clean
+    assert summary["banks_quarantined"] == 1
+
+def test_qoq_jump_flags_the_later_quarter(bank_data):
+    bank_data[SBI]["q2_fy25_deposits"] *= 3
+    bank_data[SBI]["q2_fy25_advances"] *= 3
+    _, quarantine, _ = validate_bank_data(bank_data)
+    jumps = quarantine[(quarantine["bank_name"] == SBI) & (quarantine["rule"] == "QoQ deposit jump")]
+    assert list(jumps["quarter"]) == ["Q2 FY25", "Q3 FY25"]
+
+def test_master_rules(bank_data):
+    bank_data[SBI]["type"] = "Cooperative"
+    bank_data[HDFC]["bse_ticker"] = "ABC"
+    clean, quarantine, _ = validate_bank_data(bank_data)
+    assert SBI not in clean and HDFC not in clean
+    assert any(rule.startswith("master") for rule in _rules(quarantine, HDFC))
+
+def test_duplicate_ticker_cleared_from_later_holder(bank_data):
+    bank_data[ICICI]["nse_ticker"] = bank_data[HDFC]["nse_ticker"]
+    clean, quarantine, summary = validate_bank_data(bank_data)
+    later, first = sorted([HDFC, ICICI], key=list(bank_data).index)[::-1]
+    assert clean[later]["nse_ticker"] == "" and clean[first]["nse_ticker"] == bank_data[first]["nse_ticker"]
+    baseline = validate_bank_data(get_bank_cd_ratio_data())[2]["fields_cleared"]
+    assert summary["fields_cleared"] == baseline + 1 and summary["banks_quarantined"] == 0
+    assert bank_data[later]["nse_ticker"] != ""  # input left untouched
@@ -0,0 +1,54 @@
+import copy
+
+import pytest
+
+from data import get_bank_cd_ratio_data
+from versions import (
+    current_version, diff_versions, load_version, rollback, save_version, served_versions,
+    set_current_version,
+)
+
+def _bank_data(scale):
+    bank_data = copy.deepcopy(get_bank_cd_ratio_data())
+    bank_data["State Bank of India"]["q3_fy25_advances"] = int(3200000 * scale)
+    return bank_data
+
+@pytest.fixture
+def store(tmp_path):
+    """Three versions V1, V2, V3 swapped in that order"""
+    versions = []
+    for scale in (1.0, 1.01, 1.02):
+        version = save_version(_bank_data(scale), tmp_path)
+        set_current_version(version, tmp_path)
+        versions.append(version)
+    return tmp_path, versions
+
+def test_round_trip(tmp_path):
+    bank_data = _bank_data(1.0)
+    assert load_version(save_version(bank_data, tmp_path), tmp_path) == bank_data
+
+def test_repeated_rollbacks_walk_back(store):
+    root, (v1, v2, v3) = store
+    assert rollback(root) == v2
+    assert rollback(root) == v1
+    assert current_version(root) == v1
+    with pytest.raises(ValueError):
+        rollback(root)
+
+def test_swap_after_rollback(store):
+    root, (v1, v2, v3) = store
+    rollback(root)
+    v4 = save_version(_bank_data(1.03), root)
+    set_current_version(v4, root)
+    assert served_versions(root) == [v1, v2, v4]
+    assert rollback(root) == v2
+
+def test_unknown_version(tmp_path):
+    with pytest.raises(ValueError):
+        set_current_version("missing", tmp_path)
+
+def test_diff_versions(store):
+    root, (v1, v2, _) = store
+    diff = diff_versions(v1, v2, root)
+    assert diff["changed_files"] == ["balances"]
+    assert diff["banks_added"] == [] and diff["banks_removed"] == []
@@ -0,0 +1,26 @@
+import pandas as pd
+
+import warmup
+
+DATA = {"banks": pd.DataFrame({"bank_name": ["A", "B"]})}
+
+def test_report_counts_only_pages_with_warmers(monkeypatch):
+    calls = []
+    monkeypatch.setattr(warmup, "PAGE_WARMERS", {"ok": calls.append, "also ok": calls.append, "broken": lambda data: 1 / 0})
+    monkeypatch.setattr(warmup, "_warm_bank", lambda data, bank: calls.append(bank))
+
+    report = warmup.run_warmup(DATA, pages=["ok", "also ok", "broken", "static page"], max_workers=4)
+
+    # The shared warmer runs once, before bank tasks (which finish in any order)
+    assert calls[0] is DATA and sorted(calls[1:]) == ["A", "B"]
+    assert (report["pages"], report["pages_warmed"], report["pages_without_tasks"]) == (3, 2, 1)
+    assert report["coverage"] == 4 / 5
+    assert list(report["failed"]) == ["broken"]
+
+def test_insights_skip_live_prices(monkeypatch):
+    fetched = []
+    monkeypatch.setattr(warmup, "get_risk_scores", lambda panel: None)
+    monkeypatch.setattr(warmup, "get_prices", lambda *args: fetched.append(args))
+    monkeypatch.setattr(warmup, "MARKET_DATA_PROVIDER", "yfinance")
+    warmup._warm_insights({"panel": None})
+    assert fetched == []
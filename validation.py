@@ -0,0 +1,155 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Data Validation - Bank Master Models, Vectorized Panel Checks & Quarantine
+
+Check a bank data dict (built-in or ingested) in one pass:
+    python validation.py
+"""
+
+import time
+from typing import Literal
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError
+
+from config import VALIDATION_MAX_CD, VALIDATION_MAX_QOQ_CHANGE, VALIDATION_MIN_CD
+from data import QUARTER_KEYS, QUARTER_LABELS
+
+BANK_TYPES = ("PSB", "Private", "SFB", "Foreign", "Historical PSB")
+IDENTIFIER_FIELDS = ["nse_ticker", "bse_ticker"]
+QUARANTINE_COLUMNS = ["bank_name", "quarter", "rule", "field", "value", "action"]
+
+class BankMaster(BaseModel):
+    """Master data for one bank (balances are checked separately, as arrays)"""
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+    type: Literal[BANK_TYPES]
+    headquarters: str = Field(min_length=1)
+    nse_ticker: str = Field(pattern=r"^[A-Z0-9&-]+$")
+    bse_ticker: str = Field(pattern=r"^\d{6}$")
+
+BANK_MASTER = TypeAdapter(dict[str, BankMaster])
+
+# ═══════════════════════════════════════════════════════════════════════════
+# CHECKS (each returns quarantine rows as a DataFrame)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def check_master(bank_data):
+    """Bank master fields validated with BankMaster, all banks in one call"""
+    try:
+        BANK_MASTER.validate_python(bank_data)
+        return pd.DataFrame(columns=QUARANTINE_COLUMNS)
+    except ValidationError as error:
+        return pd.DataFrame([{
+            "bank_name": issue["loc"][0],
+            "quarter": None,
+            "rule": f"master: {issue['msg']}",
+            "field": issue["loc"][1] if len(issue["loc"]) > 1 else None,
+            "value": issue.get("input"),
+            "action": "bank",
+        } for issue in error.errors()], columns=QUARANTINE_COLUMNS)
+
+def check_identifiers(raw):
+    """Tickers held by more than one bank; the first holder keeps the identifier"""
+    rows = []
+    for field in IDENTIFIER_FIELDS:
+        values = raw.reindex(columns=[field])[field].astype(str).str.strip()
+        duplicated = values.duplicated(keep="first") & values.ne("")
+        rows.append(pd.DataFrame({
+            "bank_name": values.index[duplicated],
+            "quarter": None,
+            "rule": f"duplicate {field}",
+            "field": field,
+            "value": values[duplicated].to_numpy(),
+            "action": "field",
+        }))
+    return pd.concat(rows, ignore_index=True).reindex(columns=QUARANTINE_COLUMNS)
+
+def balance_arrays(raw):
+    """(deposits, advances) as (banks, quarters) float arrays, NaN where missing or non-numeric"""
+    def block(measure):
+        columns = raw.reindex(columns=[f"{q}_{measure}" for q in QUARTER_KEYS])
+        return columns.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    return block("deposits"), block("advances")
+
+def check_balances(raw, min_cd=VALIDATION_MIN_CD, max_cd=VALIDATION_MAX_CD, max_qoq=VALIDATION_MAX_QOQ_CHANGE):
+    """
+    Vectorized rules over the bank × quarter balance arrays
+
+    Every rule is a boolean (banks, quarters) mask computed for the whole
+    batch at once; QoQ change is flagged on the later quarter of a pair.
+    """
+    deposits, advances = balance_arrays(raw)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cd = advances / deposits * 100
+        deposit_change = np.abs(deposits[:, 1:] / deposits[:, :-1] - 1)
+        advance_change = np.abs(advances[:, 1:] / advances[:, :-1] - 1)
+    first_quarter = np.zeros((len(raw), 1), dtype=bool)
+
+    rules = {
+        "missing value": (~np.isfinite(deposits) | ~np.isfinite(advances), deposits),
+        "non-positive deposits": (deposits <= 0, deposits),
+        "negative advances": (advances < 0, advances),
+        "CD ratio out of bounds": ((cd < min_cd) | (cd > max_cd), cd),
+        "QoQ deposit jump": (np.hstack([first_quarter, deposit_change > max_qoq]), deposits),
+        "QoQ advance jump": (np.hstack([first_quarter, advance_change > max_qoq]), advances),
+    }
+
+    rows = []
+    for rule, (mask, values) in rules.items():
+        bank_index, quarter_index = np.nonzero(mask)
+        rows.append(pd.DataFrame({
+            "bank_name": raw.index.to_numpy()[bank_index],
+            "quarter": np.asarray(QUARTER_LABELS)[quarter_index],
+            "rule": rule,
+            "field": None,
+            "value": values[bank_index, quarter_index],
+            "action": "bank",
+        }))
+    return pd.concat(rows, ignore_index=True).reindex(columns=QUARANTINE_COLUMNS)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# VALIDATION STAGE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def validate_bank_data(bank_data):
+    """
+    Validate a bank data dict and split off what fails
+
+    Banks with invalid master data or balances are quarantined whole, so
+    every published bank has a complete, plausible series; a duplicated
+    ticker is cleared from the later holders only. Returns (clean
+    bank_data, quarantine rows, summary).
+    """
+    started = time.perf_counter()
+    raw = pd.DataFrame.from_dict(bank_data, orient="index")
+
+    quarantine = pd.concat(
+        [frame for frame in (check_master(bank_data), check_identifiers(raw), check_balances(raw)) if len(frame)],
+        ignore_index=True,
+    ).reindex(columns=QUARANTINE_COLUMNS) if len(raw) else pd.DataFrame(columns=QUARANTINE_COLUMNS)
+
+    dropped = set(quarantine.loc[quarantine["action"] == "bank", "bank_name"])
+    clean = {name: dict(record) for name, record in bank_data.items() if name not in dropped}
+    for row in quarantine[quarantine["action"] == "field"].itertuples():
+        if row.bank_name in clean:
+            clean[row.bank_name][row.field] = ""
+
+    summary = {
+        "banks": len(bank_data),
+        "banks_quarantined": len(dropped),
+        "fields_cleared": int((quarantine["action"] == "field").sum()),
+        "violations": quarantine["rule"].value_counts().to_dict(),
+        "seconds": time.perf_counter() - started,
+    }
+    return clean, quarantine, summary
+
+if __name__ == "__main__":
+    from data import get_bank_cd_ratio_data
+
+    _, rows, result = validate_bank_data(get_bank_cd_ratio_data())
+    print(f"Validated {result['banks']} banks in {result['seconds'] * 1000:.1f} ms: "
+          f"{result['banks_quarantined']} quarantined, {result['fields_cleared']} identifiers cleared")
+    if len(rows):
+        print(rows.to_string(index=False))
@@ -0,0 +1,233 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Data Version Store - Content-Addressed Snapshots with an Atomic Current Pointer
+
+Each version is a manifest pointing at columnar (parquet) files stored once
+under objects/ by their SHA-256, so versions that share master data or
+balances share files. Operate on the store from the command line:
+    python versions.py [list | current | rollback | diff <a> <b>]
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+
+from config import DATA_VERSIONS_DIR
+
+CURRENT_POINTER = "CURRENT"
+HISTORY_FILE = "HISTORY"
+OBJECTS_DIR = "objects"
+
+# Columnar files of a snapshot, by the bank data fields they hold
+FILE_GROUPS = ["master", "balances", "sources"]
+
+def _atomic_write(path, text):
+    """Write via a temporary file and os.replace, so readers never see a partial file"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f"{path}.tmp.{os.getpid()}"
+    with open(temporary, "w", encoding="utf-8") as handle:
+        handle.write(text)
+    os.replace(temporary, path)
+
+def version_id(bank_data):
+    """Content hash of the bank data (same data → same version)"""
+    canonical = json.dumps(bank_data, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+def manifest_path(version, root=DATA_VERSIONS_DIR):
+    return os.path.join(root, version, "manifest.json")
+
+def object_path(digest, root=DATA_VERSIONS_DIR):
+    return os.path.join(root, OBJECTS_DIR, f"{digest}.parquet")
+
+def version_exists(version, root=DATA_VERSIONS_DIR):
+    return os.path.exists(manifest_path(version, root))
+
+# ═══════════════════════════════════════════════════════════════════════════
+# COLUMNAR FILES
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _field_group(field):
+    if field.endswith(("_deposits", "_advances")):
+        return "balances"
+    if field.endswith("_source"):
+        return "sources"
+    return "master"
+
+def split_columns(bank_data):
+    """{group: DataFrame indexed by bank_name} for the FILE_GROUPS of a snapshot"""
+    raw = pd.DataFrame.from_dict(bank_data, orient="index").rename_axis("bank_name")
+    frames = {}
+    for group in FILE_GROUPS:
+        frame = raw[sorted(column for column in raw.columns if _field_group(column) == group)]
+        frames[group] = frame.astype(float) if group == "balances" else frame.astype(object)
+    return frames
+
+def _store_object(frame, root):
+    """Write a frame once under its content hash; returns the hash"""
+    temporary = os.path.join(root, OBJECTS_DIR, f"incoming.{os.getpid()}.parquet")
+    os.makedirs(os.path.dirname(temporary), exist_ok=True)
+    frame.to_parquet(temporary)
+    with open(temporary, "rb") as handle:
+        digest = hashlib.sha256(handle.read()).hexdigest()
+    if os.path.exists(object_path(digest, root)):
+        os.remove(temporary)
+    else:
+        os.replace(temporary, object_path(digest, root))
+    return digest
+
+def load_frames(version, root=DATA_VERSIONS_DIR, groups=FILE_GROUPS):
+    """{group: DataFrame} for a snapshot, reading only the requested files"""
+    files = load_manifest(version, root)["files"]
+    return {group: pd.read_parquet(object_path(files[group], root)) for group in groups}
+
+def _restore(frames):
+    """Bank data dict from the columnar frames (balances as int where whole, as ingested)"""
+    bank_data = {name: {} for name in frames["master"].index}
+    for group in FILE_GROUPS:
+        for name, row in zip(frames[group].index, frames[group].to_dict("records")):
+            for field, value in row.items():
+                if value is None or pd.isna(value):
+                    continue
+                if group == "balances" and float(value).is_integer():
+                    value = int(value)
+                bank_data[name][field] = value
+    return bank_data
+
+# ═══════════════════════════════════════════════════════════════════════════
+# SNAPSHOTS, POINTER & HISTORY
+# ═══════════════════════════════════════════════════════════════════════════
+
+def save_version(bank_data, root=DATA_VERSIONS_DIR):
+    """Snapshot bank data under its content hash; existing snapshots are left untouched"""
+    version = version_id(bank_data)
+    if not version_exists(version, root):
+        files = {group: _store_object(frame, root) for group, frame in split_columns(bank_data).items()}
+        manifest = {
+            "version": version,
+            "created": time.time(),
+            "parent": current_version(root),
+            "banks": len(bank_data),
+            "files": files,
+        }
+        _atomic_write(manifest_path(version, root), json.dumps(manifest, indent=2, sort_keys=True))
+    return version
+
+def load_manifest(version, root=DATA_VERSIONS_DIR):
+    with open(manifest_path(version, root), encoding="utf-8") as handle:
+        return json.load(handle)
+
+def load_version(version, root=DATA_VERSIONS_DIR):
+    """Bank data dict for a snapshot"""
+    return _restore(load_frames(version, root))
+
+def save_quarantine(version, rows, root=DATA_VERSIONS_DIR):
+    """Store the records validation held back from a snapshot alongside it"""
+    path = os.path.join(root, version, "quarantine.json")
+    _atomic_write(path, json.dumps(rows, sort_keys=True, default=str))
+
+def load_quarantine(version, root=DATA_VERSIONS_DIR):
+    """Quarantine rows for a snapshot ([] if none were recorded)"""
+    try:
+        with open(os.path.join(root, version, "quarantine.json"), encoding="utf-8") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return []
+
+def list_versions(root=DATA_VERSIONS_DIR):
+    """Manifests of every snapshot, oldest first"""
+    if not os.path.isdir(root):
+        return []
+    manifests = [
+        load_manifest(entry, root) for entry in os.listdir(root)
+        if os.path.exists(manifest_path(entry, root))
+    ]
+    return sorted(manifests, key=lambda manifest: manifest["created"])
+
+def current_version(root=DATA_VERSIONS_DIR):
+    """Version the dashboard should serve, or None for the built-in dataset"""
+    try:
+        with open(os.path.join(root, CURRENT_POINTER), encoding="utf-8") as handle:
+            return handle.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+def version_history(root=DATA_VERSIONS_DIR):
+    """Pointer moves as [{"version", "at", "rollback"}], oldest first"""
+    try:
+        with open(os.path.join(root, HISTORY_FILE), encoding="utf-8") as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return []
+
+def _move_pointer(version, root, rolled_back):
+    if not version_exists(version, root):
+        raise ValueError(f"Unknown data version: {version}")
+    _atomic_write(os.path.join(root, CURRENT_POINTER), version)
+    history = version_history(root) + [{"version": version, "at": time.time(), "rollback": rolled_back}]
+    _atomic_write(os.path.join(root, HISTORY_FILE), json.dumps(history, indent=2))
+
+def set_current_version(version, root=DATA_VERSIONS_DIR):
+    """Atomically point the dashboard at a saved snapshot"""
+    _move_pointer(version, root, rolled_back=False)
+
+def served_versions(root=DATA_VERSIONS_DIR):
+    """
+    Versions rollback can still return to, oldest first (the last is current)
+
+    Replays HISTORY: a swap pushes its version, a rollback pops the version
+    it rolled back from, so repeated rollbacks keep walking further back.
+    """
+    stack = []
+    for entry in version_history(root):
+        if entry.get("rollback"):
+            stack = stack[:-1]
+        elif not stack or stack[-1] != entry["version"]:
+            stack.append(entry["version"])
+    return stack
+
+def rollback(root=DATA_VERSIONS_DIR):
+    """Point back at the version served before the current one; returns it"""
+    stack = served_versions(root)
+    if len(stack) < 2:
+        raise ValueError("No earlier data version to roll back to")
+    _move_pointer(stack[-2], root, rolled_back=True)
+    return stack[-2]
+
+def diff_versions(old, new, root=DATA_VERSIONS_DIR):
+    """
+    Which columnar files differ between two snapshots, and banks added/removed
+
+    Files are compared by content hash, so unchanged groups are never read.
+    """
+    old_files, new_files = load_manifest(old, root)["files"], load_manifest(new, root)["files"]
+    old_banks = set(load_frames(old, root, ["master"])["master"].index)
+    new_banks = set(load_frames(new, root, ["master"])["master"].index)
+    return {
+        "old": old,
+        "new": new,
+        "changed_files": [group for group in FILE_GROUPS if old_files[group] != new_files[group]],
+        "banks_added": sorted(new_banks - old_banks),
+        "banks_removed": sorted(old_banks - new_banks),
+    }
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "list":
+        serving = current_version()
+        for entry in list_versions():
+            created = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry["created"]))
+            marker = "*" if entry["version"] == serving else " "
+            print(f"{marker} {entry['version']}  {created}  {entry['banks']} banks  parent={entry['parent']}")
+    elif command == "current":
+        print(current_version() or "built-in")
+    elif command == "rollback":
+        print(f"Serving {rollback()}")
+    elif command == "diff" and len(sys.argv) == 4:
+        print(json.dumps(diff_versions(sys.argv[2], sys.argv[3]), indent=2))
+    else:
+        print(__doc__)
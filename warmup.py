@@ -0,0 +1,146 @@
+"""
+Indian Banks CD Ratio Analysis Dashboard
+Cache Pre-Warming for a Data Version - Pages, Trend Banks & Common Filters
+
+Run against the current data version:
+    python warmup.py
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from analytics import get_rolling_metrics
+from anomaly import anomaly_path, run_anomaly_batch
+from clustering import CLUSTER_METHODS, get_clusters
+from config import ENABLE_ML_FEATURES, MARKET_DATA_PROVIDER, MAX_WORKERS
+from data import MEASURE_GROUPS, get_measures, get_quarter_view
+from forecasting import FORECAST_METHODS, get_forecasts
+from market import get_prices, quarter_end_dates
+from peers import PEER_METRICS, get_peer_index, get_peers
+from risk import get_risk_scores
+
+# Common selections users make, mirroring the widget defaults/options
+ROLLING_WINDOWS = [2, 3, 4]
+PEER_COUNTS = [3]
+CLUSTER_COUNTS = range(2, 9)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# PAGE WARMERS (each returns nothing; its job is to populate caches)
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _warm_trends(data):
+    for window in ROLLING_WINDOWS:
+        get_rolling_metrics(data["panel"], window=window)
+    get_peer_index(data["panel"])
+    if ENABLE_ML_FEATURES:
+        for method in FORECAST_METHODS:
+            get_forecasts(data["panel"], method=method, wait=True)
+
+def _warm_quarters(data):
+    for quarter in data["panel"]["quarter"].cat.categories:
+        get_quarter_view(data, quarter)
+
+def _warm_comparison(data):
+    _warm_quarters(data)
+    get_rolling_metrics(data["panel"])
+    # The comparison page only reads persisted scores; the batch runs here
+    if not os.path.exists(anomaly_path(data["panel"])):
+        run_anomaly_batch(data["panel"])
+
+def _warm_insights(data):
+    get_risk_scores(data["panel"])
+    # Only the offline replay is read at startup; a live provider is fetched on first view
+    if MARKET_DATA_PROVIDER == "replay":
+        ends = quarter_end_dates(list(data["panel"]["quarter"].cat.categories))
+        get_prices(list(data["banks"]["nse_ticker"]), ends[0], ends[-1])
+
+def _warm_store(data):
+    for names in MEASURE_GROUPS.values():
+        get_measures(data["store"], names)
+
+def _warm_clusters(data):
+    for method in CLUSTER_METHODS:
+        for n_clusters in CLUSTER_COUNTS:
+            get_clusters(data["panel"], n_clusters=n_clusters, method=method, wait=True)
+
+PAGE_WARMERS = {
+    "🏦 Dashboard Overview": _warm_quarters,
+    "📊 CD Ratio Trends": _warm_trends,
+    "🔍 Bank-wise Comparison": _warm_comparison,
+    "🏛️ PSB Analysis": _warm_quarters,
+    "🏢 Private Bank Analysis": _warm_quarters,
+    "🏪 Small Finance Banks": _warm_quarters,
+    "💡 Investment Insights": _warm_insights,
+    "🧩 Segment Drivers": _warm_store,
+    "🩺 Asset Quality & Health": _warm_store,
+    "🧭 Behavioral Clusters": _warm_clusters,
+}
+
+def _warm_bank(data, bank_name):
+    """Per-bank selections on the trends page"""
+    for metric in PEER_METRICS:
+        for k in PEER_COUNTS:
+            get_peers(data["panel"], bank_name, k=k, metric=metric)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# RUNNER
+# ═══════════════════════════════════════════════════════════════════════════
+
+def run_warmup(data, pages=None, banks=None, max_workers=MAX_WORKERS):
+    """
+    Warm every page and trend-selector bank across a thread pool
+
+    pages defaults to every page with a warmer; banks to every bank in the
+    dataset. The caches tasks fill are locked, so they can run in parallel.
+    Each distinct warmer runs once; page warmers finish before bank tasks
+    start (bank tasks reuse the peer index). Only pages that have a warmer
+    count toward pages/coverage. Returns a report with coverage and timings.
+    """
+    pages = list(PAGE_WARMERS) if pages is None else list(pages)
+    warm_pages = [page for page in pages if page in PAGE_WARMERS]
+    banks = list(data["banks"]["bank_name"]) if banks is None else list(banks)
+    started = time.perf_counter()
+    failed = {}
+
+    def run(pool, tasks):
+        futures = {pool.submit(task, *args): label for label, task, args in tasks}
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is not None:
+                failed[futures[future]] = f"{type(error).__name__}: {error}"
+
+    warmers = {}
+    for page in warm_pages:
+        warmers.setdefault(PAGE_WARMERS[page], []).append(page)
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="warmup") as pool:
+        run(pool, [(" / ".join(labels), warmer, (data,)) for warmer, labels in warmers.items()])
+        pages_seconds = time.perf_counter() - started
+        run(pool, [(bank, _warm_bank, (data, bank)) for bank in banks])
+
+    failed_pages = {page for label in failed for page in label.split(" / ") if page in warm_pages}
+    failed_banks = [bank for bank in banks if bank in failed]
+
+    return {
+        "pages": len(warm_pages),
+        "pages_warmed": len(warm_pages) - len(failed_pages),
+        "pages_without_tasks": len(pages) - len(warm_pages),
+        "banks": len(banks),
+        "banks_warmed": len(banks) - len(failed_banks),
+        "coverage": (len(warm_pages) - len(failed_pages) + len(banks) - len(failed_banks))
+                    / max(len(warm_pages) + len(banks), 1),
+        "failed": failed,
+        "pages_seconds": pages_seconds,
+        "seconds": time.perf_counter() - started,
+    }
+
+if __name__ == "__main__":
+    from data import generate_data
+    from versions import current_version, load_version
+
+    version = current_version()
+    report = run_warmup(generate_data(load_version(version) if version else None))
+    print(f"Warmed {report['pages_warmed']}/{report['pages']} pages and {report['banks_warmed']}/{report['banks']} "
+          f"banks ({report['coverage']:.0%}) in {report['seconds']:.1f}s")
+    for label, error in report["failed"].items():
+        print(f"  failed: {label} - {error}")